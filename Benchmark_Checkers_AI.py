@@ -0,0 +1,168 @@
+####################################
+# File name: Benchmark_Checkers_AI.py
+# Author: BenjaminBeggs
+#
+# Description: End-to-end self-play throughput benchmark. It plays
+# a fixed number of seeded training games, each followed by the
+# Critic and Generalizer update of Train_Checkers_AI, and reports
+# games/sec, plies/sec, the mean game length, the peak resident
+# memory and the split of the time across move generation,
+# evaluation, making moves and learning.
+#
+# The games are played twice with the same seeds: once untouched
+# for the throughput figures and once with timers around the engine
+# methods for the time split, so the timers do not slow down the
+# measured games. The results are written as JSON to compare runs
+# across commits.
+#
+# The engine settings default to those of Train_Checkers_AI.
+#
+# Usage: python Benchmark_Checkers_AI.py [--games N] [--seed S] [--output FILE]
+#
+####################################
+
+import argparse, json, os, platform, random, subprocess, sys, time
+sys.path.append(os.getcwd() + '/MachineLearningModules')
+import Train_Checkers_AI as training
+from ExperimentGenerator import ExperimentGenerator
+from SelfPlayFarm import createPerformanceSystem
+from Critic import Critic
+from Generalizer import Generalizer
+from FeatureRegistry import FeatureSet
+
+# Accumulates the time spent in sections of the code
+# Only the outermost timed call is measured, so a section includes the timed calls it makes itself
+class SectionTimer:
+    # Constructor for SectionTimer
+    def __init__(self, sections):
+        self.totals = dict((section, 0.0) for section in sections)
+        self.depth = 0 # Number of timed calls in progress
+
+    # Returns a function that calls function and adds its duration to section
+    def wrap(self, section, function):
+        def timedFunction(*args, **kwargs):
+            if self.depth > 0:
+                return function(*args, **kwargs)
+            self.depth += 1
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.totals[section] += time.perf_counter() - start
+                self.depth -= 1
+        return timedFunction
+
+    # Adds a duration measured outside of a wrapped function to section
+    def add(self, section, seconds):
+        self.totals[section] += seconds
+
+# Replaces the engine methods of a performance system by timed versions of themselves
+def instrument(perfSys, timer):
+    perfSys.getLegalMoves = timer.wrap("moveGeneration", perfSys.getLegalMoves)
+    perfSys.getPrediction = timer.wrap("evaluation", perfSys.getPrediction)
+    if perfSys.search is not None:
+        perfSys.search.getBestMove = timer.wrap("evaluation", perfSys.search.getBestMove)
+    perfSys.makeMove = timer.wrap("makeMove", perfSys.makeMove)
+    # The list engine undoes moves and recomputes the threat sets after every move
+    for name in ("unmakeMove", "updateThreats"):
+        if hasattr(perfSys, name):
+            setattr(perfSys, name, timer.wrap("makeMove", getattr(perfSys, name)))
+
+# Plays the benchmark games and returns (seconds, games, plies)
+# Every game is followed by the learning step of Train_Checkers_AI; timer, if given, receives the time split
+def playGames(args, timer=None):
+    featureSet = FeatureSet(training.FEATURES)
+    perfSys = createPerformanceSystem(args.bitboard, args.searchDepth, args.searchTimeBudget, args.tableBits, training.REPETITION_LIMIT, training.NO_CAPTURE_MOVE_LIMIT, args.forcedCapture, False, featureSet.names)
+    if timer is not None:
+        instrument(perfSys, timer)
+    crit = Critic()
+    general = Generalizer()
+    trainingExperiment = ExperimentGenerator().getExperiment()
+    # Every run starts from the starting hypotheses of the feature set, so that it plays the same games
+    hypothesisRed = featureSet.getStartingHypothesis("red")
+    hypothesisBlack = featureSet.getStartingHypothesis("black")
+    plies = 0
+    start = time.perf_counter()
+    for game in range(0, args.games):
+        random.seed(args.seed + game)
+        trace = perfSys.getTrace(trainingExperiment, hypothesisRed, hypothesisBlack)
+        plies += trace.plies - 1
+        learningStart = time.perf_counter()
+        terminalValueRed = None
+        terminalValueBlack = None
+        if training.TRAIN_ON_OUTCOMES:
+            terminalValueRed = crit.getTerminalValue(trace.outcome, "red")
+            terminalValueBlack = crit.getTerminalValue(trace.outcome, "black")
+        statesRed, trainingValsRed = crit.generateTrainingValuesBatch(trace[0], hypothesisRed, terminalValueRed)
+        statesBlack, trainingValsBlack = crit.generateTrainingValuesBatch(trace[1], hypothesisBlack, terminalValueBlack)
+        hypothesisRed = general.updateHypothesisBatch(statesRed, trainingValsRed, hypothesisRed, training.GENERALIZER_BATCH_SIZE, featureSet.coefficientLimits)
+        hypothesisBlack = general.updateHypothesisBatch(statesBlack, trainingValsBlack, hypothesisBlack, training.GENERALIZER_BATCH_SIZE, featureSet.coefficientLimits)
+        if timer is not None:
+            timer.add("learning", time.perf_counter() - learningStart)
+    return time.perf_counter() - start, args.games, plies
+
+# Returns the peak resident memory of the process in bytes, or None where the resource module is not available
+def getPeakMemory():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak*1024
+
+# Returns the commit the benchmark was run on, or None outside of a git checkout
+def getCommit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the self-play and learning throughput of the training loop.")
+    parser.add_argument("--games", type=int, default=200, help="number of games played (default 200)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, game n is seeded with seed + n (default 0)")
+    parser.add_argument("--engine", choices=["list", "bitboard"], default="bitboard" if training.USE_BITBOARD_ENGINE else "list", help="engine playing the games (default that of Train_Checkers_AI)")
+    parser.add_argument("--search-depth", dest="searchDepth", type=int, default=training.SEARCH_DEPTH, help="alpha-beta search depth, 0 for the greedy selection")
+    parser.add_argument("--search-time-budget", dest="searchTimeBudget", type=float, default=training.SEARCH_TIME_BUDGET, help="seconds of search per move")
+    parser.add_argument("--table-bits", dest="tableBits", type=int, default=training.TRANSPOSITION_TABLE_BITS, help="transposition table size as a power of 2, 0 disables the tables")
+    parser.add_argument("--no-forced-capture", dest="forcedCapture", action="store_false", default=training.FORCED_CAPTURE, help="make eliminations optional")
+    parser.add_argument("--output", default="benchmark.json", help="file the JSON results are written to (default benchmark.json)")
+    args = parser.parse_args()
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    args.bitboard = args.engine == "bitboard"
+
+    seconds, games, plies = playGames(args)
+    timer = SectionTimer(["moveGeneration", "evaluation", "makeMove", "learning"])
+    timedSeconds = playGames(args, timer)[0]
+    split = dict((section, total / timedSeconds) for section, total in timer.totals.items())
+    split["other"] = max(0.0, 1.0 - sum(split.values()))
+
+    results = {
+        "commit": getCommit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "settings": {
+            "games": args.games,
+            "seed": args.seed,
+            "engine": args.engine,
+            "searchDepth": args.searchDepth,
+            "searchTimeBudget": args.searchTimeBudget,
+            "tableBits": args.tableBits,
+            "forcedCapture": args.forcedCapture,
+            "features": list(training.FEATURES),
+        },
+        "seconds": seconds,
+        "gamesPerSecond": games / seconds,
+        "pliesPerSecond": plies / seconds,
+        "meanGameLength": plies / games,
+        "peakMemoryBytes": getPeakMemory(),
+        "timeSplit": split,
+    }
+    with open(args.output, "w") as outputFile:
+        json.dump(results, outputFile, indent=2)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
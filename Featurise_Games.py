@@ -0,0 +1,85 @@
+####################################
+# File name: Featurise_Games.py
+# Author: BenjaminBeggs
+#
+# Description: Offline re-featurisation of recorded games. The
+# games of PDN files (PDNFile.py) and of game logs written at
+# LOG_MOVES (GameLogger.py) are replayed through the engine by a
+# FeaturePipeline and the features of every game state are
+# written to NumPy shards, so that a new feature set can be tried
+# on past games instead of playing them again.
+#
+# The feature function is given as module:function and has to be
+# importable from MachineLearningModules or the current directory.
+#
+# Each shard features-NNNNN.npz holds the arrays:
+#   features - one row per game state, the game states of a game
+#              in order, red to move in its even rows
+#   offsets  - first row of every game, then the total row count
+#   outcomes - outcome of every game, "" for unfinished games
+#
+# Usage: python Featurise_Games.py GAMES... [--output-dir DIR] [--features MODULE:FUNCTION]
+#                                  [--workers N] [--batch-size N]
+#
+####################################
+
+import argparse, importlib, logging, os, sys, time
+sys.path.append(os.getcwd() + '/MachineLearningModules')
+import numpy as np
+from FeaturePipeline import FeaturePipeline
+from GameLogger import readGameLog
+from PDNFile import readGames, getOutcome
+
+# Returns the (moves, outcome) of every game of the recorded game files, one game at a time
+# Files ending in .pdn are read as PDN and all other files as game logs
+def readRecordedGames(paths):
+    for path in paths:
+        if path.lower().endswith(".pdn"):
+            for game in readGames(path):
+                yield game.moves, getOutcome(game.result)
+        else:
+            for game in readGameLog(path):
+                yield game
+
+# Returns the feature function named by module:function
+def getFeatureFunction(name):
+    moduleName, _, functionName = name.partition(":")
+    return getattr(importlib.import_module(moduleName), functionName)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays recorded games and writes the features of every game state to NumPy shards.")
+    parser.add_argument("games", nargs="+", help="PDN files or game logs written with --game-log-level 2")
+    parser.add_argument("--output-dir", dest="outputDir", default="Features", help="directory the shards are written to (default %(default)s)")
+    parser.add_argument("--features", default="FeaturePipeline:getInfoFeatures", help="feature function as module:function (default %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes replaying games (default the number of CPUs)")
+    parser.add_argument("--batch-size", dest="batchSize", type=int, default=1000, help="games per batch and shard (default %(default)s)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.batchSize < 1:
+        parser.error("--batch-size must be at least 1")
+    try:
+        featureFunction = getFeatureFunction(args.features)
+    except (ImportError, AttributeError):
+        parser.error("unknown feature function " + args.features)
+
+    os.makedirs(args.outputDir, exist_ok=True)
+    pipeline = FeaturePipeline(featureFunction, args.workers, args.batchSize)
+    games = 0
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for shard, (features, offsets, outcomes) in enumerate(pipeline.featurise(readRecordedGames(args.games))):
+            np.savez(os.path.join(args.outputDir, "features-%05d.npz" % shard), features=features, offsets=offsets, outcomes=outcomes)
+            games += len(outcomes)
+            rows += len(features)
+    finally:
+        pipeline.close()
+    seconds = time.perf_counter() - start
+    print("Featurised", games, "games (" + str(rows) + " game states) in %.1f seconds, %.0f games/s." % (seconds, games / seconds if seconds > 0 else 0))
+    if pipeline.errorCount > 0:
+        print(pipeline.errorCount, "game(s) could not be replayed and were skipped.")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    main()
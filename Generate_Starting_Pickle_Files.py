@@ -6,11 +6,14 @@
 # to initialize simulation count, Red target hypothesis,
 # and Black target hypothesis.
 #
-# Also initializes a traceback error counter. 
+# Also initializes a traceback error counter and records the
+# starting hypotheses as the newest training checkpoint.
 #
 ####################################
 
-import pickle, os
+import pickle, os, sys
+sys.path.append(os.getcwd() + '/MachineLearningModules')
+from CheckpointStore import CheckpointStore
 
 # Flag used to check for user input
 inputFlag = False
@@ -27,6 +30,8 @@ while inputFlag != True:
         pickle.dump(startingHypothesisBlack, open(os.getcwd() + "/SavedValues/targetHypothesisBlack.p", "wb" ))
         pickle.dump(startingMag, open(os.getcwd() + "/SavedValues/simMag.p", "wb" ))
         pickle.dump(0, open(os.getcwd() + "/SavedValues/traceCount.p", "wb" ))
+        # Save the starting hypothesis as the newest checkpoint so that training restarts from it
+        CheckpointStore(os.getcwd() + "/SavedValues/Checkpoints").save(startingHypothesisRed, startingHypothesisBlack, startingMag*100)
         inputFlag = True
         input("Pickle files for targetHypothesis[Red/Black] and simMag have been reset.")
         break
@@ -0,0 +1,209 @@
+#######################################################################
+# File name: AlphaBetaSearch.py                                       #
+# Author: PhilipBasaric                                               #
+#                                                                     #
+# Description: Depth-limited alpha-beta (negamax) search that uses a  #
+# trained target function hypothesis to evaluate the positions at    #
+# the leaves of the search tree. Positions are searched on the        #
+# bitboard representation of BitboardPerformanceSystem.              #
+#                                                                     #
+# Captures are searched before regular moves, and the search deepens  #
+# one ply at a time until the maximum depth or the time budget of    #
+# the move is reached. The move returned is the best move of the     #
+# deepest search that completed. An optional transposition table    #
+# stores the values and best moves of searched positions, which are  #
+# reused when a position is reached again by another move order.     #
+#                                                                     #
+# Leaves are evaluated on the six features of getFeatures, or on the #
+# features of a FeatureSet when one is supplied.                      #
+#                                                                     #
+#######################################################################
+
+import time
+from ComputeEquation import ComputeEquation
+from BitboardPerformanceSystem import BitboardGameState, getMoves, getFeatures, applyMove, getMoveHash, RED_DIRECTIONS, BLACK_DIRECTIONS, RED_KING_ROW, BLACK_KING_ROW
+from TranspositionTable import hashMasks, BLACK_SEARCH_KEY, EXACT, LOWER_BOUND, UPPER_BOUND
+
+# Value of a position in which the side to move has no legal moves left, from the point of view of the winner
+# It is larger than any value the hypothesis can produce within the coefficient limits of the Generalizer
+WIN_VALUE = 1000000
+
+# Values further than this from WIN_VALUE are not wins or losses
+WIN_MARGIN = 1000
+
+# Number of positions searched between two checks of the clock
+CLOCK_INTERVAL = 256
+
+# Raised inside the search when the time budget of a move runs out
+class SearchTimeout(Exception):
+    pass
+
+class AlphaBetaSearch:
+    # Constructor for AlphaBetaSearch
+    # maxDepth is the number of plies searched, timeBudget the number of seconds allowed per move (None for no limit)
+    # table is an optional TranspositionTable shared by the searches of every move
+    # forcedCapture searches with mandatory eliminations, and must match the rules of the game being played
+    # featureSet is an optional FeatureSet the hypotheses were trained on, the six features of getFeatures if None
+    def __init__(self, maxDepth=4, timeBudget=None, table=None, forcedCapture=False, featureSet=None):
+        self.maxDepth = maxDepth
+        self.timeBudget = timeBudget
+        self.table = table
+        self.forcedCapture = forcedCapture
+        self.featureFunction = getFeatures if featureSet is None else featureSet.getFeatures # Features of the four piece masks
+        self.tableHypotheses = {} # Hypothesis of each side the values stored in table were searched with
+        self.nodes = 0 # Positions visited by the last search
+        self.depthReached = 0 # Depth of the deepest search completed by the last search
+        self.iterationDepth = 0 # Depth of the iteration in progress
+        self.deadline = None # Time at which the search of the current move must stop
+        self.rootIsRed = True # Side the hypothesis of the current search was trained for
+
+    # Returns the best move of the side to move of a BitboardGameState, evaluating leaves with hypothesis v
+    # legalMoves may be supplied to restrict the search to the given (source, target, captured) moves
+    def getBestMove(self, gameState, v, legalMoves=None):
+        if gameState.currentTurn == "red":
+            men, kings, enemyMen, enemyKings = gameState.redPieces, gameState.redKings, gameState.blackPieces, gameState.blackKings
+        else:
+            men, kings, enemyMen, enemyKings = gameState.blackPieces, gameState.blackKings, gameState.redPieces, gameState.redKings
+        isRed = gameState.currentTurn == "red"
+        self.rootIsRed = isRed
+        if legalMoves is None:
+            legalMoves = getMoves(men, kings, enemyMen | enemyKings, RED_DIRECTIONS if isRed else BLACK_DIRECTIONS, self.forcedCapture)
+        if len(legalMoves) == 0:
+            return None
+        self.nodes = 0
+        self.depthReached = 0
+        self.deadline = None if self.timeBudget is None else time.time() + self.timeBudget
+        rootHash = 0
+        if self.table is not None:
+            # Stored values only remain valid while the hypothesis of the side they were searched for is unchanged
+            if self.tableHypotheses.get(isRed, list(v)) != list(v):
+                self.table.clear()
+                self.tableHypotheses = {}
+            self.tableHypotheses[isRed] = list(v)
+            self.table.newSearch()
+            rootHash = hashMasks(gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.currentTurn)
+            if not isRed:
+                rootHash ^= BLACK_SEARCH_KEY
+        rootMoves = self.orderMoves(legalMoves)
+        bestMove = rootMoves[0]
+        # Iterative deepening - every iteration starts with the best move of the previous one
+        for depth in range(1, self.maxDepth + 1):
+            self.iterationDepth = depth
+            try:
+                move = self.searchRoot(men, kings, enemyMen, enemyKings, isRed, rootMoves, depth, v, rootHash)
+            except SearchTimeout:
+                break
+            bestMove = move
+            self.depthReached = depth
+            rootMoves.remove(move)
+            rootMoves.insert(0, move)
+        return bestMove
+
+    # Searches every root move to the given depth and returns the best one
+    def searchRoot(self, men, kings, enemyMen, enemyKings, isRed, rootMoves, depth, v, rootHash):
+        alpha = -WIN_VALUE - 1
+        bestMove = rootMoves[0]
+        kingRow = RED_KING_ROW if isRed else BLACK_KING_ROW
+        for move in rootMoves:
+            childHash = 0
+            if self.table is not None:
+                childHash = rootHash ^ getMoveHash(kings, enemyKings, kingRow, move, isRed)
+            newMen, newKings, newEnemyMen, newEnemyKings = applyMove(men, kings, enemyMen, enemyKings, kingRow, move)
+            value = -self.negamax(newEnemyMen, newEnemyKings, newMen, newKings, not isRed, depth - 1, -WIN_VALUE - 1, -alpha, v, childHash)
+            if value > alpha:
+                alpha = value
+                bestMove = move
+        if self.table is not None:
+            self.table.store(rootHash, self.toTable(alpha, 0), depth, EXACT, bestMove)
+        return bestMove
+
+    # Returns the value of a position for the side to move, owning men and kings
+    # positionHash is the hash of the position when a transposition table is used
+    def negamax(self, men, kings, enemyMen, enemyKings, isRed, depth, alpha, beta, v, positionHash):
+        self.nodes += 1
+        if self.deadline is not None and self.depthReached > 0 and self.nodes % CLOCK_INTERVAL == 0 and time.time() > self.deadline:
+            raise SearchTimeout()
+        ply = self.iterationDepth - depth
+        tableMove = None
+        if self.table is not None:
+            entry = self.table.probe(positionHash)
+            if entry is not None:
+                value, entryDepth, bound, tableMove = entry
+                if entryDepth >= depth:
+                    value = self.fromTable(value, ply)
+                    if bound == EXACT or (bound == LOWER_BOUND and value >= beta) or (bound == UPPER_BOUND and value <= alpha):
+                        return value
+        legalMoves = getMoves(men, kings, enemyMen | enemyKings, RED_DIRECTIONS if isRed else BLACK_DIRECTIONS, self.forcedCapture)
+        # A side that cannot move has lost; quicker wins are preferred over slower ones
+        if len(legalMoves) == 0:
+            return -WIN_VALUE + ply
+        if depth == 0:
+            value = self.evaluate(men, kings, enemyMen, enemyKings, isRed, v)
+            if self.table is not None:
+                self.table.store(positionHash, value, 0)
+            return value
+        kingRow = RED_KING_ROW if isRed else BLACK_KING_ROW
+        alphaOriginal = alpha
+        bestMove = None
+        for move in self.orderMoves(legalMoves, tableMove):
+            childHash = 0
+            if self.table is not None:
+                childHash = positionHash ^ getMoveHash(kings, enemyKings, kingRow, move, isRed)
+            newMen, newKings, newEnemyMen, newEnemyKings = applyMove(men, kings, enemyMen, enemyKings, kingRow, move)
+            value = -self.negamax(newEnemyMen, newEnemyKings, newMen, newKings, not isRed, depth - 1, -beta, -alpha, v, childHash)
+            if value > alpha:
+                alpha = value
+                bestMove = move
+                if alpha >= beta:
+                    break
+        if self.table is not None:
+            if alpha >= beta:
+                bound = LOWER_BOUND
+            elif alpha > alphaOriginal:
+                bound = EXACT
+            else:
+                bound = UPPER_BOUND
+            self.table.store(positionHash, self.toTable(alpha, ply), depth, bound, bestMove)
+        return alpha
+
+    # Wins and losses are stored relative to the position they are stored for, so that they can be reused at another ply
+    def toTable(self, value, ply):
+        if value > WIN_VALUE - WIN_MARGIN:
+            return value + ply
+        if value < -WIN_VALUE + WIN_MARGIN:
+            return value - ply
+        return value
+
+    # Converts a value read from the transposition table back to a value relative to the root
+    def fromTable(self, value, ply):
+        if value > WIN_VALUE - WIN_MARGIN:
+            return value - ply
+        if value < -WIN_VALUE + WIN_MARGIN:
+            return value + ply
+        return value
+
+    # Returns the hypothesis evaluated at a position, from the point of view of the side to move
+    def evaluate(self, men, kings, enemyMen, enemyKings, isRed, v):
+        if isRed:
+            features = self.featureFunction(men, enemyMen, kings, enemyKings)
+        else:
+            features = self.featureFunction(enemyMen, men, enemyKings, kings)
+        value = ComputeEquation.computeEqn(features, v)
+        return value if isRed == self.rootIsRed else -value
+
+    # Returns the moves with the captures first
+    # firstMove, such as the best move stored in the transposition table, is moved to the front
+    def orderMoves(self, legalMoves, firstMove=None):
+        captures = [move for move in legalMoves if move[2]]
+        if len(captures) == 0:
+            orderedMoves = list(legalMoves)
+        else:
+            orderedMoves = captures + [move for move in legalMoves if not move[2]]
+        if firstMove is not None and firstMove in orderedMoves:
+            orderedMoves.remove(firstMove)
+            orderedMoves.insert(0, firstMove)
+        return orderedMoves
+
+    # Returns the best move of a board matrix such as the one stored in GameState, as a bitboard move
+    def getBestBoardMove(self, board, currentTurn, v):
+        return self.getBestMove(BitboardGameState.fromBoard(board, currentTurn), v)
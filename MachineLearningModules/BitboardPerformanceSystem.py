@@ -0,0 +1,368 @@
+#######################################################################
+# File name: BitboardPerformanceSystem.py                             #
+# Author: PhilipBasaric                                               #
+#                                                                     #
+# Description: Bitboard implementation of the Performance System.     #
+# The 32 playable squares are stored as bits of an integer mask per   #
+# side and per king, and moves, jumps and threats are generated with  #
+# shifts over whole masks instead of scanning the 8x8 board. It       #
+# exposes the same getTrace contract as PerformanceSystem.            #
+#                                                                     #
+# Positions are evaluated on the six features of getFeatures, or on   #
+# the features of a FeatureSet (FeatureRegistry.py) when one is       #
+# supplied.                                                           #
+#                                                                     #
+#######################################################################
+
+import random
+from ComputeEquation import ComputeEquation
+from Trace import Trace
+from PositionHistory import PositionHistory
+from TranspositionTable import hashMasks, hashMove, hashCapture, RED_MAN, BLACK_MAN, RED_KING, BLACK_KING
+
+# Squares are numbered 0-31 over the playable squares, row by row starting from black's back row.
+# Square s sits at row s // 4 and column 2*(s % 4) + (s // 4) % 2 of the 8x8 board.
+FULL_BOARD = 0xFFFFFFFF
+EVEN_ROWS = 0x0F0F0F0F # rows 0, 2, 4, 6 (playable squares in columns 0, 2, 4, 6)
+ODD_ROWS = 0xF0F0F0F0 # rows 1, 3, 5, 7 (playable squares in columns 1, 3, 5, 7)
+LEFT_EDGE = 0x01010101 # squares in column 0
+RIGHT_EDGE = 0x80808080 # squares in column 7
+RED_KING_ROW = 0x0000000F # row 0 - red pieces are promoted here
+BLACK_KING_ROW = 0xF0000000 # row 7 - black pieces are promoted here
+KING_ROWS = RED_KING_ROW | BLACK_KING_ROW # regular pieces can only reach the row they are promoted on
+
+# Shift a mask one diagonal step in a given direction. Pieces that would leave the board are dropped.
+def upLeft(mask):
+    return ((mask & EVEN_ROWS & ~LEFT_EDGE) >> 5) | ((mask & ODD_ROWS) >> 4)
+
+def upRight(mask):
+    return ((mask & EVEN_ROWS) >> 4) | ((mask & ODD_ROWS & ~RIGHT_EDGE) >> 3)
+
+def downLeft(mask):
+    return (((mask & EVEN_ROWS & ~LEFT_EDGE) << 3) | ((mask & ODD_ROWS) << 4)) & FULL_BOARD
+
+def downRight(mask):
+    return (((mask & EVEN_ROWS) << 4) | ((mask & ODD_ROWS & ~RIGHT_EDGE) << 5)) & FULL_BOARD
+
+# Each direction is paired with the shift that undoes it
+DIRECTIONS = [(upLeft, downRight), (upRight, downLeft), (downLeft, upRight), (downRight, upLeft)]
+RED_DIRECTIONS = DIRECTIONS[0:2] # regular red pieces move UP the board
+BLACK_DIRECTIONS = DIRECTIONS[2:4] # regular black pieces move DOWN the board
+
+# Converts between square numbers and board coordinates
+def squareToCoordinates(square):
+    row = square // 4
+    return row, 2*(square % 4) + row % 2
+
+def coordinatesToSquare(row, col):
+    return row*4 + col//2
+
+# Counts the pieces stored in a mask
+def popCount(mask):
+    return bin(mask).count("1")
+
+# Returns the mask of enemy pieces that can be jumped by the given men and kings
+def getThreatened(men, kings, opponents, empty, manDirections):
+    threatened = 0
+    for step, back in manDirections:
+        threatened |= step(men) & opponents & back(empty)
+    for step, back in DIRECTIONS:
+        threatened |= step(kings) & opponents & back(empty)
+    return threatened
+
+# Returns the six board features used by the target function, in the same order as GameState.info
+def getFeatures(redPieces, blackPieces, redKings, blackKings):
+    empty = ~(redPieces | blackPieces | redKings | blackKings) & FULL_BOARD
+    redThreat = getThreatened(redPieces, redKings, blackPieces | blackKings, empty, RED_DIRECTIONS)
+    blackThreat = getThreatened(blackPieces, blackKings, redPieces | redKings, empty, BLACK_DIRECTIONS)
+    return [popCount(blackPieces), popCount(redPieces), popCount(blackKings), popCount(redKings), popCount(redThreat), popCount(blackThreat)]
+
+# Appends the capture chains that continue from a piece that has jumped from source to the square bit landing
+# captured is the mask of the pieces eliminated so far. They stay on the board until the move is complete,
+# so they can neither be jumped again nor be jumped onto. empty includes the source square the piece has left
+# A man that reaches a king row is promoted, which ends the chain
+def addJumps(legalMoves, source, landing, captured, enemies, empty, directions, isKing):
+    extended = False
+    if isKing or not landing & KING_ROWS:
+        for step, back in directions:
+            jumped = step(landing) & enemies & ~captured
+            if jumped:
+                nextLanding = step(jumped) & empty
+                if nextLanding:
+                    extended = True
+                    addJumps(legalMoves, source, nextLanding, captured | jumped, enemies, empty, directions, isKing)
+    if not extended:
+        legalMoves.append((source, landing.bit_length() - 1, captured))
+
+# Returns the eliminations of the side owning men and kings as (source, target, captured) tuples
+def getCaptures(men, kings, enemies, empty, manDirections):
+    legalMoves = []
+    for direction in DIRECTIONS:
+        step, back = direction
+        movers = kings | men if direction in manDirections else kings
+        landings = step(step(movers) & enemies) & empty
+        while landings:
+            target = landings & -landings
+            landings ^= target
+            captured = back(target)
+            sourceBit = back(captured)
+            isKing = kings & sourceBit != 0
+            addJumps(legalMoves, sourceBit.bit_length() - 1, target, captured, enemies, empty | sourceBit, DIRECTIONS if isKing else manDirections, isKing)
+    return legalMoves
+
+# Returns the moves of the side owning men and kings as (source, target, captured) tuples
+# captured is the mask of the pieces eliminated by the move, 0 for a move that does not eliminate a piece
+# An elimination is always continued for as long as the jumping piece can eliminate another piece
+# With forcedCapture, only the eliminations are returned when there are any, without generating the regular moves
+def getMoves(men, kings, enemies, manDirections, forcedCapture=False):
+    empty = ~(men | kings | enemies) & FULL_BOARD
+    if forcedCapture:
+        legalMoves = getCaptures(men, kings, enemies, empty, manDirections)
+        if len(legalMoves) > 0:
+            return legalMoves
+    legalMoves = []
+    for direction in DIRECTIONS:
+        step, back = direction
+        movers = kings | men if direction in manDirections else kings
+        if movers == 0:
+            continue
+        # Eliminations
+        landings = step(step(movers) & enemies) & empty
+        while landings:
+            target = landings & -landings
+            landings ^= target
+            captured = back(target)
+            sourceBit = back(captured)
+            isKing = kings & sourceBit != 0
+            addJumps(legalMoves, sourceBit.bit_length() - 1, target, captured, enemies, empty | sourceBit, DIRECTIONS if isKing else manDirections, isKing)
+        # Regular diagonals
+        targets = step(movers) & empty
+        while targets:
+            target = targets & -targets
+            targets ^= target
+            legalMoves.append((back(target).bit_length() - 1, target.bit_length() - 1, 0))
+    return legalMoves
+
+# Returns the (men, kings, enemy men, enemy kings) masks after a move made by the side owning men and kings
+def applyMove(men, kings, enemyMen, enemyKings, kingRow, move):
+    sourceBit = 1 << move[0]
+    targetBit = 1 << move[1]
+    if kings & sourceBit:
+        # A king can end a capture chain on the square it started from
+        kings = (kings & ~sourceBit) | targetBit
+    else:
+        men ^= sourceBit
+        # Promotion to king
+        if targetBit & kingRow:
+            kings |= targetBit
+        else:
+            men |= targetBit
+    # Elimination
+    if move[2]:
+        enemyMen &= ~move[2]
+        enemyKings &= ~move[2]
+    return men, kings, enemyMen, enemyKings
+
+# Returns the value to exclusive or with the Zobrist hash of a position to make a move of the side owning kings
+def getMoveHash(kings, enemyKings, kingRow, move, isRed):
+    man, king, enemyMan, enemyKing = (RED_MAN, RED_KING, BLACK_MAN, BLACK_KING) if isRed else (BLACK_MAN, BLACK_KING, RED_MAN, RED_KING)
+    mover = king if kings & (1 << move[0]) else man
+    landing = king if mover == king or (1 << move[1]) & kingRow else man
+    change = hashMove(move[0], move[1], mover, landing)
+    captured = move[2]
+    while captured:
+        bit = captured & -captured
+        captured ^= bit
+        change ^= hashCapture(bit.bit_length() - 1, enemyKing if enemyKings & bit else enemyMan)
+    return change
+
+# Stores the state of a game as four piece masks
+class BitboardGameState:
+    # Constructor for BitboardGameState
+    # featureSet selects the features stored in info, the six features of getFeatures if None
+    def __init__(self, currentTurn, redPieces, blackPieces, redKings, blackKings, featureSet=None):
+        self.isOver = False # Used for determining whether game is over
+        self.currentTurn = currentTurn # This stores the player whose current turn it is (stores literals: "red" or "black")
+        self.redPieces = redPieces # Mask of the regular red pieces
+        self.blackPieces = blackPieces # Mask of the regular black pieces
+        self.redKings = redKings # Mask of the red kings
+        self.blackKings = blackKings # Mask of the black kings
+        self.info = (getFeatures if featureSet is None else featureSet.getFeatures)(redPieces, blackPieces, redKings, blackKings) # board features used in target function
+        self.hash = hashMasks(redPieces, blackPieces, redKings, blackKings, currentTurn) # Zobrist hash of the position, kept up to date by makeMove
+
+    # Builds a game state from a matrix of characters such as the one supplied by ExperimentGenerator
+    @staticmethod
+    def fromBoard(board, currentTurn, featureSet=None):
+        masks = {"r": 0, "b": 0, "R": 0, "B": 0}
+        for square in range(0, 32):
+            row, col = squareToCoordinates(square)
+            if board[row][col] in masks:
+                masks[board[row][col]] |= 1 << square
+        return BitboardGameState(currentTurn, masks["r"], masks["b"], masks["R"], masks["B"], featureSet)
+
+    # Returns the matrix of characters representing the board
+    def getBoard(self):
+        board = [[" "] * 8 for i in range(0, 8)]
+        for mask, char in ((self.redPieces, "r"), (self.blackPieces, "b"), (self.redKings, "R"), (self.blackKings, "B")):
+            for square in range(0, 32):
+                if mask & (1 << square):
+                    row, col = squareToCoordinates(square)
+                    board[row][col] = char
+        return board
+
+class BitboardPerformanceSystem:
+    # Constructor for BitboardPerformanceSystem
+    # search is an optional AlphaBetaSearch that replaces the one-ply greedy move selection
+    # table is an optional TranspositionTable caching the predictions of the greedy move selection
+    # repetitionLimit and noCaptureMoveLimit enable the draw rules of PositionHistory in getTrace
+    # forcedCapture makes eliminations mandatory: when a piece can be eliminated, only eliminations are legal
+    # recordMoves stores the moves of every game in the moves attribute of its trace
+    # featureSet is an optional FeatureSet that replaces the six features of getFeatures in the predictions and traces
+    def __init__(self, search=None, table=None, repetitionLimit=None, noCaptureMoveLimit=None, forcedCapture=False, recordMoves=False, featureSet=None):
+        self.search = search
+        self.table = table
+        self.tableHypotheses = None # Hypotheses the predictions stored in table were made with
+        self.repetitionLimit = repetitionLimit
+        self.noCaptureMoveLimit = noCaptureMoveLimit
+        self.forcedCapture = forcedCapture
+        self.recordMoves = recordMoves
+        self.moveHistory = None # Moves made in the game being played, when recordMoves is set
+        self.featureSet = featureSet
+        self.featureFunction = getFeatures if featureSet is None else featureSet.getFeatures # Features of the four piece masks
+        self.featureCount = 6 if featureSet is None else len(featureSet)
+
+    # This function performs all actions that constitute a turn
+    def runGame(self, gameState, v1, v2):
+        self.move(gameState, v1, v2)
+        # If one side has no pieces, game is over
+        if gameState.redPieces | gameState.redKings == 0 or gameState.blackPieces | gameState.blackKings == 0:
+            gameState.isOver = True
+
+    # Simple function that outputs the contents of the checkers board to the console
+    def drawBoard(self, gameState):
+        board = gameState.getBoard()
+        print()
+        print(" ", end=" ")
+        for k in range(0,8):
+            print(k, end="")
+            print(" ", end="")
+        print("")
+        for i in range(0,len(board)):
+            print(i, end=" ")
+            for j in range(0,len(board)):
+                print(board[i][j], end=" ")
+            print("")
+
+    # This function performs a move for a given player
+    def move(self, gameState, v1, v2):
+        legalMoves = self.getLegalMoves(gameState)
+        # Check for stalemate
+        if len(legalMoves) == 0:
+            gameState.isOver = True
+            return
+        bestMove = self.getBestMove(gameState, legalMoves, v1, v2)
+        self.makeMove(gameState, bestMove)
+        if self.moveHistory is not None:
+            self.moveHistory.append(bestMove)
+
+    # Returns the masks of the side to move followed by the masks of its opponent
+    def getSides(self, gameState):
+        if gameState.currentTurn == "red":
+            return gameState.redPieces, gameState.redKings, gameState.blackPieces, gameState.blackKings
+        return gameState.blackPieces, gameState.blackKings, gameState.redPieces, gameState.redKings
+
+    # This function returns the legal moves of the side to move as (source, target, captured) tuples
+    # captured is the mask of the eliminated pieces, 0 for a move that does not eliminate a piece
+    def getLegalMoves(self, gameState):
+        men, kings, enemyMen, enemyKings = self.getSides(gameState)
+        manDirections = RED_DIRECTIONS if gameState.currentTurn == "red" else BLACK_DIRECTIONS
+        return getMoves(men, kings, enemyMen | enemyKings, manDirections, self.forcedCapture)
+
+    # This function returns the masks (red pieces, black pieces, red kings, black kings) that succeed a given move
+    def getSuccessor(self, gameState, move):
+        if gameState.currentTurn == "red":
+            redPieces, redKings, blackPieces, blackKings = applyMove(gameState.redPieces, gameState.redKings, gameState.blackPieces, gameState.blackKings, RED_KING_ROW, move)
+        else:
+            blackPieces, blackKings, redPieces, redKings = applyMove(gameState.blackPieces, gameState.blackKings, gameState.redPieces, gameState.redKings, BLACK_KING_ROW, move)
+        return redPieces, blackPieces, redKings, blackKings
+
+    # This function retrives the best move from legalMoves using the target function hypothesis
+    def getBestMove(self, gameState, legalMoves, v1, v2):
+        rand = random.randint(3,4)
+        if rand % 2 == 0:
+            return legalMoves[random.randint(0,len(legalMoves)-1)]
+        if len(legalMoves) == 1:
+            return legalMoves[0]
+        v = v1 if gameState.currentTurn == "red" else v2
+        if self.search is not None:
+            return self.search.getBestMove(gameState, v, legalMoves)
+        bestMove = legalMoves[0]
+        maxVal = None
+        for move in legalMoves:
+            prediction = self.getPrediction(gameState, move, v)
+            if maxVal is None or prediction >= maxVal:
+                maxVal = prediction
+                bestMove = move
+        return bestMove
+
+    # This function gets the output of the target hypothesis evaluated at the game state that succeeds a given move
+    # A successor position is only ever evaluated with the hypothesis of the player that moved into it,
+    # so within a game its prediction can be cached under its hash
+    def getPrediction(self, gameState, move, v):
+        if self.table is None:
+            return ComputeEquation.computeEqn(self.featureFunction(*self.getSuccessor(gameState, move)), v)
+        successorHash = gameState.hash ^ self.getMoveHash(gameState, move)
+        entry = self.table.probe(successorHash)
+        if entry is not None:
+            return entry[0]
+        prediction = ComputeEquation.computeEqn(self.featureFunction(*self.getSuccessor(gameState, move)), v)
+        self.table.store(successorHash, prediction, 0)
+        return prediction
+
+    # This function returns the value to exclusive or with the hash of the game state to make a given move
+    def getMoveHash(self, gameState, move):
+        if gameState.currentTurn == "red":
+            return getMoveHash(gameState.redKings, gameState.blackKings, RED_KING_ROW, move, True)
+        return getMoveHash(gameState.blackKings, gameState.redKings, BLACK_KING_ROW, move, False)
+
+    # This function returns the number of pieces left on the board, which the draw rules use to detect eliminations
+    def getPieceCount(self, gameState):
+        return popCount(gameState.redPieces | gameState.blackPieces | gameState.redKings | gameState.blackKings)
+
+    # This function makes a given move by updating the piece masks of the game state
+    def makeMove(self, gameState, move):
+        gameState.hash ^= self.getMoveHash(gameState, move)
+        gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings = self.getSuccessor(gameState, move)
+        gameState.info = self.featureFunction(gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings)
+        gameState.currentTurn = "black" if gameState.currentTurn == "red" else "red"
+
+    # This function takes as input an initial board state and function hypothesis and produces the Trace of a given game
+    def getTrace(self, trainingExperiment, currentHypothesis1, currentHypothesis2):
+        trace = Trace(self.featureCount)
+        self.moveHistory = [] if self.recordMoves else None
+        v1 = list(currentHypothesis1)
+        v2 = list(currentHypothesis2)
+        # Cached predictions only remain valid while the hypotheses are unchanged
+        if self.table is not None and self.tableHypotheses != (v1, v2):
+            self.table.clear()
+            self.tableHypotheses = (v1, v2)
+        gameState = BitboardGameState.fromBoard(trainingExperiment, "red", self.featureSet) # Assume red always goes first at start of game
+        history = PositionHistory(self.repetitionLimit, self.noCaptureMoveLimit)
+        history.record(gameState.hash, self.getPieceCount(gameState))
+        trace.append(gameState.info)
+        while gameState.isOver == False and trace.getRedPlies() <= 10000: # Keep iterating until game is over, with a hard limit on number of turns
+            currentTurn = gameState.currentTurn
+            self.runGame(gameState, v1, v2)
+            # Record the new game state unless the game ended without a move being made
+            if gameState.currentTurn != currentTurn:
+                trace.append(gameState.info)
+                # End the game as a draw once the position has repeated too often or no piece has been eliminated for too long
+                if gameState.isOver == False and history.record(gameState.hash, self.getPieceCount(gameState)):
+                    trace.outcome = "draw"
+                    break
+        # The player to move at the end of the game has no pieces or no legal moves left, so the other player has won
+        if gameState.isOver:
+            trace.outcome = "black" if gameState.currentTurn == "red" else "red"
+        trace.moves = self.moveHistory
+        trace.trim()
+        return trace
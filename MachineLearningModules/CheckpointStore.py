@@ -0,0 +1,128 @@
+####################################
+# File name: CheckpointStore.py
+# Author: BenjaminBeggs
+#
+# Description: Crash-safe storage of training checkpoints.
+# A checkpoint is one versioned record holding both target
+# function hypotheses, the features they were trained on, the
+# number of games played, the state of the random number
+# generator and a timestamp. Checkpoints saved without features
+# were trained on the six features of GameState.info.
+#
+# Every checkpoint is written to a temporary file, flushed to
+# disk and renamed into place, so an interrupted save can never
+# replace a good checkpoint with a partial one. Records carry a
+# SHA-256 checksum, and loadLatest skips any checkpoint that
+# fails to verify and falls back to the previous one.
+#
+####################################
+
+import hashlib, os, pickle, tempfile, time
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_MAGIC = b"FKCP"
+CHECKPOINT_PREFIX = "checkpoint-"
+CHECKPOINT_SUFFIX = ".p"
+TEMPORARY_PREFIX = ".checkpoint-"
+TEMPORARY_SUFFIX = ".tmp"
+
+class CheckpointStore:
+    # Constructor for CheckpointStore
+    # keep is the number of most recent checkpoints retained in directory
+    # Temporary files left behind by saves interrupted in a previous run are removed
+    def __init__(self, directory, keep=5):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+        self.removeTemporaryFiles()
+
+    # Removes the temporary files in the store
+    # Only called when the store is opened, as a save in progress elsewhere would lose its temporary file
+    def removeTemporaryFiles(self):
+        for name in os.listdir(self.directory):
+            if name.startswith(TEMPORARY_PREFIX) and name.endswith(TEMPORARY_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+
+    # Returns (sequence number, path) of every checkpoint in the store, oldest first
+    def getCheckpoints(self):
+        checkpoints = []
+        for name in os.listdir(self.directory):
+            if name.startswith(CHECKPOINT_PREFIX) and name.endswith(CHECKPOINT_SUFFIX):
+                sequence = name[len(CHECKPOINT_PREFIX):-len(CHECKPOINT_SUFFIX)]
+                if sequence.isdigit():
+                    checkpoints.append((int(sequence), os.path.join(self.directory, name)))
+        checkpoints.sort()
+        return checkpoints
+
+    # Atomically writes a new checkpoint and removes the checkpoints older than the last keep ones
+    # features names the features of the hypotheses, None for the six features of GameState.info
+    # Returns the path of the new checkpoint
+    def save(self, hypothesisRed, hypothesisBlack, gameCount, randomState=None, features=None):
+        record = {
+            "version": CHECKPOINT_VERSION,
+            "hypothesisRed": list(hypothesisRed),
+            "hypothesisBlack": list(hypothesisBlack),
+            "gameCount": gameCount,
+            "randomState": randomState,
+            "features": None if features is None else list(features),
+            "timestamp": time.time(),
+        }
+        payload = pickle.dumps(record)
+        checkpoints = self.getCheckpoints()
+        sequence = checkpoints[-1][0] + 1 if checkpoints else 0
+        path = os.path.join(self.directory, CHECKPOINT_PREFIX + "%08d" % sequence + CHECKPOINT_SUFFIX)
+
+        # Write to a temporary file in the same directory and rename it once it is safely on disk
+        descriptor, temporaryPath = tempfile.mkstemp(prefix=TEMPORARY_PREFIX, suffix=TEMPORARY_SUFFIX, dir=self.directory)
+        try:
+            with os.fdopen(descriptor, "wb") as checkpointFile:
+                checkpointFile.write(CHECKPOINT_MAGIC + hashlib.sha256(payload).digest() + payload)
+                checkpointFile.flush()
+                os.fsync(checkpointFile.fileno())
+            os.replace(temporaryPath, path)
+        except BaseException:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            raise
+        self.syncDirectory()
+
+        # Remove old checkpoints
+        for oldSequence, oldPath in self.getCheckpoints()[:-self.keep]:
+            os.remove(oldPath)
+        return path
+
+    # Flushes the directory entry of a renamed checkpoint to disk where the platform allows it
+    def syncDirectory(self):
+        try:
+            descriptor = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+    # Reads and verifies a checkpoint, raising ValueError if it is torn or corrupt
+    def load(self, path):
+        with open(path, "rb") as checkpointFile:
+            data = checkpointFile.read()
+        header = len(CHECKPOINT_MAGIC)
+        digest = data[header:header+32]
+        payload = data[header+32:]
+        if data[:header] != CHECKPOINT_MAGIC or hashlib.sha256(payload).digest() != digest:
+            raise ValueError('The checkpoint ' + path + ' is incomplete or corrupt.')
+        record = pickle.loads(payload)
+        if record.get("version") != CHECKPOINT_VERSION:
+            raise ValueError('The checkpoint ' + path + ' has an unsupported version.')
+        return record
+
+    # Returns the record of the newest valid checkpoint, or None if the store holds no valid checkpoint
+    def loadLatest(self):
+        for sequence, path in reversed(self.getCheckpoints()):
+            try:
+                return self.load(path)
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+                continue
+        return None
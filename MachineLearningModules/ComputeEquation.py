@@ -6,6 +6,9 @@
 # outputs the target function evaluated at that game state.
 #
 # Helper function used by other machine-learning modules.
+#
+# The hypothesis has one coefficient per feature of the game
+# state, so any feature set of FeatureRegistry can be evaluated.
 # 
 ####################################
 
@@ -13,6 +16,6 @@ class ComputeEquation:
     @staticmethod
     def computeEqn(gameState, inputHypothesis):
         output = 0
-        for i in range(0,6):
+        for i in range(0,len(inputHypothesis)):
             output += inputHypothesis[i]*gameState[i]
         return output
\ No newline at end of file
@@ -6,11 +6,21 @@
 # Takes as an input the trace history of a checkers game
 # and generates a set of hypothesis training values.
 #
+# generateTrainingValuesBatch works on a trace stored as a (T, F)
+# array of F features and returns the training states and values as arrays that
+# Generalizer.updateHypothesisBatch consumes directly.
+#
 ####################################
 
+import numpy as np
 from ComputeEquation import ComputeEquation
 
 class Critic:
+    # Training values of the final game state for a win, a loss and a draw
+    WIN_VALUE = 100
+    LOSS_VALUE = -100
+    DRAW_VALUE = 0
+
     #Takes in the trace history and for each game history computes V_train(game state) and stores it in the 2D list trainingValues
     @staticmethod
     def generateTrainingValues(traceHistory, currentHypothesis):
@@ -18,4 +28,28 @@ class Critic:
         for x in range(0, len(traceHistory)-1):
             output = ComputeEquation.computeEqn(traceHistory[x+1], currentHypothesis)
             trainingValues.append([traceHistory[x], output])
-        return trainingValues
\ No newline at end of file
+        return trainingValues
+
+    # Returns the training value of the final game state of a player for the outcome of a Trace
+    # Returns None if the game was not finished
+    @staticmethod
+    def getTerminalValue(outcome, player):
+        if outcome == "draw":
+            return Critic.DRAW_VALUE
+        elif outcome == player:
+            return Critic.WIN_VALUE
+        elif outcome is not None:
+            return Critic.LOSS_VALUE
+        return None
+
+    # Vectorised version of generateTrainingValues
+    # Returns the training states and their training values V_train(state) = hypothesis(successor state),
+    # computed for the whole trace with a single dot product
+    # If terminalValue is given the final state of the trace is also returned with terminalValue as its training value
+    @staticmethod
+    def generateTrainingValuesBatch(traceHistory, currentHypothesis, terminalValue=None):
+        trace = np.asarray(traceHistory, dtype=float).reshape(-1, len(currentHypothesis))
+        targets = trace[1:].dot(np.asarray(currentHypothesis, dtype=float))
+        if terminalValue is None:
+            return trace[:-1], targets
+        return trace, np.append(targets, float(terminalValue))
\ No newline at end of file
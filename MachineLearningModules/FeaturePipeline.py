@@ -0,0 +1,140 @@
+####################################
+# File name: FeaturePipeline.py
+# Author: BenjaminBeggs
+#
+# Description: Computes the features of recorded games without
+# playing them again. Every game is replayed move by move through
+# PerformanceSystem from the ExperimentGenerator starting board,
+# and a feature function is called on the game state before the
+# first move and after every move, giving the same rows as the
+# trace of the game.
+#
+# A feature function takes a GameState and returns a sequence of
+# numbers. It has to be defined at module level, so that worker
+# processes can import it. getInfoFeatures returns the features
+# of GameState.info stored in traces.
+#
+# Games are featurised in batches by a pool of worker processes.
+# Only a few batches are in flight at a time, so a stream of
+# millions of games is processed in constant memory, and the
+# batches are returned in the order the games were read.
+#
+####################################
+
+import logging, multiprocessing, traceback
+from collections import deque
+import numpy as np
+from ExperimentGenerator import ExperimentGenerator
+from GameState import GameState
+from PerformanceSystem import PerformanceSystem
+from SelfPlayFarm import initializeWorker
+
+# Type of the feature matrices
+FEATURE_DTYPE = np.float32
+
+# Number of batches queued per worker process
+BATCHES_PER_WORKER = 2
+
+# Returns the six features of GameState.info
+def getInfoFeatures(gameState):
+    return gameState.info
+
+# Returns the legal Move matching a move record [source, target, [eliminated squares]]
+# The eliminated squares may be listed in any order, or be None to match on the source and target only
+def findMove(legalMoves, record):
+    source, target, captured = record
+    captured = None if captured is None else sorted(captured)
+    for move in legalMoves:
+        if move.source == source and move.target == target and (captured is None or sorted(move.captured) == captured):
+            return move
+    raise ValueError('Move ' + str(record) + ' is not legal in the replayed position.')
+
+# Replays the move records of a game and returns the list of feature rows of its game states
+# Moves are matched against the legal moves without forced captures, so games played with or without them replay alike
+def replayGame(perfSys, trainingExperiment, moves, featureFunction):
+    gameState = GameState.fromBoard(trainingExperiment, "red")
+    perfSys.updateThreats(gameState)
+    rows = [list(featureFunction(gameState))]
+    for record in moves:
+        legalMoves = perfSys.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.board)
+        perfSys.makeMove(gameState, findMove(legalMoves, record))
+        perfSys.updateThreats(gameState)
+        rows.append(list(featureFunction(gameState)))
+    return rows
+
+# Featurises a batch of (moves, outcome) games, inside a worker process or in the calling process
+# Returns (features, offsets, outcomes, errors): the feature rows of all games stacked in one matrix, the first row
+# of every game followed by the total row count, the outcome of every game ("" if unfinished) and the error texts
+# of the games that could not be replayed, which are left out
+def featuriseBatch(task):
+    featureFunction, games = task
+    perfSys = PerformanceSystem()
+    trainingExperiment = ExperimentGenerator().getExperiment()
+    rows = []
+    offsets = [0]
+    outcomes = []
+    errors = []
+    for moves, outcome in games:
+        try:
+            gameRows = replayGame(perfSys, trainingExperiment, moves, featureFunction)
+        except Exception:
+            errors.append(traceback.format_exc())
+            continue
+        rows.extend(gameRows)
+        offsets.append(len(rows))
+        outcomes.append("" if outcome is None else outcome)
+    features = np.array(rows, dtype=FEATURE_DTYPE) if rows else np.zeros((0, 0), dtype=FEATURE_DTYPE)
+    return features, np.array(offsets, dtype=np.int64), np.array(outcomes, dtype="<U5"), errors
+
+class FeaturePipeline:
+    # Constructor for FeaturePipeline
+    # workerCount 1 featurises the games in the calling process
+    def __init__(self, featureFunction=getInfoFeatures, workerCount=1, batchSize=1000):
+        self.featureFunction = featureFunction
+        self.workerCount = workerCount
+        self.batchSize = batchSize
+        self.errorCount = 0 # Number of games that could not be replayed
+        self.pool = None
+        if workerCount > 1:
+            self.pool = multiprocessing.Pool(workerCount, initializeWorker)
+
+    # Returns the (features, offsets, outcomes) of every batch of batchSize games read from games
+    # games is an iterable of (moves, outcome), such as readGameLog or the games of PDNFile.readGames
+    # Games that cannot be replayed are logged and left out of their batch
+    def featurise(self, games):
+        pending = deque()
+        for batch in self.getBatches(games):
+            task = (self.featureFunction, batch)
+            if self.pool is None:
+                yield self.collect(featuriseBatch(task))
+                continue
+            pending.append(self.pool.apply_async(featuriseBatch, (task,)))
+            if len(pending) >= BATCHES_PER_WORKER*self.workerCount:
+                yield self.collect(pending.popleft().get())
+        while pending:
+            yield self.collect(pending.popleft().get())
+
+    # Splits an iterable of games into lists of batchSize games
+    def getBatches(self, games):
+        batch = []
+        for game in games:
+            batch.append(game)
+            if len(batch) == self.batchSize:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # Logs the errors of a featurised batch and returns its arrays
+    def collect(self, result):
+        features, offsets, outcomes, errors = result
+        for error in errors:
+            logging.error('Error detected when replaying a game.\n' + error)
+        self.errorCount += len(errors)
+        return features, offsets, outcomes
+
+    # Shuts down the worker processes
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
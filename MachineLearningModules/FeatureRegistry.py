@@ -0,0 +1,210 @@
+####################################
+# File name: FeatureRegistry.py
+# Author: JordanCurnew
+#
+# Description: Registry of the board features the target function
+# can be trained on. Every feature is declared once with the player
+# it favours, which gives the sign of its starting coefficient, and
+# the coefficient limit imposed by the Generalizer.
+#
+# The built-in features are computed together by one pass of mask
+# operations over the bitboard representation of a position, so
+# adding features to the active set does not add scans of the
+# board. Other features can be added with registerFeature and a
+# function of the four piece masks.
+#
+# A FeatureSet is an ordered selection of registered features. The
+# hypotheses trained on a feature set have one coefficient per
+# feature, in the order of the set. DEFAULT_FEATURES are the six
+# features of GameState.info.
+#
+####################################
+
+from collections import namedtuple
+from BitboardPerformanceSystem import getFeatures, popCount, squareToCoordinates, FULL_BOARD, RED_KING_ROW, BLACK_KING_ROW, RED_DIRECTIONS, BLACK_DIRECTIONS, DIRECTIONS
+
+# A registered feature
+# player is "red" or "black", the player whose position the feature improves
+# function computes the feature from the masks (red pieces, black pieces, red kings, black kings), None for a built-in feature
+Feature = namedtuple("Feature", ["name", "player", "coefficientLimit", "function"])
+
+# Built-in features, in the order computeBuiltInFeatures returns them
+BUILT_IN_FEATURES = [
+    Feature("blackPieces", "black", 2, None), # regular black pieces
+    Feature("redPieces", "red", 2, None), # regular red pieces
+    Feature("blackKings", "black", 4, None), # black kings
+    Feature("redKings", "red", 4, None), # red kings
+    Feature("redThreat", "red", 8, None), # black pieces that red can eliminate
+    Feature("blackThreat", "black", 8, None), # red pieces that black can eliminate
+    Feature("redBackRow", "red", 2, None), # regular red pieces guarding red's back row
+    Feature("blackBackRow", "black", 2, None), # regular black pieces guarding black's back row
+    Feature("redCentre", "red", 2, None), # red pieces on the centre squares
+    Feature("blackCentre", "black", 2, None), # black pieces on the centre squares
+    Feature("redMobility", "red", 1, None), # regular moves available to red
+    Feature("blackMobility", "black", 1, None), # regular moves available to black
+    Feature("redRunaways", "red", 4, None), # regular red pieces with no black piece between them and their king row
+    Feature("blackRunaways", "black", 4, None), # regular black pieces with no red piece between them and their king row
+]
+
+# Features of GameState.info, the feature set of hypotheses trained before the registry existed
+DEFAULT_FEATURES = ["blackPieces", "redPieces", "blackKings", "redKings", "redThreat", "blackThreat"]
+
+# Every built-in feature
+EXTENDED_FEATURES = [feature.name for feature in BUILT_IN_FEATURES]
+
+# The six squares of rows 3 and 4 that are not on a side edge
+CENTRE = (1 << 12) | (1 << 13) | (1 << 14) | (1 << 17) | (1 << 18) | (1 << 19)
+
+# Registered features by name
+REGISTRY = dict((feature.name, feature) for feature in BUILT_IN_FEATURES)
+BUILT_IN_INDEX = dict((feature.name, index) for index, feature in enumerate(BUILT_IN_FEATURES))
+
+# Builds the mask of the squares a regular piece on each square can reach on its way to its king row
+# rowStep is -1 for red pieces, which move up the board, and 1 for black pieces
+def buildCones(rowStep):
+    cones = []
+    for square in range(0, 32):
+        row, col = squareToCoordinates(square)
+        cone = 0
+        for other in range(0, 32):
+            otherRow, otherCol = squareToCoordinates(other)
+            distance = (otherRow - row)*rowStep
+            if distance > 0 and abs(otherCol - col) <= distance:
+                cone |= 1 << other
+        cones.append(cone)
+    return cones
+
+RED_CONES = buildCones(-1)
+BLACK_CONES = buildCones(1)
+
+# Adds a feature computed by function(redPieces, blackPieces, redKings, blackKings) to the registry
+# The function returns an integer, as traces store the features as 16 bit integers
+# The function has to be defined at module level and registered on import for worker processes to find it
+def registerFeature(name, player, coefficientLimit, function):
+    if name in REGISTRY:
+        raise ValueError('A feature named ' + name + ' is already registered.')
+    if player not in ("red", "black"):
+        raise ValueError('The player of a feature must be "red" or "black".')
+    REGISTRY[name] = Feature(name, player, coefficientLimit, function)
+
+# Returns (threatened, mobility) of the side owning men and kings: the mask of the opponents it can eliminate
+# and the number of its regular moves. Both come from the same diagonal step of the pieces in every direction,
+# and every step of a direction lands on a different square, so the empty targets of each direction are counted
+def scanSide(men, kings, opponents, empty, manDirections):
+    threatened = 0
+    mobility = 0
+    for direction in DIRECTIONS:
+        step, back = direction
+        movers = kings | men if direction in manDirections else kings
+        if movers:
+            stepped = step(movers)
+            threatened |= stepped & opponents & back(empty)
+            mobility += popCount(stepped & empty)
+    return threatened, mobility
+
+# Returns the number of men whose cone towards their king row holds no enemy piece
+def getRunaways(men, enemies, cones):
+    runaways = 0
+    while men:
+        bit = men & -men
+        men ^= bit
+        if not cones[bit.bit_length() - 1] & enemies:
+            runaways += 1
+    return runaways
+
+# Returns every built-in feature of a position in the order of BUILT_IN_FEATURES
+def computeBuiltInFeatures(redPieces, blackPieces, redKings, blackKings):
+    red = redPieces | redKings
+    black = blackPieces | blackKings
+    empty = ~(red | black) & FULL_BOARD
+    redThreat, redMobility = scanSide(redPieces, redKings, black, empty, RED_DIRECTIONS)
+    blackThreat, blackMobility = scanSide(blackPieces, blackKings, red, empty, BLACK_DIRECTIONS)
+    return [
+        popCount(blackPieces),
+        popCount(redPieces),
+        popCount(blackKings),
+        popCount(redKings),
+        popCount(redThreat),
+        popCount(blackThreat),
+        popCount(redPieces & BLACK_KING_ROW),
+        popCount(blackPieces & RED_KING_ROW),
+        popCount(red & CENTRE),
+        popCount(black & CENTRE),
+        redMobility,
+        blackMobility,
+        getRunaways(redPieces, black, RED_CONES),
+        getRunaways(blackPieces, red, BLACK_CONES),
+    ]
+
+# Returns the masks (red pieces, black pieces, red kings, black kings) of a GameState or BitboardGameState
+def getMasks(gameState):
+    if isinstance(gameState.redPieces, int):
+        return gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings
+    masks = []
+    for pieces in (gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings):
+        mask = 0
+        for piece in pieces:
+            mask |= 1 << (piece[0]*4 + piece[1]//2)
+        masks.append(mask)
+    return tuple(masks)
+
+class FeatureSet:
+    # Constructor for FeatureSet
+    # names lists registered features in the order of the hypothesis coefficients, DEFAULT_FEATURES if None
+    def __init__(self, names=None):
+        if names is None:
+            names = DEFAULT_FEATURES
+        for name in names:
+            if name not in REGISTRY:
+                raise ValueError('Unknown feature ' + str(name) + '.')
+        if len(set(names)) != len(names):
+            raise ValueError('A feature set cannot hold a feature twice.')
+        self.names = list(names)
+        self.features = [REGISTRY[name] for name in names]
+        self.coefficientLimits = [feature.coefficientLimit for feature in self.features]
+        self.isDefault = self.names == DEFAULT_FEATURES
+        self.usesBuiltIns = any(feature.function is None for feature in self.features)
+        # Positions of the features in the list of computeBuiltInFeatures, when the set only holds built-in features
+        self.builtInIndices = None
+        if all(feature.function is None for feature in self.features):
+            self.builtInIndices = [BUILT_IN_INDEX[name] for name in self.names]
+
+    def __len__(self):
+        return len(self.names)
+
+    # Returns the features of the position given by four piece masks
+    def getFeatures(self, redPieces, blackPieces, redKings, blackKings):
+        if self.isDefault:
+            return getFeatures(redPieces, blackPieces, redKings, blackKings)
+        if self.builtInIndices is not None:
+            builtIns = computeBuiltInFeatures(redPieces, blackPieces, redKings, blackKings)
+            return [builtIns[index] for index in self.builtInIndices]
+        builtIns = computeBuiltInFeatures(redPieces, blackPieces, redKings, blackKings) if self.usesBuiltIns else None
+        features = []
+        for feature in self.features:
+            if feature.function is None:
+                features.append(builtIns[BUILT_IN_INDEX[feature.name]])
+            else:
+                features.append(feature.function(redPieces, blackPieces, redKings, blackKings))
+        return features
+
+    # Returns the features of a GameState or BitboardGameState
+    def getGameStateFeatures(self, gameState):
+        return self.getFeatures(*getMasks(gameState))
+
+    # Returns the starting hypothesis of a player: 1 for the features favouring the player and -1 for the others
+    def getStartingHypothesis(self, player):
+        return [1 if feature.player == player else -1 for feature in self.features]
+
+    # Converts a hypothesis of a player trained on the features names to this feature set
+    # Shared features keep their coefficients and new features start from the starting hypothesis
+    def adaptHypothesis(self, hypothesis, names, player):
+        if len(hypothesis) != len(names):
+            raise ValueError('The hypothesis has ' + str(len(hypothesis)) + ' coefficients for ' + str(len(names)) + ' features.')
+        coefficients = dict(zip(names, hypothesis))
+        startingHypothesis = self.getStartingHypothesis(player)
+        return [coefficients.get(name, startingHypothesis[index]) for index, name in enumerate(self.names)]
+
+# Feature function of FeaturePipeline returning every built-in feature of a GameState
+def getExtendedFeatures(gameState):
+    return computeBuiltInFeatures(*getMasks(gameState))
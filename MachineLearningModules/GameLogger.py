@@ -0,0 +1,84 @@
+#######################################################################
+# File name: GameLogger.py                                            #
+# Author: BenjaminBeggs                                               #
+#                                                                     #
+# Description: Writes a record of every training game as one line of #
+# JSON. The records are queued by the training loop and written by a  #
+# background thread through a buffered file, so logging never waits  #
+# on the disk.                                                        #
+#                                                                     #
+# LOG_GAMES records the outcome, length and final features of every   #
+# game. LOG_MOVES also records the moves, which requires the          #
+# performance system to be created with recordMoves. Moves are        #
+# written as [source square, target square, [eliminated squares]]    #
+# for both engines.                                                   #
+#                                                                     #
+# readGameLog returns the logged games that have moves one at a time. #
+#                                                                     #
+#######################################################################
+
+import json, queue, threading
+from Move import Move
+
+# Logging levels
+LOG_OFF, LOG_GAMES, LOG_MOVES = range(0, 3)
+
+# Size of the write buffer of the log file in bytes
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Returns a move of either engine as [source, target, [eliminated squares]]
+def getMoveRecord(move):
+    if isinstance(move, Move):
+        return [move.source, move.target, list(move.captured)]
+    # Bitboard moves store the eliminated pieces as a mask
+    captured = []
+    mask = move[2]
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        captured.append(bit.bit_length() - 1)
+    return [move[0], move[1], captured]
+
+class GameLogger:
+    # Constructor for GameLogger
+    # The log file is appended to, so a resumed run continues the log of the previous run
+    def __init__(self, path, level=LOG_GAMES):
+        self.level = level
+        self.file = open(path, "a", buffering=WRITE_BUFFER_SIZE)
+        self.records = queue.Queue()
+        self.writer = threading.Thread(target=self.writeRecords, daemon=True)
+        self.writer.start()
+
+    # Queues the record of a finished game; gameNumber is the number of the game, counted from 1
+    def logGame(self, gameNumber, trace):
+        self.records.put((gameNumber, trace))
+
+    # Body of the writer thread - converts queued games to JSON lines until None is queued
+    def writeRecords(self):
+        while True:
+            item = self.records.get()
+            if item is None:
+                break
+            gameNumber, trace = item
+            record = {"game": gameNumber, "outcome": trace.outcome, "plies": trace.plies - 1, "final": trace.getArray()[-1].tolist()}
+            if self.level >= LOG_MOVES and trace.moves is not None:
+                record["moves"] = [getMoveRecord(move) for move in trace.moves]
+            self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    # Writes the games still queued and closes the log file
+    def close(self):
+        self.records.put(None)
+        self.writer.join()
+        self.file.close()
+
+# Returns the (moves, outcome) of every game of a log written at LOG_MOVES, one game at a time
+# Games logged without their moves are skipped
+def readGameLog(path):
+    with open(path, "r") as logFile:
+        for line in logFile:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "moves" in record:
+                yield record["moves"], record["outcome"]
@@ -7,6 +7,9 @@
 #                                                                     #
 #######################################################################
 
+from TranspositionTable import hashBoard
+from Move import REGULAR
+
 class GameState:
     # Constructor for GameState 
     def __init__(self, currentTurn, redPieces, blackPieces, redKings, blackKings, redThreat, blackThreat, board):
@@ -16,7 +19,69 @@ class GameState:
         self.blackPieces = blackPieces # 2D list containing the black pieces and their locations on the board
         self.redKings = redKings # 2D list containing the red kings and their locations on the board
         self.blackKings = blackKings # 2D list containing the black kings and their locations on the board
-        self.redThreat = redThreat # 1D list containing the indeces of the black pieces THREATNED by red
-        self.blackThreat = blackThreat # 1D list containing the indeces of the red pieces THREATNED by black
+        self.redThreat = redThreat # Set containing the squares of the black pieces THREATNED by red in the current position
+        self.blackThreat = blackThreat # Set containing the squares of the red pieces THREATNED by black in the current position
         self.board = board  # Matrix of characters - represents the checkers board
-        self.info = [len(self.blackPieces), len(self.redPieces), len(self.blackKings), len(self.redKings), len(self.redThreat), len(self.blackThreat)] # list of attribute lengths - used in target function
+        self.info = [len(self.blackPieces), len(self.redPieces), len(self.blackKings), len(self.redKings), len(self.redThreat), len(self.blackThreat)] # list of attribute lengths - used in target function, kept up to date by updateInfo and updateThreats
+        self.hash = hashBoard(board, currentTurn) # Zobrist hash of the position, kept up to date by PerformanceSystem.makeMove
+        # Piece on each of the 32 playable squares (row*4 + col//2), None if the square is empty
+        # The entries are the [row, col] lists stored in the pieces lists, kept up to date by PerformanceSystem.makeMove
+        self.squares = [None] * 32
+        for pieces in (redPieces, blackPieces, redKings, blackKings):
+            for piece in pieces:
+                self.squares[piece[0]*4 + piece[1]//2] = piece
+
+    # Builds a game state from a matrix of characters such as the one supplied by ExperimentGenerator
+    # The pieces lists are in board order and the threat sets are empty until PerformanceSystem.updateThreats is called
+    @staticmethod
+    def fromBoard(board, currentTurn):
+        pieces = {"r": [], "b": [], "R": [], "B": []}
+        for row in range(0, 8):
+            for col in range(row % 2, 8, 2):
+                if board[row][col] in pieces:
+                    pieces[board[row][col]].append([row, col])
+        return GameState(currentTurn, pieces["r"], pieces["b"], pieces["R"], pieces["B"], set(), set(), [list(boardRow) for boardRow in board])
+
+    # Applies the feature changes caused by a Move of the current player to a feature list
+    # Only captures and promotions change the piece counters; threats are synchronised separately
+    def applyMoveToInfo(self, info, move):
+        if self.currentTurn == "red":
+            # Promotion to king
+            if move.kind == REGULAR and move.target < 4:
+                info[1] -= 1
+                info[3] += 1
+            # Elimination of black pieces
+            for capturedKind in move.capturedKinds:
+                if capturedKind == REGULAR:
+                    info[0] -= 1
+                else:
+                    info[2] -= 1
+        elif self.currentTurn == "black":
+            # Promotion to king
+            if move.kind == REGULAR and move.target >= 28:
+                info[0] -= 1
+                info[2] += 1
+            # Elimination of red pieces
+            for capturedKind in move.capturedKinds:
+                if capturedKind == REGULAR:
+                    info[1] -= 1
+                else:
+                    info[3] -= 1
+
+    # Updates the feature counters for a move that is about to be made
+    def updateInfo(self, move):
+        self.applyMoveToInfo(self.info, move)
+
+    # Synchronises the threat counters with the threat sets
+    def updateThreats(self):
+        self.info[4] = len(self.redThreat)
+        self.info[5] = len(self.blackThreat)
+
+    # Returns the feature list of the game state that succeeds a given move without making the move
+    # redThreat and blackThreat are the numbers of pieces threatened by each player after the move
+    def getSuccessorInfo(self, move, redThreat, blackThreat):
+        info = list(self.info)
+        self.applyMoveToInfo(info, move)
+        info[4] = redThreat
+        info[5] = blackThreat
+        return info
@@ -8,39 +8,83 @@
 # weighting coefficients for the hypothesis target function.
 #
 # Weighting coefficient limits of [2, 2, 4, 4, 8, 8] are imposed
-# by a sensitivity based updating rule.
+# by a sensitivity based updating rule. Hypotheses of other
+# feature sets pass the coefficient limits of their FeatureSet.
+#
+# updateHypothesisBatch is a vectorised LMS rule that takes the
+# training states as an (N, F) matrix of F features and the
+# training values as a vector of N targets. NumPy must be
+# installed to use it.
 #
 ####################################
 
 import copy
+import numpy as np
 from ComputeEquation import ComputeEquation
 
+# Coefficient limits of the six features of GameState.info
+COEFFICIENT_LIMITS = [2, 2, 4, 4, 8, 8]
+
 class Generalizer:
     @staticmethod
-    def updateHypothesis(trainingExamples, currentHypothesis):
-        updatedHypothesis = [None] * 6
-        # Set limits on coefficient magnitudes
-        coeffLim = [2, 2, 4, 4, 8, 8]
+    def updateHypothesis(trainingExamples, currentHypothesis, coefficientLimits=None):
+        updatedHypothesis = [None] * len(currentHypothesis)
         # Sensitivity factor set at 0.001, other values may be used
         sensitivityFactor = 0.001;
         for i in range (0, len(trainingExamples)):
             tempArray = trainingExamples[i][0]
-            updatedHypothesis[0] = currentHypothesis[0] + sensitivityFactor*(trainingExamples[i][1]-ComputeEquation.computeEqn(trainingExamples[i][0], currentHypothesis))*(tempArray[0])
-            updatedHypothesis[1] = currentHypothesis[1] + sensitivityFactor*(trainingExamples[i][1]-ComputeEquation.computeEqn(trainingExamples[i][0], currentHypothesis))*(tempArray[1])
-            updatedHypothesis[2] = currentHypothesis[2] + sensitivityFactor*(trainingExamples[i][1]-ComputeEquation.computeEqn(trainingExamples[i][0], currentHypothesis))*(tempArray[2])
-            updatedHypothesis[3] = currentHypothesis[3] + sensitivityFactor*(trainingExamples[i][1]-ComputeEquation.computeEqn(trainingExamples[i][0], currentHypothesis))*(tempArray[3])
-            updatedHypothesis[4] = currentHypothesis[4] + sensitivityFactor*(trainingExamples[i][1]-ComputeEquation.computeEqn(trainingExamples[i][0], currentHypothesis))*(tempArray[4])
-            updatedHypothesis[5] = currentHypothesis[5] + sensitivityFactor*(trainingExamples[i][1]-ComputeEquation.computeEqn(trainingExamples[i][0], currentHypothesis))*(tempArray[5])
+            for j in range (0, len(currentHypothesis)):
+                updatedHypothesis[j] = currentHypothesis[j] + sensitivityFactor*(trainingExamples[i][1]-ComputeEquation.computeEqn(trainingExamples[i][0], currentHypothesis))*(tempArray[j])
         
         # Round updated hypothesis values to truncate error
         # Values produced otherwise have more significant figures than model accuracy allows
-        for i in range (0, 6):
+        for i in range (0, len(currentHypothesis)):
             updatedHypothesis[i] = round(updatedHypothesis[i], 2)
         
-        # Impose weighting coefficient limitations
-        for j in range (0, 6):
+        return Generalizer.imposeLimits(updatedHypothesis, currentHypothesis, coefficientLimits)
+
+    # Applies the LMS rule to a matrix of training states (one row per state) and a vector of training values
+    # With batchSize=1 the coefficients are updated after every example, larger batches apply the mean
+    # update of batchSize examples at once and batchSize=None uses all examples as a single batch
+    # coefficientLimits holds the limit of every coefficient, COEFFICIENT_LIMITS if None
+    @staticmethod
+    def updateHypothesisBatch(features, targets, currentHypothesis, batchSize=1, coefficientLimits=None):
+        # Sensitivity factor set at 0.001, other values may be used
+        sensitivityFactor = 0.001
+        features = np.asarray(features, dtype=float).reshape(-1, len(currentHypothesis))
+        targets = np.asarray(targets, dtype=float)
+        weights = np.array(currentHypothesis, dtype=float)
+        if batchSize is None:
+            batchSize = max(len(targets), 1)
+        if batchSize == 1:
+            for i in range(0, len(targets)):
+                weights += sensitivityFactor*(targets[i] - features[i].dot(weights))*features[i]
+        else:
+            for start in range(0, len(targets), batchSize):
+                batch = features[start:start+batchSize]
+                residuals = targets[start:start+batchSize] - batch.dot(weights)
+                weights += sensitivityFactor*residuals.dot(batch)/len(residuals)
+
+        # Round updated hypothesis values to truncate error
+        updatedHypothesis = [round(float(w), 2) for w in weights]
+        return Generalizer.imposeLimits(updatedHypothesis, currentHypothesis, coefficientLimits)
+
+    # Converts an updated hypothesis into the next hypothesis by limiting the change and magnitude of every coefficient
+    # Returns a new list, currentHypothesis is left unchanged
+    @staticmethod
+    def imposeLimits(updatedHypothesis, currentHypothesis, coefficientLimits=None):
+        # Set limits on coefficient magnitudes
+        coeffLim = COEFFICIENT_LIMITS if coefficientLimits is None else coefficientLimits
+        if len(coeffLim) != len(currentHypothesis):
+            raise ValueError('The hypothesis has ' + str(len(currentHypothesis)) + ' coefficients but ' + str(len(coeffLim)) + ' coefficient limits were given.')
+        nextHypothesis = [None] * len(currentHypothesis)
+        for j in range (0, len(currentHypothesis)):
             # Determine percentage increase from current->updated hypothesis
-            weightVal = (updatedHypothesis[j] - currentHypothesis[j])/currentHypothesis[j]
+            # A coefficient of zero has no percentage change, so the absolute change is used instead
+            if currentHypothesis[j] == 0:
+                weightVal = updatedHypothesis[j]
+            else:
+                weightVal = (updatedHypothesis[j] - currentHypothesis[j])/currentHypothesis[j]
             
             # Force coefficient change maximum at 1 or -1
             if weightVal > 1:
@@ -49,11 +93,6 @@ class Generalizer:
                 weightVal = -1
             
             # Force upper/lower limit convergence
-            if (currentHypothesis[j] + weightVal) > coeffLim[j]:
-                currentHypothesis[j] = round(coeffLim[j], 2)
-            if (currentHypothesis[j] + weightVal) < (-1*coeffLim[j]):
-                currentHypothesis[j] = round(-1*coeffLim[j], 2)
-            else:
-                currentHypothesis[j] = round(currentHypothesis[j] + weightVal, 2)
+            nextHypothesis[j] = round(min(max(currentHypothesis[j] + weightVal, -1*coeffLim[j]), coeffLim[j]), 2)
             
-        return currentHypothesis
\ No newline at end of file
+        return nextHypothesis
\ No newline at end of file
@@ -0,0 +1,23 @@
+#######################################################################
+# File name: Move.py                                                  #
+# Author: PhilipBasaric                                               #
+#                                                                     #
+# Description: The Move record used by PerformanceSystem and          #
+# PerformanceSystemHumanIO. A move refers to the moved and the        #
+# eliminated pieces by their squares (row*4 + col//2) and stores the  #
+# kinds of the pieces as small integers.                              #
+#                                                                     #
+# Moves are immutable tuples without a per-instance dictionary, so    #
+# they are cheap to create, compare and hash.                         #
+#                                                                     #
+#######################################################################
+
+from collections import namedtuple
+
+# Kinds of the moved and the eliminated pieces
+REGULAR, KING = range(0, 2)
+
+# captured holds the squares of the pieces eliminated by a capture chain in the order they are jumped,
+# and capturedKinds their kinds. Both are empty for a move that does not eliminate a piece
+class Move(namedtuple("Move", ["source", "target", "captured", "kind", "capturedKinds"])):
+    __slots__ = ()
@@ -0,0 +1,208 @@
+#######################################################################
+# File name: PDNFile.py                                               #
+# Author: BenjaminBeggs                                               #
+#                                                                     #
+# Description: Writes and reads game records in Portable Draughts    #
+# Notation (PDN). PDNWriter appends every finished game to a file as  #
+# it is played, and readGames is a generator that returns the games   #
+# of a file one at a time, so files with millions of games are read  #
+# without loading them into memory.                                   #
+#                                                                     #
+# Squares are numbered 1 to 32 as on a standard checkers board. Red   #
+# moves first and is written as Black, starting on squares 1 to 12,   #
+# so the games start from the standard position of PDN. The board is  #
+# mirrored top to bottom for this: square s of the engines is written #
+# as 29 - 4*(s//4) + s%4.                                             #
+#                                                                     #
+# A capture is written with the landing square of every jump, e.g.   #
+# 9x18x27, and a quiet move as 9-14. Red wins are written 1-0, black  #
+# wins 0-1, draws 1/2-1/2 and unfinished games *.                     #
+#                                                                     #
+#######################################################################
+
+from collections import namedtuple
+from GameLogger import getMoveRecord
+
+# Size of the write buffer of the PDN file in bytes
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Longest line of move text written
+LINE_LENGTH = 79
+
+# Results of PDN for the outcomes of a trace
+RESULTS = {"red": "1-0", "black": "0-1", "draw": "1/2-1/2", None: "*"}
+OUTCOMES = {"1-0": "red", "2-0": "red", "0-1": "black", "0-2": "black", "1/2-1/2": "draw", "1-1": "draw", "*": None}
+
+# A game read from a PDN file
+# tags maps the tag names to their values, moves holds every move as [source, target, [eliminated squares]]
+# with the squares of the engines, as written by GameLogger. The eliminated squares are None when the
+# file leaves out the intermediate squares of a multi-jump
+PDNGame = namedtuple("PDNGame", ["tags", "moves", "result"])
+
+# Converts a square of the engines to its PDN number
+def squareToNumber(square):
+    return 29 - 4*(square // 4) + square % 4
+
+# Converts a PDN number to the square of the engines
+def numberToSquare(number):
+    return (7 - (number - 1) // 4)*4 + (number - 1) % 4
+
+# Returns the (row, column) of a square of the engines
+def getCoordinates(square):
+    row = square // 4
+    return row, 2*(square % 4) + row % 2
+
+# Returns the outcome of a PDN result, as stored in Trace.outcome
+def getOutcome(result):
+    return OUTCOMES.get(result)
+
+# Returns the squares visited by a move given as [source, target, [eliminated squares]]
+# Every jump lands on the square behind the eliminated piece. The bitboard engine stores the eliminated
+# pieces as a mask, so the order of the jumps is searched for, trying the order of captured first
+def getPath(source, target, captured):
+    if not captured:
+        return [source, target]
+    path = [source]
+    remaining = list(captured)
+    if addJumps(path, target, remaining):
+        return path
+    raise ValueError("No chain of jumps from square " + str(source) + " to square " + str(target) + " eliminates " + str(captured))
+
+# Extends path by jumps over every square of remaining, ending on target; returns whether such a chain exists
+def addJumps(path, target, remaining):
+    if not remaining:
+        return path[-1] == target
+    row, col = getCoordinates(path[-1])
+    for index, square in enumerate(remaining):
+        capturedRow, capturedCol = getCoordinates(square)
+        landingRow = 2*capturedRow - row
+        landingCol = 2*capturedCol - col
+        if abs(capturedRow - row) != 1 or abs(capturedCol - col) != 1 or not (0 <= landingRow < 8 and 0 <= landingCol < 8):
+            continue
+        path.append(landingRow*4 + landingCol // 2)
+        if addJumps(path, target, remaining[:index] + remaining[index + 1:]):
+            return True
+        path.pop()
+    return False
+
+# Returns the PDN text of a move of either engine
+def getMoveText(move):
+    source, target, captured = getMoveRecord(move)
+    numbers = [str(squareToNumber(square)) for square in getPath(source, target, captured)]
+    return ("x" if captured else "-").join(numbers)
+
+# Returns the move record of the PDN text of a move
+def readMoveText(text):
+    separator = "x" if "x" in text else "-"
+    path = [numberToSquare(int(number)) for number in text.split(separator)]
+    if separator == "-":
+        return [path[0], path[-1], []]
+    captured = []
+    for square, landing in zip(path, path[1:]):
+        row, col = getCoordinates(square)
+        landingRow, landingCol = getCoordinates(landing)
+        # A step longer than one jump leaves out the squares in between
+        if abs(landingRow - row) != 2 or abs(landingCol - col) != 2:
+            return [path[0], path[-1], None]
+        captured.append(((row + landingRow) // 2)*4 + ((col + landingCol) // 2) // 2)
+    return [path[0], path[-1], captured]
+
+class PDNWriter:
+    # Constructor for PDNWriter
+    # The file is appended to, so a resumed run continues the records of the previous run
+    def __init__(self, path, event="Flying King self-play"):
+        self.event = event
+        self.file = open(path, "a", buffering=WRITE_BUFFER_SIZE)
+
+    # Writes the moves and outcome of a game; extra tags are written after the standard ones
+    def writeGame(self, moves, outcome, round=None, tags=None):
+        result = RESULTS[outcome]
+        lines = ['[Event "' + self.event + '"]']
+        if round is not None:
+            lines.append('[Round "' + str(round) + '"]')
+        lines.append('[Black "red"]')
+        lines.append('[White "black"]')
+        lines.append('[Result "' + result + '"]')
+        lines.append('[GameType "21"]')
+        if tags is not None:
+            for name, value in tags.items():
+                lines.append('[' + name + ' "' + str(value) + '"]')
+        lines.append("")
+
+        # Move text, broken into lines of at most LINE_LENGTH characters
+        tokens = []
+        for ply, move in enumerate(moves):
+            if ply % 2 == 0:
+                tokens.append(str(ply // 2 + 1) + ".")
+            tokens.append(getMoveText(move))
+        tokens.append(result)
+        line = ""
+        for token in tokens:
+            if line and len(line) + 1 + len(token) > LINE_LENGTH:
+                lines.append(line)
+                line = token
+            else:
+                line = line + " " + token if line else token
+        lines.append(line)
+        self.file.write("\n".join(lines) + "\n\n")
+
+    # Writes the game of a trace generated with recordMoves
+    def writeTrace(self, trace, round=None):
+        self.writeGame(trace.moves, trace.outcome, round)
+
+    # Writes the buffered games and closes the file
+    def close(self):
+        self.file.close()
+
+# Returns the games of a PDN file one at a time as PDNGames
+# Comments, move numbers and variations are skipped; a game ends at its result or at the next tag section
+def readGames(path):
+    tags = {}
+    moves = []
+    result = None
+    inComment = False
+    variationDepth = 0
+    with open(path, "r") as pdnFile:
+        for line in pdnFile:
+            line = line.strip()
+            if inComment:
+                if "}" not in line:
+                    continue
+                line = line[line.index("}") + 1:]
+                inComment = False
+            if line.startswith("["):
+                # A tag section after move text starts a new game
+                if moves or result is not None:
+                    yield PDNGame(tags, moves, result)
+                    tags, moves, result = {}, [], None
+                name, _, value = line[1:line.rindex("]")].partition(" ")
+                tags[name] = value.strip().strip('"')
+                continue
+            while "{" in line:
+                start = line.index("{")
+                end = line.find("}", start)
+                if end < 0:
+                    line = line[:start]
+                    inComment = True
+                else:
+                    line = line[:start] + " " + line[end + 1:]
+            for token in line.replace("(", " ( ").replace(")", " ) ").split():
+                if token == "(":
+                    variationDepth += 1
+                elif token == ")":
+                    variationDepth -= 1
+                elif variationDepth > 0:
+                    continue
+                elif token in OUTCOMES:
+                    result = token
+                    yield PDNGame(tags, moves, result)
+                    tags, moves, result = {}, [], None
+                else:
+                    # Move numbers are written as "12." and the replies of white as "12..."
+                    token = token.rstrip("!?*")
+                    if "." in token:
+                        token = token[token.rindex(".") + 1:]
+                    if token:
+                        moves.append(readMoveText(token))
+    if moves or tags:
+        yield PDNGame(tags, moves, result)
@@ -11,15 +11,67 @@
 
 
 import random, time, copy
+from GameState import GameState
+from Move import Move, REGULAR, KING
+from ComputeEquation import ComputeEquation
+from Trace import Trace
+from PositionHistory import PositionHistory
+from BitboardPerformanceSystem import BitboardGameState, squareToCoordinates
+from TranspositionTable import hashMove, hashCapture, PIECE_TYPES
+
+# Directions a piece can move in, as indices into the entries of DIAGONALS, in the order moves are generated
+UP_RIGHT, UP_LEFT, DOWN_RIGHT, DOWN_LEFT = range(0, 4)
+DIRECTION_STEPS = [(-1, 1), (-1, -1), (1, 1), (1, -1)] # (row step, column step) of each direction
+KING_DIRECTIONS = (UP_RIGHT, UP_LEFT, DOWN_RIGHT, DOWN_LEFT)
+RED_DIRECTIONS = (UP_RIGHT, UP_LEFT) # regular red pieces move UP the board
+BLACK_DIRECTIONS = (DOWN_RIGHT, DOWN_LEFT) # regular black pieces move DOWN the board
+
+# Builds the table of diagonal neighbours of the 32 playable squares
+# Square row*4 + col//2 maps to one entry per direction: (neighbour row, neighbour column, landing row, landing column)
+# of a jump over the neighbour, with None for the landing square if the jump leaves the board,
+# or None for the whole entry if the neighbour is off the board
+def buildDiagonals():
+    diagonals = []
+    for square in range(0, 32):
+        row = square // 4
+        col = 2*(square % 4) + row % 2
+        entries = []
+        for rowStep, colStep in DIRECTION_STEPS:
+            if not (-1 < row + rowStep < 8 and -1 < col + colStep < 8):
+                entries.append(None)
+            elif not (-1 < row + 2*rowStep < 8 and -1 < col + 2*colStep < 8):
+                entries.append((row + rowStep, col + colStep, None, None))
+            else:
+                entries.append((row + rowStep, col + colStep, row + 2*rowStep, col + 2*colStep))
+        diagonals.append(tuple(entries))
+    return diagonals
+
+DIAGONALS = buildDiagonals()
 
 # This is the performance system object. It is responsible for producing the game trace used by the critic module
 class PerformanceSystem:
+    # Constructor for PerformanceSystem
+    # search is an optional AlphaBetaSearch that replaces the one-ply greedy move selection
+    # table is an optional TranspositionTable caching the predictions of the greedy move selection
+    # repetitionLimit and noCaptureMoveLimit enable the draw rules of PositionHistory in getTrace
+    # forcedCapture makes eliminations mandatory: when a piece can be eliminated, only eliminations are legal
+    # recordMoves stores the moves of every game in the moves attribute of its trace
+    # featureSet is an optional FeatureSet that replaces the six features of GameState.info in the predictions and traces
+    def __init__(self, search=None, table=None, repetitionLimit=None, noCaptureMoveLimit=None, forcedCapture=False, recordMoves=False, featureSet=None):
+        self.search = search
+        self.table = table
+        self.tableHypotheses = None # Hypotheses the predictions stored in table were made with
+        self.repetitionLimit = repetitionLimit
+        self.noCaptureMoveLimit = noCaptureMoveLimit
+        self.forcedCapture = forcedCapture
+        self.recordMoves = recordMoves
+        self.moveHistory = None # Moves made in the game being played, when recordMoves is set
+        self.featureSet = featureSet
 
     # This function performs all actions that constitute a turn
     def runGame(self, gameState, v1, v2):
-        # Update game state attributes
-        gameState.info = [len(gameState.blackPieces), len(gameState.redPieces), len(gameState.blackKings), len(gameState.redKings), len(gameState.redThreat), len(gameState.blackThreat)] 
         self.move(gameState, v1, v2)
+        self.updateThreats(gameState) # Threats are recomputed for the new position
         # If one side has no pieces, game is over 
         if len(gameState.redPieces) == 0 and len(gameState.redKings) == 0 or len(gameState.blackPieces) == 0 and len(gameState.blackKings) == 0:
             gameState.isOver = True
@@ -41,8 +93,7 @@ class PerformanceSystem:
     # This function performs a move for a given player 
     def move(self, gameState, v1, v2):
         # Get set of legal moves with current board state
-        legalMoves = self.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.redThreat, gameState.blackThreat,
-                                   gameState.board) 
+        legalMoves = self.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.board) 
         # Check for stalemate 
         if len(legalMoves) == 0:
             gameState.isOver = True
@@ -51,561 +102,304 @@ class PerformanceSystem:
         else:
             bestMove = self.getBestMove(gameState, legalMoves, v1, v2) # get the best move from legalMoves
             self.makeMove(gameState, bestMove) # make the best move using bestMove
+            if self.moveHistory is not None:
+                self.moveHistory.append(bestMove)
         
     # This function probes every move and returns a 2D list containing the set of legal moves
-    def getLegalMoves(self, currentTurn, redPieces, blackPieces, redKings, blackKings, redThreat, blackThreat, board):
+    # King moves are listed first, then the moves of the regular pieces
+    # With forcedCapture, a scan for eliminations runs first and the regular moves are only generated when there are none
+    def getLegalMoves(self, currentTurn, redPieces, blackPieces, redKings, blackKings, board):
         legalMoves = [] # array to be returned
-
-        # Call getKingMoves - logic for King function 
-        self.getKingMoves(legalMoves, currentTurn, redPieces, blackPieces, redKings, blackKings, redThreat, blackThreat, board)
-        
-        # The following code block accounts for all possible moves on the red player's side of the board
+        if self.forcedCapture:
+            if currentTurn == "red":
+                self.addCaptures(legalMoves, redKings, KING, KING_DIRECTIONS, "b", "B", board)
+                self.addCaptures(legalMoves, redPieces, REGULAR, RED_DIRECTIONS, "b", "B", board)
+            elif currentTurn == "black":
+                self.addCaptures(legalMoves, blackKings, KING, KING_DIRECTIONS, "r", "R", board)
+                self.addCaptures(legalMoves, blackPieces, REGULAR, BLACK_DIRECTIONS, "r", "R", board)
+            if len(legalMoves) > 0:
+                return legalMoves
         if currentTurn == "red":
-            for piece in redPieces:
-                # move UP and to the RIGHT
-                if (piece[0] - 1) > -1 and (piece[1] + 1) < 8: # check bounds
-                    # Regular diagonal
-                    if board[piece[0] - 1][piece[1] + 1] == " ": 
-                        legalMoves.append([redPieces.index(piece), piece[0]-1, piece[1]+1, -1, "regular", "None"])
-                    # Elimination
-                    if (piece[0] - 2) > -1 and (piece[1] + 2) < 8: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] - 1][piece[1] + 1] == "b" and board[piece[0] - 2][piece[1] + 2] == " ":
-                            threat = self.getIndex(blackPieces, piece[0]-1, piece[1]+1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redPieces.index(piece), piece[0]-2, piece[1]+2, threat, "regular", "regular"])
-                        # King Elimination
-                        if board[piece[0] - 1][piece[1] + 1] == "B" and board[piece[0] - 2][piece[1] + 2] == " ":
-                            threat = self.getIndex(blackKings, piece[0]-1, piece[1]+1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redPieces.index(piece), piece[0]-2, piece[1]+2, threat, "regular", "king"])
-                # move UP and to the LEFT
-                if (piece[0] - 1) > -1 and (piece[1] - 1) > -1: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] - 1][piece[1] - 1] == " ": 
-                        legalMoves.append([redPieces.index(piece), piece[0]-1, piece[1]-1, -1, "regular", "None"])
-                    # Elimination
-                    if (piece[0] - 2) > -1 and (piece[1] - 2) > -1: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] - 1][piece[1] - 1] == "b" and board[piece[0] - 2][piece[1] - 2] == " ":
-                            threat = self.getIndex(blackPieces, piece[0]-1, piece[1]-1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redPieces.index(piece), piece[0]-2, piece[1]-2, threat, "regular", "regular"])
-                        # King Elimination 
-                        if board[piece[0] - 1][piece[1] - 1] == "B" and board[piece[0] - 2][piece[1] - 2] == " ":
-                            threat = self.getIndex(blackKings, piece[0]-1, piece[1]-1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redPieces.index(piece), piece[0]-2, piece[1]-2, threat, "regular", "king"])
-
-        # The following code block accounts for all possible moves on the black player's side of the board
-        elif currentTurn == "black": 
-             for piece in blackPieces:
-                 # move DOWN and to the RIGHT
-                if (piece[0] + 1) < 8 and (piece[1] + 1) < 8: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] + 1][piece[1] + 1] == " ": 
-                        legalMoves.append([blackPieces.index(piece), piece[0]+1, piece[1]+1, -1, "regular", "None"])
-                    # Elimination
-                    if (piece[0] + 2) < 8 and (piece[1] + 2) < 8: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] + 1][piece[1] + 1] == "r" and board[piece[0]+2][piece[1]+2] == " ":
-                            threat = self.getIndex(redPieces, piece[0]+1, piece[1]+1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackPieces.index(piece), piece[0]+2, piece[1]+2, threat, "regular", "regular"])
-                        # King Elimination
-                        if board[piece[0] + 1][piece[1] + 1] == "R" and board[piece[0]+2][piece[1]+2] == " ":
-                            threat = self.getIndex(redKings, piece[0]+1, piece[1]+1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackPieces.index(piece), piece[0]+2, piece[1]+2, threat, "regular", "king"])
-                # move DOWN and to the LEFT
-                if (piece[0] + 1) < 8 and (piece[1] - 1) > -1: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] + 1][piece[1] - 1] == " ": 
-                        legalMoves.append([blackPieces.index(piece), piece[0]+1, piece[1]-1, -1, "regular", "None"])
-                    # Elimination
-                    if (piece[0] + 2) < 8 and (piece[1] - 2) > -1: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] + 1][piece[1] - 1] == "r" and board[piece[0]+2][piece[1]-2] == " ":
-                            threat = self.getIndex(redPieces, piece[0]+1, piece[1]-1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackPieces.index(piece), piece[0]+2, piece[1]-2, threat, "regular", "regular"])
-                        # King Elimination
-                        if board[piece[0] + 1][piece[1] - 1] == "R" and board[piece[0]+2][piece[1]-2] == " ":
-                            threat = self.getIndex(redKings, piece[0]+1, piece[1]-1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackPieces.index(piece), piece[0]+2, piece[1]-2, threat, "regular", "king"])
+            self.addMoves(legalMoves, redKings, KING, KING_DIRECTIONS, "b", "B", board)
+            self.addMoves(legalMoves, redPieces, REGULAR, RED_DIRECTIONS, "b", "B", board)
+        elif currentTurn == "black":
+            self.addMoves(legalMoves, blackKings, KING, KING_DIRECTIONS, "r", "R", board)
+            self.addMoves(legalMoves, blackPieces, REGULAR, BLACK_DIRECTIONS, "r", "R", board)
         return legalMoves
 
-    # Helper function to getLegalMoves - details game code for King behaviour
-    def getKingMoves(self, legalMoves, currentTurn, redPieces, blackPieces, redKings, blackKings, redThreat, blackThreat, board):
-        # For red player
-        if currentTurn == "red":
-            for piece in redKings:
-                # move UP and to the RIGHT
-                if (piece[0] - 1) > -1 and (piece[1] + 1) < 8: # check bounds
-                    # Regular diagonal
-                    if board[piece[0] - 1][piece[1] + 1] == " ":
-                        legalMoves.append([redKings.index(piece), piece[0]-1, piece[1]+1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] - 2) > -1 and (piece[1] + 2) < 8: # check double bounds
-                        # Regular elimination
-                        if board[piece[0] - 1][piece[1] + 1] == "b" and board[piece[0] - 2][piece[1] + 2] == " ":
-                            threat = self.getIndex(blackPieces, piece[0]-1, piece[1]+1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redKings.index(piece), piece[0]-2, piece[1]+2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] - 1][piece[1] + 1] == "B" and board[piece[0] - 2][piece[1] + 2] == " ":
-                            threat = self.getIndex(blackKings, piece[0]-1, piece[1]+1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redKings.index(piece), piece[0]-2, piece[1]+2, threat, "king", "king"])
-                # move UP and to the LEFT
-                if (piece[0] - 1) > -1 and (piece[1] - 1) > -1: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] - 1][piece[1] - 1] == " ": 
-                        legalMoves.append([redKings.index(piece), piece[0]-1, piece[1]-1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] - 2) > -1 and (piece[1] - 2) > -1: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] - 1][piece[1] - 1] == "b" and board[piece[0] - 2][piece[1] - 2] == " ":
-                            threat = self.getIndex(blackPieces, piece[0]-1, piece[1]-1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redKings.index(piece), piece[0]-2, piece[1]-2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] - 1][piece[1] - 1] == "B" and board[piece[0] - 2][piece[1] - 2] == " ":
-                            threat = self.getIndex(blackKings, piece[0]-1, piece[1]-1)
-                            redThreat.append(threat) 
-                            legalMoves.append([redKings.index(piece), piece[0]-2, piece[1]-2, threat, "king", "king"])
-                # move DOWN and to the RIGHT
-                if (piece[0] + 1) < 8 and (piece[1] + 1) < 8: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] + 1][piece[1] + 1] == " ": 
-                        legalMoves.append([redKings.index(piece), piece[0]+1, piece[1]+1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] + 2) < 8 and (piece[1] + 2) < 8: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] + 1][piece[1] + 1] == "b" and board[piece[0]+2][piece[1]+2] == " ":
-                            threat = self.getIndex(blackPieces, piece[0]+1, piece[1]+1)
-                            redThreat.append(threat) # add black threat
-                            legalMoves.append([redKings.index(piece), piece[0]+2, piece[1]+2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] + 1][piece[1] + 1] == "B" and board[piece[0]+2][piece[1]+2] == " ":
-                            threat = self.getIndex(blackKings, piece[0]+1, piece[1]+1)
-                            redThreat.append(threat) # add black threat
-                            legalMoves.append([redKings.index(piece), piece[0]+2, piece[1]+2, threat, "king", "king"])
-                # move DOWN and to the LEFT
-                if (piece[0] + 1) < 8 and (piece[1] - 1) > -1: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] + 1][piece[1] - 1] == " ": 
-                        legalMoves.append([redKings.index(piece), piece[0]+1, piece[1]-1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] + 2) < 8 and (piece[1] - 2) > -1: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] + 1][piece[1] - 1] == "b" and board[piece[0]+2][piece[1]-2] == " ":
-                            threat = self.getIndex(blackPieces, piece[0]+1, piece[1]-1)
-                            redThreat.append(threat) # add black threat
-                            legalMoves.append([redKings.index(piece), piece[0]+2, piece[1]-2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] + 1][piece[1] - 1] == "B" and board[piece[0]+2][piece[1]-2] == " ":
-                            threat = self.getIndex(blackKings, piece[0]+1, piece[1]-1)
-                            redThreat.append(threat) # add black threat
-                            legalMoves.append([redKings.index(piece), piece[0]+2, piece[1]-2, threat, "king", "king"])
-
-        elif currentTurn == "black":
-            for piece in blackKings:
-                # move UP and to the RIGHT
-                if (piece[0] - 1) > -1 and (piece[1] + 1) < 8: # check bounds
-                    # Regular diagonal
-                    if board[piece[0] - 1][piece[1] + 1] == " ": 
-                        legalMoves.append([blackKings.index(piece), piece[0]-1, piece[1]+1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] - 2) > -1 and (piece[1] + 2) < 8: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] - 1][piece[1] + 1] == "r" and board[piece[0] - 2][piece[1] + 2] == " ":
-                            threat = self.getIndex(redPieces, piece[0]-1, piece[1]+1)
-                            blackThreat.append(threat) 
-                            legalMoves.append([blackKings.index(piece), piece[0]-2, piece[1]+2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] - 1][piece[1] + 1] == "R" and board[piece[0] - 2][piece[1] + 2] == " ":
-                            threat = self.getIndex(redKings, piece[0]-1, piece[1]+1)
-                            blackThreat.append(threat) 
-                            legalMoves.append([blackKings.index(piece), piece[0]-2, piece[1]+2, threat, "king", "king"])
-                # move UP and to the LEFT
-                if (piece[0] - 1) > -1 and (piece[1] - 1) > -1: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] - 1][piece[1] - 1] == " ": 
-                        legalMoves.append([blackKings.index(piece), piece[0]-1, piece[1]-1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] - 2) > -1 and (piece[1] - 2) > -1: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] - 1][piece[1] - 1] == "r" and board[piece[0] - 2][piece[1] - 2] == " ":
-                            threat = self.getIndex(redPieces, piece[0]-1, piece[1]-1)
-                            blackThreat.append(threat) 
-                            legalMoves.append([blackKings.index(piece), piece[0]-2, piece[1]-2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] - 1][piece[1] - 1] == "R" and board[piece[0] - 2][piece[1] - 2] == " ":
-                            threat = self.getIndex(redKings, piece[0]-1, piece[1]-1)
-                            blackThreat.append(threat) 
-                            legalMoves.append([blackKings.index(piece), piece[0]-2, piece[1]-2, threat, "king", "king"])
-                # move DOWN and to the RIGHT
-                if (piece[0] + 1) < 8 and (piece[1] + 1) < 8: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] + 1][piece[1] + 1] == " ": 
-                        legalMoves.append([blackKings.index(piece), piece[0]+1, piece[1]+1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] + 2) < 8 and (piece[1] + 2) < 8: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] + 1][piece[1] + 1] == "r" and board[piece[0]+2][piece[1]+2] == " ":
-                            threat = self.getIndex(redPieces, piece[0]+1, piece[1]+1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackKings.index(piece), piece[0]+2, piece[1]+2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] + 1][piece[1] + 1] == "R" and board[piece[0]+2][piece[1]+2] == " ":
-                            threat = self.getIndex(redKings, piece[0]+1, piece[1]+1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackKings.index(piece), piece[0]+2, piece[1]+2, threat, "king", "king"])
-                # move DOWN and to the LEFT
-                if (piece[0] + 1) < 8 and (piece[1] - 1) > -1: # check bounds
-                    # Regular Diagonal
-                    if board[piece[0] + 1][piece[1] - 1] == " ": 
-                        legalMoves.append([blackKings.index(piece), piece[0]+1, piece[1]-1, -1, "king", "None"])
-                    # Diagonal Elimination
-                    if (piece[0] + 2) < 8 and (piece[1] - 2) > -1: # check double bounds
-                        # Regular Elimination
-                        if board[piece[0] + 1][piece[1] - 1] == "r" and board[piece[0]+2][piece[1]-2] == " ":
-                            threat = self.getIndex(redPieces, piece[0]+1, piece[1]-1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackKings.index(piece), piece[0]+2, piece[1]-2, threat, "king", "regular"])
-                        # King Elimination
-                        if board[piece[0] + 1][piece[1] - 1] == "R" and board[piece[0]+2][piece[1]-2] == " ":
-                            threat = self.getIndex(redKings, piece[0]+1, piece[1]-1)
-                            blackThreat.append(threat) # add black threat
-                            legalMoves.append([blackKings.index(piece), piece[0]+2, piece[1]-2, threat, "king", "king"])
+    # Helper function to getLegalMoves - appends the moves of the given pieces in the given directions
+    # kind is the Move kind of the pieces (REGULAR or KING), enemyPiece and enemyKing are the board characters of the opponent
+    def addMoves(self, legalMoves, pieces, kind, directions, enemyPiece, enemyKing, board):
+        for piece in pieces:
+            square = piece[0]*4 + piece[1]//2
+            diagonals = DIAGONALS[square]
+            for direction in directions:
+                if diagonals[direction] is None: # neighbour is off the board
+                    continue
+                row, col, jumpRow, jumpCol = diagonals[direction]
+                # Regular diagonal
+                if board[row][col] == " ":
+                    legalMoves.append(Move(square, row*4 + col//2, (), kind, ()))
+                # Elimination, continued for as long as the piece can eliminate another piece
+                elif jumpRow is not None and board[jumpRow][jumpCol] == " " and (board[row][col] == enemyPiece or board[row][col] == enemyKing):
+                    pieceChar = board[piece[0]][piece[1]]
+                    board[piece[0]][piece[1]] = " " # the square left by the piece can be jumped onto again
+                    self.addJumps(legalMoves, square, kind, directions, enemyPiece, enemyKing, board, diagonals[direction], [], [])
+                    board[piece[0]][piece[1]] = pieceChar
 
-    # This is a helper function to getLegalMoves - It retrives the index of the piece that has been eliminated
-    def getIndex(self, pieces, i, j):
+    # Helper function to getLegalMoves - appends the eliminations of the given pieces in the given directions
+    def addCaptures(self, legalMoves, pieces, kind, directions, enemyPiece, enemyKing, board):
         for piece in pieces:
-            if piece[0] == i and piece[1] == j:
-                return pieces.index(piece) # return the index of the piece that has been eliminated
-        return None
-                
+            square = piece[0]*4 + piece[1]//2
+            diagonals = DIAGONALS[square]
+            for direction in directions:
+                diagonal = diagonals[direction]
+                if diagonal is None or diagonal[2] is None: # the jump leaves the board
+                    continue
+                row, col, jumpRow, jumpCol = diagonal
+                if board[jumpRow][jumpCol] == " " and (board[row][col] == enemyPiece or board[row][col] == enemyKing):
+                    pieceChar = board[piece[0]][piece[1]]
+                    board[piece[0]][piece[1]] = " "
+                    self.addJumps(legalMoves, square, kind, directions, enemyPiece, enemyKing, board, diagonal, [], [])
+                    board[piece[0]][piece[1]] = pieceChar
+
+    # Helper function to addMoves and addCaptures - makes the jump along a diagonal entry and appends the capture chains that follow it
+    # captured and capturedKinds are the squares and kinds of the pieces eliminated before the jump
+    # Eliminated pieces are marked on the board with "x" until the search backtracks, so that they can neither
+    # be jumped again nor be jumped onto. A regular piece that reaches the last row is promoted, which ends the chain
+    def addJumps(self, legalMoves, source, kind, directions, enemyPiece, enemyKing, board, diagonal, captured, capturedKinds):
+        row, col, jumpRow, jumpCol = diagonal
+        enemy = board[row][col]
+        board[row][col] = "x"
+        captured.append(row*4 + col//2)
+        capturedKinds.append(REGULAR if enemy == enemyPiece else KING)
+        target = jumpRow*4 + jumpCol//2
+        extended = False
+        if kind == KING or (jumpRow != 0 and jumpRow != 7):
+            diagonals = DIAGONALS[target]
+            for direction in directions:
+                nextDiagonal = diagonals[direction]
+                if nextDiagonal is None or nextDiagonal[2] is None:
+                    continue
+                nextRow, nextCol, nextJumpRow, nextJumpCol = nextDiagonal
+                if board[nextJumpRow][nextJumpCol] == " " and (board[nextRow][nextCol] == enemyPiece or board[nextRow][nextCol] == enemyKing):
+                    extended = True
+                    self.addJumps(legalMoves, source, kind, directions, enemyPiece, enemyKing, board, nextDiagonal, captured, capturedKinds)
+        if not extended:
+            legalMoves.append(Move(source, target, tuple(captured), kind, tuple(capturedKinds)))
+        captured.pop()
+        capturedKinds.pop()
+        board[row][col] = enemy
+
     # This function retrives the best move from legalMoves using the target function hypothesis
     def getBestMove(self, gameState, legalMoves, v1, v2):
         rand = random.randint(3,4)
         if rand % 2 == 0:
             return legalMoves[random.randint(0,len(legalMoves)-1)]
-        prediction = []
-        bestMove = []
         if len(legalMoves) == 1:
             return legalMoves[0]
+        if gameState.currentTurn == "red":
+            v = v1
+        elif gameState.currentTurn == "black":
+            v = v2
+        if self.search is not None:
+            return self.getSearchMove(gameState, legalMoves, v)
+        return self.getGreedyMove(gameState, legalMoves, v)
+
+    # This function retrives the move with the highest prediction of hypothesis v
+    # Each move is evaluated once, the last move with the highest prediction is kept
+    def getGreedyMove(self, gameState, legalMoves, v):
+        bestMove = []
+        maxVal = None
         for move in legalMoves:
-            if gameState.currentTurn == "red":
-                prediction.append(self.getPrediction(gameState, move, v1))
-            elif gameState.currentTurn == "black":
-                prediction.append(self.getPrediction(gameState, move, v2))
-        maxVal = max(prediction)
-        for move in legalMoves:
-            if gameState.currentTurn == "red":
-                if self.getPrediction(gameState, move, v1) == maxVal:
-                    bestMove = move
-            elif gameState.currentTurn == "black":
-                if self.getPrediction(gameState, move, v2) == maxVal:
-                    bestMove = move
+            prediction = self.getPrediction(gameState, move, v)
+            if maxVal is None or prediction >= maxVal:
+                maxVal = prediction
+                bestMove = move
         return bestMove
         
+    # This function retrives the move chosen by the alpha-beta search
+    # legalMoves are converted once to bitboard moves and searched as the root moves, the chosen move is mapped back by its index
+    def getSearchMove(self, gameState, legalMoves, v):
+        rootMoves = [(move.source, move.target, sum(1 << square for square in move.captured)) for move in legalMoves]
+        searchMove = self.search.getBestMove(BitboardGameState.fromBoard(gameState.board, gameState.currentTurn), v, list(rootMoves))
+        return legalMoves[rootMoves.index(searchMove)]
+
     # This function gets the output of the target hypothesis evaluated at the game state that succeeds a given move
     def getPrediction(self, gameState, move, v):
-        # get blackThreat and redThreat by calling the functions
-        if gameState.currentTurn == "red":
-            v4 = v[4]*self.getRedThreat(gameState, move)
-            v5 = v[5]*len(gameState.blackThreat)
-        elif gameState.currentTurn == "black":
-            v5 = v[5]*self.getBlackThreat(gameState, move)
-            v4 = v[4]*len(gameState.redThreat)
+        if self.featureSet is not None:
+            return self.getFeatureSetPrediction(gameState, move, v)
+        if self.table is not None:
+            return self.getTablePrediction(gameState, move, v)
+        # Only the threat counters require a scan of the board, the other features are derived from the move
+        successorInfo = gameState.getSuccessorInfo(move, *self.getSuccessorThreats(gameState, move))
+        return ComputeEquation.computeEqn(successorInfo, v)
 
-        # Logic for red
-        if gameState.currentTurn == "red":
-            if move[4] == "regular":
-                if move[1] == 0:
-                    v1 = v[1]*len(gameState.redPieces) - 1
-                    v3 = v[3]*len(gameState.redKings) + 1
-                else:
-                    v1 = v[1]*len(gameState.redPieces)
-                    v3 = v[3]*len(gameState.redKings)
-            elif move[4] == "king":
-                v1 = v[1]*len(gameState.redPieces)
-                v3 = v[3]*len(gameState.redKings)
-            if move[5] == "None":
-                v0 = v[0]*len(gameState.blackPieces)
-                v2 = v[2]*len(gameState.blackKings)
-            elif move[5] == "regular":
-                v0 = v[0]*len(gameState.blackPieces) - 1
-                v2 = v[2]*len(gameState.blackKings)
-            elif move[5] == "king":
-                v0 = v[0]*len(gameState.blackPieces)
-                v2 = v[2]*len(gameState.blackKings) - 1
+    # This function gets the prediction of a given move from the transposition table, computing and storing it on a miss
+    # The move is made in place and undone once the prediction is known
+    def getTablePrediction(self, gameState, move, v):
+        undo = self.makeMove(gameState, move)
+        entry = self.table.probe(gameState.hash)
+        if entry is not None:
+            prediction = entry[0]
+        else:
+            successorInfo = list(gameState.info)
+            successorInfo[4], successorInfo[5] = self.countThreats(gameState)
+            prediction = ComputeEquation.computeEqn(successorInfo, v)
+            self.table.store(gameState.hash, prediction, 0)
+        self.unmakeMove(gameState, undo)
+        return prediction
 
-        # Logic for black
-        elif gameState.currentTurn == "black":
-            if move[4] == "regular":
-                if move[1] == 0:
-                    v1 = v[1]*len(gameState.blackPieces) - 1
-                    v3 = v[3]*len(gameState.blackKings) + 1
-                else:
-                    v1 = v[1]*len(gameState.blackPieces)
-                    v3 = v[3]*len(gameState.blackKings)
-            elif move[4] == "king":
-                v1 = v[1]*len(gameState.blackPieces)
-                v3 = v[3]*len(gameState.blackKings)
-            if move[5] == "None":
-                v0 = v[0]*len(gameState.redPieces)
-                v2 = v[2]*len(gameState.redKings)
-            elif move[5] == "regular":
-                v0 = v[0]*len(gameState.redPieces) - 1
-                v2 = v[2]*len(gameState.redKings)
-            elif move[5] == "king":
-                v0 = v[0]*len(gameState.redPieces)
-                v2 = v[2]*len(gameState.redKings) - 1
-        val = v0 + v1 + v2 + v3 + v4 + v5
-        return val
+    # This function gets the prediction of a given move on the features of featureSet, using the transposition table if there is one
+    # The move is made in place and undone once the prediction is known
+    def getFeatureSetPrediction(self, gameState, move, v):
+        undo = self.makeMove(gameState, move)
+        entry = None if self.table is None else self.table.probe(gameState.hash)
+        if entry is not None:
+            prediction = entry[0]
+        else:
+            prediction = ComputeEquation.computeEqn(self.featureSet.getGameStateFeatures(gameState), v)
+            if self.table is not None:
+                self.table.store(gameState.hash, prediction, 0)
+        self.unmakeMove(gameState, undo)
+        return prediction
 
-    # This function finds the number of black pieces threatned by red for a given hypothetical move
-    def getRedThreat(self, gameState, move):
-        board = gameState.board
-        i = move[1]
-        j = move[2]
-        redThreat = 0
-        # Make deep copies to avoid aliasing issues 
-        tempRedPieces = copy.deepcopy(gameState.redPieces) 
-        tempRedKings = copy.deepcopy(gameState.redKings)
+    # This function returns the features of a game state stored in its trace
+    def getTraceFeatures(self, gameState):
+        if self.featureSet is None:
+            return gameState.info
+        return self.featureSet.getGameStateFeatures(gameState)
 
-        # Make hypothetical move
-        if move[4] == "regular":
-            tempRedPieces[move[0]] = [i, j] # update location of piece
-        elif move[4] == "king":
-            tempRedKings[move[0]] = [i, j] # update location of piece
+    # This function returns the number of pieces left on the board, which the draw rules use to detect eliminations
+    def getPieceCount(self, gameState):
+        return len(gameState.redPieces) + len(gameState.blackPieces) + len(gameState.redKings) + len(gameState.blackKings)
 
-        # Scan the board for threats made by regular red pieces
-        for piece in tempRedPieces:
-            # check UP and to the RIGHT
-            if (piece[0] - 2) > -1 and (piece[1] + 2) < 8: # check double bounds
-                if board[piece[0] - 1][piece[1] + 1] == "b" and board[piece[0] - 2][piece[1] + 2] == " ":
-                    redThreat = redThreat + 1
-                elif board[piece[0] - 1][piece[1] + 1] == "B" and board[piece[0] - 2][piece[1] + 2] == " ":
-                    redThreat = redThreat + 1
-            # check UP and to the LEFT
-            if (piece[0] - 2) > -1 and (piece[1] - 2) > -1: # check double bounds
-                if board[piece[0] - 1][piece[1] - 1] == "b" and board[piece[0] - 2][piece[1] - 2] == " ":
-                    redThreat = redThreat + 1
-                elif board[piece[0] - 1][piece[1] - 1] == "B" and board[piece[0] - 2][piece[1] - 2] == " ":
-                    redThreat = redThreat + 1
-    
-        # Scan the board for threats made by red kings         
-        for piece in tempRedKings:
-            # check UP and to the RIGHT
-            if (piece[0] - 2) > -1 and (piece[1] + 2) < 8: # check double bounds
-                if board[piece[0] - 1][piece[1] + 1] == "b" and board[piece[0] - 2][piece[1] + 2] == " ":
-                    redThreat = redThreat + 1
-                elif board[piece[0] - 1][piece[1] + 1] == "B" and board[piece[0] - 2][piece[1] + 2] == " ":
-                    redThreat = redThreat + 1
-            # check UP and to the LEFT
-            if (piece[0] - 2) > -1 and (piece[1] - 2) > -1: # check double bounds
-                if board[piece[0] - 1][piece[1] - 1] == "b" and board[piece[0] - 2][piece[1] - 2] == " ":
-                    redThreat = redThreat + 1
-                elif board[piece[0] - 1][piece[1] - 1] == "B" and board[piece[0] - 2][piece[1] - 2] == " ":
-                    redThreat = redThreat + 1
-            # check DOWN and to the RIGHT
-            if (piece[0] + 2) < 8 and (piece[1] + 2) < 8: # check double bounds
-                if board[piece[0] + 1][piece[1] + 1] == "b" and board[piece[0]+2][piece[1]+2] == " ":
-                    redThreat = redThreat + 1
-                elif board[piece[0] + 1][piece[1] + 1] == "B" and board[piece[0]+2][piece[1]+2] == " ":
-                    redThreat = redThreat + 1
-            # check DOWN and to the LEFT
-            if (piece[0] + 2) < 8 and (piece[1] - 2) > -1: # check double bounds
-                if board[piece[0] + 1][piece[1] - 1] == "b" and board[piece[0]+2][piece[1]-2] == " ":
-                    redThreat = redThreat + 1
-                elif board[piece[0] + 1][piece[1] - 1] == "B" and board[piece[0]+2][piece[1]-2] == " ":
-                    redThreat = redThreat + 1
-        return redThreat
+    # This function finds the numbers of black pieces threatned by red and of red pieces threatned by black for a given hypothetical move
+    # Both players are scanned, as a move can create threats for the mover and remove or uncover threats of the opponent
+    # The move is made in place and undone once the board has been scanned
+    def getSuccessorThreats(self, gameState, move):
+        undo = self.makeMove(gameState, move)
+        threats = self.countThreats(gameState)
+        self.unmakeMove(gameState, undo)
+        return threats
 
-    # This function finds the number of red pieces threatned by black for a given hypothetical move
-    def getBlackThreat(self, gameState, move):
-        board = gameState.board
-        i = move[1]
-        j = move[2]
-        blackThreat = 0
-        # Make deep copies to avoid aliasing issues 
-        tempBlackPieces = copy.deepcopy(gameState.blackPieces)
-        tempBlackKings = copy.deepcopy(gameState.blackKings)
-        
-        # Make hypothetical move
-        if move[4] == "regular":
-            tempBlackPieces[move[0]] = [i, j] # update location of piece
-        elif move[4] == "king":
-            tempBlackKings[move[0]] = [i, j] # update location of piece
+    # This function returns the numbers of black pieces threatned by red and of red pieces threatned by black in the current position
+    def countThreats(self, gameState):
+        redThreat = len(self.findThreats(gameState.board, gameState.redPieces, gameState.redKings, RED_DIRECTIONS, "b", "B"))
+        blackThreat = len(self.findThreats(gameState.board, gameState.blackPieces, gameState.blackKings, BLACK_DIRECTIONS, "r", "R"))
+        return redThreat, blackThreat
+
+    # This function returns the set of squares holding enemy pieces that can be eliminated by the given pieces and kings
+    # A piece that can be eliminated in more than one way is counted once
+    # directions are the directions regular pieces move in (RED_DIRECTIONS or BLACK_DIRECTIONS)
+    def findThreats(self, board, pieces, kings, directions, enemyPiece, enemyKing):
+        threatened = set()
+        for pieceList, pieceDirections in ((pieces, directions), (kings, KING_DIRECTIONS)):
+            for piece in pieceList:
+                diagonals = DIAGONALS[piece[0]*4 + piece[1]//2]
+                for direction in pieceDirections:
+                    diagonal = diagonals[direction]
+                    if diagonal is not None and diagonal[2] is not None and board[diagonal[2]][diagonal[3]] == " " and board[diagonal[0]][diagonal[1]] in (enemyPiece, enemyKing):
+                        threatened.add((diagonal[0], diagonal[1]))
+        return threatened
 
-        # Scan the board for threats made by regular black pieces 
-        for piece in tempBlackPieces:
-            # check DOWN and to the RIGHT
-            if (piece[0] + 2) < 8 and (piece[1] + 2) < 8: # check double bounds
-                if board[piece[0] + 1][piece[1] + 1] == "r" and board[piece[0]+2][piece[1]+2] == " ":
-                    blackThreat = blackThreat + 1
-                elif board[piece[0] + 1][piece[1] + 1] == "R" and board[piece[0]+2][piece[1]+2] == " ":
-                    blackThreat = blackThreat + 1
-            # check DOWN and to the LEFT
-            if (piece[0] + 2) < 8 and (piece[1] - 2) > -1: # check double bounds
-                if board[piece[0] + 1][piece[1] - 1] == "r" and board[piece[0]+2][piece[1]-2] == " ":
-                    blackThreat = blackThreat + 1
-                elif board[piece[0] + 1][piece[1] - 1] == "R" and board[piece[0]+2][piece[1]-2] == " ":
-                    blackThreat = blackThreat + 1
+    # This function recomputes the sets of threatened pieces for the current position and the matching feature counters
+    def updateThreats(self, gameState):
+        gameState.redThreat = self.findThreats(gameState.board, gameState.redPieces, gameState.redKings, RED_DIRECTIONS, "b", "B")
+        gameState.blackThreat = self.findThreats(gameState.board, gameState.blackPieces, gameState.blackKings, BLACK_DIRECTIONS, "r", "R")
+        gameState.updateThreats()
 
-        # Scan the board for threats made by black kings   
-        for piece in tempBlackKings:
-            # check UP and to the RIGHT
-            if (piece[0] - 2) > -1 and (piece[1] + 2) < 8: # check double bounds
-                if board[piece[0] - 1][piece[1] + 1] == "r" and board[piece[0] - 2][piece[1] + 2] == " ":
-                    blackThreat = blackThreat + 1
-                elif board[piece[0] - 1][piece[1] + 1] == "R" and board[piece[0] - 2][piece[1] + 2] == " ":
-                    blackThreat = blackThreat + 1
-            # check UP and to the LEFT
-            if (piece[0] - 2) > -1 and (piece[1] - 2) > -1: # check double bounds
-                if board[piece[0] - 1][piece[1] - 1] == "r" and board[piece[0] - 2][piece[1] - 2] == " ":
-                    blackThreat = blackThreat + 1
-                elif board[piece[0] - 1][piece[1] - 1] == "R" and board[piece[0] - 2][piece[1] - 2] == " ":
-                    blackThreat = blackThreat + 1
-            # move DOWN and to the RIGHT
-            if (piece[0] + 2) < 8 and (piece[1] + 2) < 8: # check double bounds
-                if board[piece[0] + 1][piece[1] + 1] == "r" and board[piece[0]+2][piece[1]+2] == " ":
-                    blackThreat = blackThreat + 1
-                elif board[piece[0] + 1][piece[1] + 1] == "R" and board[piece[0]+2][piece[1]+2] == " ":
-                    blackThreat = blackThreat + 1
-            # check DOWN and to the LEFT
-            if (piece[0] + 2) < 8 and (piece[1] - 2) > -1: # check double bounds
-                if board[piece[0] + 1][piece[1] - 1] == "r" and board[piece[0]+2][piece[1]-2] == " ":
-                    blackThreat = blackThreat + 1
-                elif board[piece[0] + 1][piece[1] - 1] == "R" and board[piece[0]+2][piece[1]-2] == " ":
-                    blackThreat = blackThreat + 1
-        return blackThreat
-    
     # This function makes a given move by updating the game board, the pieces lists, and removing any eliminated pieces
+    # The moved and eliminated pieces are found through the square index of the game state
+    # It returns an undo record that unmakeMove uses to restore the game state
     def makeMove(self, gameState, move):
-        i = move[1] # row position of target location on board
-        j = move[2] # column position of target location on board
+        i, j = squareToCoordinates(move.target) # row and column of the target location on board
         if gameState.currentTurn == "red":
-            if move[4] == "regular":
-                # Regular Diagonal
-                if move[3] == -1:
-                    gameState.board[i][j] = "r"
-                    gameState.board[gameState.redPieces[move[0]][0]][gameState.redPieces[move[0]][1]] = " " # add whitespace to previous position
-                    gameState.redPieces[move[0]][0] = i # update row position of red piece
-                    gameState.redPieces[move[0]][1] = j # update column position of red piece
-                # Elimination 
-                elif move[3] > -1:
-                    # Regular Elimination
-                    if move[5] == "regular":
-                        gameState.board[i][j] = "r"
-                        gameState.board[gameState.redPieces[move[0]][0]][gameState.redPieces[move[0]][1]] = " " # add whitespace to previous position
-                        gameState.board[gameState.blackPieces[move[3]][0]][gameState.blackPieces[move[3]][1]] = " "
-                        gameState.blackPieces.pop(move[3])
-                        gameState.redPieces[move[0]][0] = i # update row position of red piece
-                        gameState.redPieces[move[0]][1] = j # update column position of red piece
-                    # King Elimination
-                    elif move[5] == "king": 
-                        gameState.board[i][j] = "r"
-                        gameState.board[gameState.redPieces[move[0]][0]][gameState.redPieces[move[0]][1]] = " " # add whitespace to previous position
-                        gameState.board[gameState.blackKings[move[3]][0]][gameState.blackKings[move[3]][1]] = " "
-                        gameState.blackKings.pop(move[3])
-                        gameState.redPieces[move[0]][0] = i # update row position of red piece
-                        gameState.redPieces[move[0]][1] = j # update column position of red piece
-                # Promotion to king
-                if i == 0:
-                    gameState.board[i][j] = "R"
-                    gameState.redKings.append(gameState.redPieces[move[0]]) # add a new red king
-                    gameState.redPieces.pop(move[0]) # remove the promoted piece from redPieces
-            if move[4] == "king":
-                if move[3] == -1: # No piece being eliminated
-                    gameState.board[i][j] = "R"
-                    gameState.board[gameState.redKings[move[0]][0]][gameState.redKings[move[0]][1]] = " " # add whitespace to previous position
-                    gameState.redKings[move[0]][0] = i # update row position of red piece
-                    gameState.redKings[move[0]][1] = j # update column position of red piece
-                else:
-                    # Regular Elimination
-                    if move[5] == "regular":
-                        gameState.board[i][j] = "R"
-                        gameState.board[gameState.redKings[move[0]][0]][gameState.redKings[move[0]][1]] = " " # add whitespace to previous position
-                        gameState.board[gameState.blackPieces[move[3]][0]][gameState.blackPieces[move[3]][1]] = " "
-                        gameState.blackPieces.pop(move[3])
-                        gameState.redKings[move[0]][0] = i # update row position of red piece
-                        gameState.redKings[move[0]][1] = j # update column position of red piece
-                    # King Elimination
-                    elif move[5] == "king":
-                        gameState.board[i][j] = "R"
-                        gameState.board[gameState.redKings[move[0]][0]][gameState.redKings[move[0]][1]] = " " # add whitespace to previous position
-                        gameState.board[gameState.blackKings[move[3]][0]][gameState.blackKings[move[3]][1]] = " "
-                        gameState.blackKings.pop(move[3])
-                        gameState.redKings[move[0]][0] = i # update row position of red piece
-                        gameState.redKings[move[0]][1] = j # update column position of red piece
-            gameState.currentTurn = "black"    
+            pieces, kings, enemyPieces, enemyKings = gameState.redPieces, gameState.redKings, gameState.blackPieces, gameState.blackKings
+            pieceChar, kingChar, enemyChars, kingRow, nextTurn = "r", "R", ("b", "B"), 0, "black"
         elif gameState.currentTurn == "black":
-            if move[4] == "regular":
-                # Regular Diagonal
-                if move[3] == -1: 
-                    gameState.board[i][j] = "b"
-                    gameState.board[gameState.blackPieces[move[0]][0]][gameState.blackPieces[move[0]][1]] = " " # add whitespace to previous position
-                    gameState.blackPieces[move[0]][0] = i # update row position of red piece
-                    gameState.blackPieces[move[0]][1] = j # update column position of red piece
-                else:
-                    # Regular Elimination   
-                    if move[5] == "regular":
-                        gameState.board[i][j] = "b"
-                        gameState.board[gameState.blackPieces[move[0]][0]][gameState.blackPieces[move[0]][1]] = " " # add whitespace to previous position
-                        gameState.board[gameState.redPieces[move[3]][0]][gameState.redPieces[move[3]][1]] = " "
-                        gameState.redPieces.pop(move[3])
-                        gameState.blackPieces[move[0]][0] = i # update row position of red piece
-                        gameState.blackPieces[move[0]][1] = j # update column position of red piece
-                    # King Elimination 
-                    elif move[5] == "king":
-                        gameState.board[i][j] = "b"
-                        gameState.board[gameState.blackPieces[move[0]][0]][gameState.blackPieces[move[0]][1]] = " " # add whitespace to previous position
-                        gameState.board[gameState.redKings[move[3]][0]][gameState.redKings[move[3]][1]] = " "
-                        gameState.redKings.pop(move[3])
-                        gameState.blackPieces[move[0]][0] = i # update row position of red piece
-                        gameState.blackPieces[move[0]][1] = j # update column position of red piece
-                # Promotion to king
-                if i == 7:
-                    gameState.board[i][j] = "B"
-                    gameState.blackKings.append(gameState.blackPieces[move[0]]) # add a new black king
-                    gameState.blackPieces.pop(move[0]) # remove black piece
-            if move[4] == "king":
-                if move[3] == -1: # No piece being eliminated
-                    gameState.board[i][j] = "B"
-                    gameState.board[gameState.blackKings[move[0]][0]][gameState.blackKings[move[0]][1]] = " " # add whitespace to previous position
-                    gameState.blackKings[move[0]][0] = i # update row position of red piece
-                    gameState.blackKings[move[0]][1] = j # update column position of red piece
-                # Regular Elimination
-                if move[5] == "regular":
-                    gameState.board[i][j] = "B"
-                    gameState.board[gameState.blackKings[move[0]][0]][gameState.blackKings[move[0]][1]] = " " # add whitespace to previous position
-                    gameState.board[gameState.redPieces[move[3]][0]][gameState.redPieces[move[3]][1]] = " "
-                    gameState.redPieces.pop(move[3])
-                    gameState.blackKings[move[0]][0] = i # update row position of red piece
-                    gameState.blackKings[move[0]][1] = j # update column position of red piece
-                # King Elimination
-                elif move[5] == "king":
-                    gameState.board[i][j] = "B"
-                    gameState.board[gameState.blackKings[move[0]][0]][gameState.blackKings[move[0]][1]] = " " # add whitespace to previous position
-                    gameState.board[gameState.redKings[move[3]][0]][gameState.redKings[move[3]][1]] = " "
-                    gameState.redKings.pop(move[3])
-                    gameState.blackKings[move[0]][0] = i # update row position of red piece
-                    gameState.blackKings[move[0]][1] = j # update column position of red piece
-            gameState.currentTurn = "red"
-                        
-    # This function takes as input an initial board state and function hypothesis and produces a list containing the game trace for a given game 
+            pieces, kings, enemyPieces, enemyKings = gameState.blackPieces, gameState.blackKings, gameState.redPieces, gameState.redKings
+            pieceChar, kingChar, enemyChars, kingRow, nextTurn = "b", "B", ("r", "R"), 7, "red"
+        info = tuple(gameState.info) # Feature counters before the move
+        positionHash = gameState.hash # Hash before the move
+        gameState.updateInfo(move) # Adjust the feature counters for any capture or promotion
+        piece = gameState.squares[move.source]
+        gameState.board[piece[0]][piece[1]] = " " # add whitespace to previous position
+        gameState.board[i][j] = pieceChar if move.kind == REGULAR else kingChar
+        gameState.squares[move.source] = None
+        gameState.squares[move.target] = piece
+        piece[0] = i # update row position of piece
+        piece[1] = j # update column position of piece
+        # Elimination
+        captured = [] # eliminated pieces and their positions in their lists, restored by unmakeMove
+        for capturedSquare, capturedKind in zip(move.captured, move.capturedKinds):
+            capturedPiece = gameState.squares[capturedSquare]
+            gameState.squares[capturedSquare] = None
+            gameState.board[capturedPiece[0]][capturedPiece[1]] = " "
+            if capturedKind == REGULAR:
+                capturedIndex = enemyPieces.index(capturedPiece)
+                del enemyPieces[capturedIndex]
+                gameState.hash ^= hashCapture(capturedSquare, PIECE_TYPES[enemyChars[0]])
+            else:
+                capturedIndex = enemyKings.index(capturedPiece)
+                del enemyKings[capturedIndex]
+                gameState.hash ^= hashCapture(capturedSquare, PIECE_TYPES[enemyChars[1]])
+            captured.append((capturedPiece, capturedIndex))
+        # Promotion to king
+        promotedIndex = -1 # position of the promoted piece in the pieces list, restored by unmakeMove
+        if move.kind == REGULAR and i == kingRow:
+            gameState.board[i][j] = kingChar
+            promotedIndex = pieces.index(piece)
+            kings.append(pieces.pop(promotedIndex)) # move the promoted piece to the kings list
+        mover = PIECE_TYPES[pieceChar if move.kind == REGULAR else kingChar]
+        landing = PIECE_TYPES[gameState.board[i][j]]
+        gameState.hash ^= hashMove(move.source, move.target, mover, landing)
+        gameState.currentTurn = nextTurn
+        return (move, captured, promotedIndex, info, positionHash)
+
+    # This function reverses a move made by makeMove using the undo record it returned
+    def unmakeMove(self, gameState, undo):
+        move, captured, promotedIndex, info, positionHash = undo
+        if gameState.currentTurn == "black":
+            pieces, kings, enemyPieces, enemyKings = gameState.redPieces, gameState.redKings, gameState.blackPieces, gameState.blackKings
+            pieceChar, kingChar, enemyChars, previousTurn = "r", "R", ("b", "B"), "red"
+        elif gameState.currentTurn == "red":
+            pieces, kings, enemyPieces, enemyKings = gameState.blackPieces, gameState.blackKings, gameState.redPieces, gameState.redKings
+            pieceChar, kingChar, enemyChars, previousTurn = "b", "B", ("r", "R"), "black"
+        # Demote a piece that was promoted by the move
+        if promotedIndex > -1:
+            pieces.insert(promotedIndex, kings.pop())
+        piece = gameState.squares[move.target]
+        gameState.board[piece[0]][piece[1]] = " "
+        gameState.squares[move.target] = None
+        gameState.squares[move.source] = piece
+        piece[0], piece[1] = squareToCoordinates(move.source)
+        gameState.board[piece[0]][piece[1]] = pieceChar if move.kind == REGULAR else kingChar
+        # Restore the eliminated pieces in the reverse order of their elimination, so that every piece returns to its list position
+        for index in range(len(captured) - 1, -1, -1):
+            capturedPiece, capturedIndex = captured[index]
+            gameState.squares[move.captured[index]] = capturedPiece
+            if move.capturedKinds[index] == REGULAR:
+                enemyPieces.insert(capturedIndex, capturedPiece)
+                gameState.board[capturedPiece[0]][capturedPiece[1]] = enemyChars[0]
+            else:
+                enemyKings.insert(capturedIndex, capturedPiece)
+                gameState.board[capturedPiece[0]][capturedPiece[1]] = enemyChars[1]
+        gameState.info[:] = info
+        gameState.hash = positionHash
+        gameState.currentTurn = previousTurn
+
+    # This function takes as input an initial board state and function hypothesis and produces the Trace of a given game 
     def getTrace(self, trainingExperiment, currentHypothesis1, currentHypothesis2):
-        redTraceHistory = []
-        blackTraceHistory = []
+        trace = Trace(6 if self.featureSet is None else len(self.featureSet))
+        self.moveHistory = [] if self.recordMoves else None
         board = copy.deepcopy(trainingExperiment)
         v1 = copy.deepcopy(currentHypothesis1)
         v2 = copy.deepcopy(currentHypothesis2)
+        # Cached predictions only remain valid while the hypotheses are unchanged
+        if self.table is not None and self.tableHypotheses != (v1, v2):
+            self.table.clear()
+            self.tableHypotheses = (v1, v2)
         # 2D List containing red pieces and their positions on the above board
         redPieces = [
                 [5, 1],
@@ -638,20 +432,27 @@ class PerformanceSystem:
             ]
         redKings = [] # List of red kings is empty at game start
         blackKings = [] # List of black kings is empty at game start 
-        redThreat = [] # List of black pieces threatned by red is empty at game start
-        blackThreat = [] # List of red pieces threatned by black is empty at game start
+        redThreat = set() # Set of black pieces threatned by red is empty at game start
+        blackThreat = set() # Set of red pieces threatned by black is empty at game start
         currentTurn = "red" # Assume red always goes first at start of game
         gameState = GameState(currentTurn, redPieces, blackPieces, redKings, blackKings, redThreat, blackThreat, board) # Instantiate the initial game state
-        while gameState.isOver == False: # Keep iterating until game is over
-            if gameState.currentTurn == "red":
-                redTraceHistory.append(gameState.info)
-            elif gameState.currentTurn == "black":
-                blackTraceHistory.append(gameState.info)
-            if len(redTraceHistory) > 10000: # Impose hard limit on number of turns 
-                break
+        self.updateThreats(gameState)
+        history = PositionHistory(self.repetitionLimit, self.noCaptureMoveLimit)
+        history.record(gameState.hash, self.getPieceCount(gameState))
+        trace.append(self.getTraceFeatures(gameState))
+        while gameState.isOver == False and trace.getRedPlies() <= 10000: # Keep iterating until game is over, with a hard limit on number of turns
+            currentTurn = gameState.currentTurn
             self.runGame(gameState, v1, v2)
-        if gameState.currentTurn == "red":
-            redTraceHistory.append(gameState.info)
-        elif gameState.currentTurn == "black":
-            blackTraceHistory.append(gameState.info)
-        return [redTraceHistory, blackTraceHistory]
+            # Record the new game state unless the game ended without a move being made
+            if gameState.currentTurn != currentTurn:
+                trace.append(self.getTraceFeatures(gameState))
+                # End the game as a draw once the position has repeated too often or no piece has been eliminated for too long
+                if gameState.isOver == False and history.record(gameState.hash, self.getPieceCount(gameState)):
+                    trace.outcome = "draw"
+                    break
+        # The player to move at the end of the game has no pieces or no legal moves left, so the other player has won
+        if gameState.isOver:
+            trace.outcome = "black" if gameState.currentTurn == "red" else "red"
+        trace.moves = self.moveHistory
+        trace.trim()
+        return trace
@@ -0,0 +1,37 @@
+#######################################################################
+# File name: PositionHistory.py                                       #
+# Author: PhilipBasaric                                               #
+#                                                                     #
+# Description: Keeps the history of the positions of a game to apply  #
+# the draw rules. A game is drawn when the same position (with the    #
+# same player to move) occurs repetitionLimit times, or when both     #
+# players have made noCaptureMoveLimit moves in a row without an      #
+# elimination. Either rule is disabled by a limit of None.            #
+#                                                                     #
+#######################################################################
+
+class PositionHistory:
+    # Constructor for PositionHistory
+    def __init__(self, repetitionLimit=3, noCaptureMoveLimit=40):
+        self.repetitionLimit = repetitionLimit
+        self.noCaptureMoveLimit = noCaptureMoveLimit
+        self.counts = {} # Number of occurrences of each position hash since the last elimination
+        self.pieceCount = None # Number of pieces on the board in the last recorded position
+        self.quietPlies = 0 # Plies made since the last elimination
+
+    # Records a position of the game and returns True if it ends the game in a draw
+    def record(self, positionHash, pieceCount):
+        if pieceCount != self.pieceCount:
+            # Positions before an elimination can never occur again
+            self.counts = {}
+            self.quietPlies = 0
+            self.pieceCount = pieceCount
+        else:
+            self.quietPlies += 1
+        count = self.counts.get(positionHash, 0) + 1
+        self.counts[positionHash] = count
+        if self.repetitionLimit is not None and count >= self.repetitionLimit:
+            return True
+        if self.noCaptureMoveLimit is not None and self.quietPlies >= 2*self.noCaptureMoveLimit:
+            return True
+        return False
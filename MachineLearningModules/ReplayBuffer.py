@@ -0,0 +1,126 @@
+####################################
+# File name: ReplayBuffer.py
+# Author: BenjaminBeggs
+#
+# Description: Archive of self-play traces stored on disk in
+# two memory-mapped files so that hypotheses can be re-trained
+# from past games without simulating them again.
+#
+# <path>.rows holds one fixed-width row of 16 bit features per
+# game state, written as a ring: when the file is full the
+# oldest games are evicted to make room for new ones.
+# <path>.index holds a header followed by one (first row, plies)
+# record per retained game, oldest game first.
+#
+# Mini-batches are sampled from the memory map directly, so only
+# the sampled rows are read from disk.
+#
+####################################
+
+import os
+import numpy as np
+
+# Layout of the header stored at the start of the index file
+HEADER_SIZE = 8
+VERSION, FEATURE_COUNT, CAPACITY_ROWS, MAX_GAMES, FIRST_GAME, GAME_COUNT, GAMES_APPENDED = range(0, 7)
+FORMAT_VERSION = 1
+
+class ReplayBuffer:
+    # Constructor for ReplayBuffer
+    # Opens the archive at path, creating it with the given capacity if it does not exist yet
+    # capacityRows limits the number of stored game states and maxGames the number of retained games
+    def __init__(self, path, featureCount=6, capacityRows=1000000, maxGames=100000, seed=None):
+        self.path = path
+        self.random = np.random.default_rng(seed)
+        if os.path.exists(path + ".index"):
+            header = np.memmap(path + ".index", dtype=np.int64, mode="r", shape=(HEADER_SIZE,))
+            if header[VERSION] != FORMAT_VERSION or header[FEATURE_COUNT] != featureCount:
+                raise ValueError('The replay buffer at ' + path + ' was written with a different format or feature count.')
+            capacityRows = int(header[CAPACITY_ROWS])
+            maxGames = int(header[MAX_GAMES])
+            del header
+            self.index = np.memmap(path + ".index", dtype=np.int64, mode="r+", shape=(HEADER_SIZE + 2*maxGames,))
+            self.rows = np.memmap(path + ".rows", dtype=np.int16, mode="r+", shape=(capacityRows, featureCount))
+        else:
+            self.index = np.memmap(path + ".index", dtype=np.int64, mode="w+", shape=(HEADER_SIZE + 2*maxGames,))
+            self.rows = np.memmap(path + ".rows", dtype=np.int16, mode="w+", shape=(capacityRows, featureCount))
+            self.index[VERSION] = FORMAT_VERSION
+            self.index[FEATURE_COUNT] = featureCount
+            self.index[CAPACITY_ROWS] = capacityRows
+            self.index[MAX_GAMES] = maxGames
+        self.featureCount = featureCount
+        self.capacityRows = capacityRows
+        self.maxGames = maxGames
+        self.records = self.index[HEADER_SIZE:].reshape(maxGames, 2) # (first row, plies) of every game slot
+
+    # Returns the number of games currently retained
+    def __len__(self):
+        return int(self.index[GAME_COUNT])
+
+    # Returns the index record of the k-th oldest retained game
+    def getRecord(self, k):
+        return self.records[(int(self.index[FIRST_GAME]) + k) % self.maxGames]
+
+    # Removes the oldest retained game
+    def evictOldest(self):
+        self.index[FIRST_GAME] = (self.index[FIRST_GAME] + 1) % self.maxGames
+        self.index[GAME_COUNT] -= 1
+
+    # Appends the game states of a Trace, evicting the oldest games if the archive is full
+    def append(self, trace):
+        states = trace.getArray()
+        plies = len(states)
+        if plies > self.capacityRows:
+            raise ValueError('A trace of ' + str(plies) + ' plies does not fit in a replay buffer of ' + str(self.capacityRows) + ' rows.')
+        if len(self) == self.maxGames:
+            self.evictOldest()
+        position = 0
+        if len(self) > 0:
+            newest = self.getRecord(len(self) - 1)
+            position = int(newest[0] + newest[1])
+        if position + plies > self.capacityRows:
+            # The games stored between the newest game and the end of the file are the oldest ones
+            while len(self) > 0 and self.getRecord(0)[0] >= position:
+                self.evictOldest()
+            position = 0
+        # Evict the oldest games whose rows are about to be overwritten
+        while len(self) > 0 and position <= self.getRecord(0)[0] < position + plies:
+            self.evictOldest()
+        self.rows[position:position+plies] = states
+        self.getRecord(len(self))[:] = (position, plies)
+        self.index[GAME_COUNT] += 1
+        self.index[GAMES_APPENDED] += 1
+
+    # Returns the game states of the k-th oldest retained game without copying them
+    def getGame(self, k):
+        first, plies = self.getRecord(k)
+        return self.rows[first:first+plies]
+
+    # Samples batchSize game states uniformly from every retained game
+    # Returns the states, the states that follow them two plies later (the same player's next turn),
+    # and the player to move in each state (0 for red, 1 for black)
+    def sample(self, batchSize):
+        slots = (int(self.index[FIRST_GAME]) + np.arange(len(self))) % self.maxGames
+        firsts = self.records[slots, 0]
+        counts = np.maximum(self.records[slots, 1] - 2, 0) # states that have a successor
+        ends = np.cumsum(counts)
+        if len(ends) == 0 or ends[-1] == 0:
+            empty = np.zeros((0, self.featureCount), dtype=np.int16)
+            return empty, empty, np.zeros(0, dtype=np.int64)
+        picks = self.random.integers(0, ends[-1], size=batchSize)
+        games = np.searchsorted(ends, picks, side="right")
+        offsets = picks - (ends[games] - counts[games])
+        rows = firsts[games] + offsets
+        return np.asarray(self.rows[rows]), np.asarray(self.rows[rows + 2]), offsets % 2
+
+    # Writes pending changes to disk
+    def flush(self):
+        self.rows.flush()
+        self.index.flush()
+
+    # Writes pending changes to disk and releases the memory maps
+    def close(self):
+        self.flush()
+        del self.records
+        del self.rows
+        del self.index
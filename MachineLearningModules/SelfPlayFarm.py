@@ -0,0 +1,94 @@
+####################################
+# File name: SelfPlayFarm.py
+# Author: BenjaminBeggs
+#
+# Description: Plays batches of training games in parallel.
+# Games are handed out to a pool of worker processes, each of
+# which runs PerformanceSystem.getTrace, and the traces are
+# returned to the training process in the order the games
+# were issued.
+#
+# Every game is seeded from the farm seed and the game number,
+# so a batch produces the same traces for a given seed no
+# matter how many workers play it or how they are scheduled.
+#
+####################################
+
+import logging, multiprocessing, random, signal, traceback
+from PerformanceSystem import PerformanceSystem
+from BitboardPerformanceSystem import BitboardPerformanceSystem
+from AlphaBetaSearch import AlphaBetaSearch
+from TranspositionTable import TranspositionTable
+from FeatureRegistry import FeatureSet, DEFAULT_FEATURES
+
+# Worker processes ignore Ctrl-C so that only the training process handles it and shuts the pool down
+def initializeWorker():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+# Builds the performance system used to play training games
+# A searchDepth above 0 selects moves with an AlphaBetaSearch of that depth instead of the one-ply greedy search
+# A tableBits above 0 gives the greedy selection and the search transposition tables of 2**tableBits entries each
+# repetitionLimit and noCaptureMoveLimit enable the draw rules, None disables them
+# forcedCapture makes eliminations mandatory in the games and in the search
+# recordMoves keeps the moves of every game in its trace, for the game log
+# featureNames lists the registered features the hypotheses are trained on, None or DEFAULT_FEATURES for the six
+# features of GameState.info, which the engines compute without a FeatureSet
+def createPerformanceSystem(useBitboardEngine=True, searchDepth=0, searchTimeBudget=None, tableBits=0, repetitionLimit=None, noCaptureMoveLimit=None, forcedCapture=False, recordMoves=False, featureNames=None):
+    featureSet = None
+    if featureNames is not None and list(featureNames) != DEFAULT_FEATURES:
+        featureSet = FeatureSet(featureNames)
+    search = None
+    if searchDepth > 0:
+        search = AlphaBetaSearch(searchDepth, searchTimeBudget, TranspositionTable(tableBits) if tableBits > 0 else None, forcedCapture, featureSet)
+    table = None
+    if tableBits > 0:
+        table = TranspositionTable(tableBits)
+    if useBitboardEngine:
+        return BitboardPerformanceSystem(search, table, repetitionLimit, noCaptureMoveLimit, forcedCapture, recordMoves, featureSet)
+    return PerformanceSystem(search, table, repetitionLimit, noCaptureMoveLimit, forcedCapture, recordMoves, featureSet)
+
+# Plays one game inside a worker process
+# Returns [trace, None] on success or [None, traceback text] if trace generation failed
+def playGame(task):
+    engineSettings, trainingExperiment, hypothesisRed, hypothesisBlack, seed = task
+    random.seed(seed)
+    perfSys = createPerformanceSystem(*engineSettings)
+    try:
+        return [perfSys.getTrace(trainingExperiment, hypothesisRed, hypothesisBlack), None]
+    except Exception:
+        return [None, traceback.format_exc()]
+
+class SelfPlayFarm:
+    # Constructor for SelfPlayFarm
+    # The engine settings are passed on to createPerformanceSystem
+    def __init__(self, workerCount, useBitboardEngine=True, seed=None, searchDepth=0, searchTimeBudget=None, tableBits=0, repetitionLimit=None, noCaptureMoveLimit=None, forcedCapture=False, recordMoves=False, featureNames=None):
+        self.workerCount = workerCount
+        self.engineSettings = (useBitboardEngine, searchDepth, searchTimeBudget, tableBits, repetitionLimit, noCaptureMoveLimit, forcedCapture, recordMoves, None if featureNames is None else list(featureNames))
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed # Base seed that every game seed is derived from
+        self.gamesPlayed = 0 # Number of games issued so far, used to derive the next game seed
+        self.pool = multiprocessing.Pool(workerCount, initializeWorker)
+
+    # Plays gameCount games with the supplied hypotheses and returns the list of traces
+    # Games whose trace generation failed are left out of the returned list. Their tracebacks are
+    # appended to errors when a list is supplied and logged otherwise
+    def generateTraces(self, trainingExperiment, hypothesisRed, hypothesisBlack, gameCount, errors=None):
+        tasks = []
+        for game in range(self.gamesPlayed, self.gamesPlayed + gameCount):
+            tasks.append((self.engineSettings, trainingExperiment, list(hypothesisRed), list(hypothesisBlack), self.seed + game))
+        self.gamesPlayed += gameCount
+        traces = []
+        for trace, error in self.pool.imap(playGame, tasks, chunksize=max(1, gameCount // (4*self.workerCount))):
+            if error is None:
+                traces.append(trace)
+            elif errors is not None:
+                errors.append(error)
+            else:
+                logging.error('Error detected in a self-play worker.\n' + error)
+        return traces
+
+    # Shuts down the worker processes, abandoning any games still being played
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
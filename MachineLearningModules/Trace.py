@@ -0,0 +1,71 @@
+#######################################################################
+# File name: Trace.py                                                 #
+# Author: PhilipBasaric                                               #
+#                                                                     #
+# Description: The Trace object stores the trace history of a game.   #
+# The feature list of every ply is a row of 16 bit integers in one   #
+# preallocated array that doubles in size whenever it fills up.      #
+# Red always moves first, so the red game states are the even rows    #
+# and the black game states the odd rows.                             #
+#                                                                     #
+# trace[0] and trace[1] return the red and black histories, so a      #
+# Trace can be used wherever [redTraceHistory, blackTraceHistory]     #
+# was used before.                                                    #
+#                                                                     #
+# outcome records how the game ended: "red" or "black" for the        #
+# winner, "draw" for a game ended by a draw rule, or None for a game  #
+# stopped at the turn limit.                                          #
+#                                                                     #
+# moves holds the moves of the game when the performance system      #
+# records them, and is None otherwise.                                #
+#                                                                     #
+#######################################################################
+
+from array import array
+import numpy as np
+
+class Trace:
+    # Constructor for Trace
+    def __init__(self, featureCount=6, capacity=128):
+        self.featureCount = featureCount # Number of features stored per ply
+        self.plies = 0 # Number of game states stored
+        self.buffer = array('h', bytes(2*featureCount*capacity)) # Feature rows, preallocated with zeros
+        self.outcome = None # Winner of the game ("red" or "black"), "draw", or None if the game was not finished
+        self.moves = None # Moves made in the game, recorded by performance systems created with recordMoves
+
+    # Adds the feature list of the next game state
+    def append(self, info):
+        start = self.plies*self.featureCount
+        if start + self.featureCount > len(self.buffer):
+            # Double the capacity of the buffer
+            self.buffer.frombytes(bytes(2*max(len(self.buffer), self.featureCount)))
+        self.buffer[start:start+self.featureCount] = array('h', info)
+        self.plies += 1
+
+    # Releases the unused capacity once the game is over
+    def trim(self):
+        del self.buffer[self.plies*self.featureCount:]
+
+    # Returns every stored game state as a (plies, featureCount) NumPy array sharing memory with the trace
+    # The trace cannot grow while an array returned by this function is still referenced
+    def getArray(self):
+        return np.frombuffer(self.buffer, dtype=np.int16, count=self.plies*self.featureCount).reshape(self.plies, self.featureCount)
+
+    # Returns the game states in which red is to move
+    def getRed(self):
+        return self.getArray()[0::2]
+
+    # Returns the game states in which black is to move
+    def getBlack(self):
+        return self.getArray()[1::2]
+
+    # Returns the number of game states in which red is to move
+    def getRedPlies(self):
+        return (self.plies + 1)//2
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.getRed()
+        elif index == 1:
+            return self.getBlack()
+        raise IndexError('A trace only holds a red (0) and a black (1) history.')
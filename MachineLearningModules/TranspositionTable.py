@@ -0,0 +1,113 @@
+#######################################################################
+# File name: TranspositionTable.py                                    #
+# Author: PhilipBasaric                                               #
+#                                                                     #
+# Description: Zobrist hashing of checkers positions and a fixed-size #
+# transposition table of evaluated positions.                         #
+#                                                                     #
+# The hash of a position is the exclusive or of one random key per    #
+# occupied square and piece type, and of a side key when black is to  #
+# move, so a move updates the hash with a few exclusive ors. The      #
+# table stores the value, search depth, bound type and best move of a #
+# position in the slot selected by the low bits of its hash.          #
+#                                                                     #
+#######################################################################
+
+import random
+
+# Piece types used to index the Zobrist keys
+RED_MAN, BLACK_MAN, RED_KING, BLACK_KING = range(0, 4)
+PIECE_TYPES = {"r": RED_MAN, "b": BLACK_MAN, "R": RED_KING, "B": BLACK_KING}
+
+# The keys are drawn from a private generator with a fixed seed so that hashes are the same in every process
+# and hashing never disturbs the random module used for move selection
+ZOBRIST_RANDOM = random.Random(0x5EED)
+PIECE_KEYS = [[ZOBRIST_RANDOM.getrandbits(64) for square in range(0, 32)] for piece in range(0, 4)]
+SIDE_KEY = ZOBRIST_RANDOM.getrandbits(64) # included when black is to move
+BLACK_SEARCH_KEY = ZOBRIST_RANDOM.getrandbits(64) # included in the hashes of searches made for black, which evaluate positions with another hypothesis
+
+# Bound types of a stored value
+EXACT, LOWER_BOUND, UPPER_BOUND = range(0, 3)
+
+# Returns the hash of a position stored as four piece masks
+def hashMasks(redPieces, blackPieces, redKings, blackKings, currentTurn):
+    positionHash = SIDE_KEY if currentTurn == "black" else 0
+    for mask, keys in ((redPieces, PIECE_KEYS[RED_MAN]), (blackPieces, PIECE_KEYS[BLACK_MAN]), (redKings, PIECE_KEYS[RED_KING]), (blackKings, PIECE_KEYS[BLACK_KING])):
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            positionHash ^= keys[bit.bit_length() - 1]
+    return positionHash
+
+# Returns the hash of a position stored as a matrix of characters
+def hashBoard(board, currentTurn):
+    positionHash = SIDE_KEY if currentTurn == "black" else 0
+    for row in range(0, 8):
+        for col in range(row % 2, 8, 2):
+            if board[row][col] in PIECE_TYPES:
+                positionHash ^= PIECE_KEYS[PIECE_TYPES[board[row][col]]][row*4 + col//2]
+    return positionHash
+
+# Returns the value to exclusive or with a hash to move a piece and pass the turn
+# mover is the piece type leaving source, landing the piece type arriving on target (a king after a promotion)
+# The pieces eliminated by the move are removed with hashCapture
+def hashMove(source, target, mover, landing):
+    return SIDE_KEY ^ PIECE_KEYS[mover][source] ^ PIECE_KEYS[landing][target]
+
+# Returns the value to exclusive or with a hash to remove a piece of type captured from a square
+def hashCapture(square, captured):
+    return PIECE_KEYS[captured][square]
+
+class TranspositionTable:
+    # Constructor for TranspositionTable
+    # The table holds 2**sizeBits entries
+    def __init__(self, sizeBits=16):
+        self.size = 1 << sizeBits
+        self.mask = self.size - 1
+        self.keys = [None] * self.size # Full hash of the position stored in each slot
+        self.values = [0] * self.size
+        self.depths = [0] * self.size
+        self.bounds = [EXACT] * self.size
+        self.bestMoves = [None] * self.size
+        self.ages = [0] * self.size # Search in which each entry was stored
+        self.age = 0 # Incremented by newSearch
+        self.hits = 0
+        self.misses = 0
+
+    # Returns (value, depth, bound, best move) stored for a hash, or None if the position is not in the table
+    def probe(self, positionHash):
+        slot = positionHash & self.mask
+        if self.keys[slot] == positionHash:
+            self.hits += 1
+            return self.values[slot], self.depths[slot], self.bounds[slot], self.bestMoves[slot]
+        self.misses += 1
+        return None
+
+    # Stores an entry for a hash
+    # An entry of another position is only replaced by a search at least as deep, or if it was stored by an earlier search
+    def store(self, positionHash, value, depth, bound=EXACT, bestMove=None):
+        slot = positionHash & self.mask
+        if self.keys[slot] is not None and self.keys[slot] != positionHash and self.ages[slot] == self.age and self.depths[slot] > depth:
+            return
+        self.keys[slot] = positionHash
+        self.values[slot] = value
+        self.depths[slot] = depth
+        self.bounds[slot] = bound
+        self.bestMoves[slot] = bestMove
+        self.ages[slot] = self.age
+
+    # Marks the entries stored so far as belonging to an earlier search, so that they are replaced first
+    def newSearch(self):
+        self.age += 1
+
+    # Removes every entry, used when the values stored no longer apply (such as after a hypothesis update)
+    def clear(self):
+        self.keys = [None] * self.size
+        self.bestMoves = [None] * self.size
+        self.age = 0
+        self.ages = [0] * self.size
+
+    # Returns the fraction of probes that found their position
+    def getHitRate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes > 0 else 0.0
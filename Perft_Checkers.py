@@ -0,0 +1,151 @@
+####################################
+# File name: Perft_Checkers.py
+# Author: BenjaminBeggs
+#
+# Description: Perft harness for the game logic of the
+# performance systems. It counts the positions reached after
+# every sequence of depth moves (the leaf nodes of the game tree)
+# from the ExperimentGenerator starting board and from a set of
+# stored positions, reports the nodes counted per second, and
+# compares the counts with reference counts: published counts for
+# the starting board and regression counts of both engines for
+# the stored positions.
+#
+# Any change to getLegalMoves or makeMove must leave the counts
+# unchanged. The script exits with status 1 when a count differs
+# from its reference.
+#
+# Usage: python Perft_Checkers.py [--depth N] [--engine list|bitboard|both]
+#
+####################################
+
+import argparse, os, sys, time
+sys.path.append(os.getcwd() + '/MachineLearningModules')
+from ExperimentGenerator import ExperimentGenerator
+from GameState import GameState
+from PerformanceSystem import PerformanceSystem
+from BitboardPerformanceSystem import BitboardGameState, getMoves, applyMove, RED_DIRECTIONS, BLACK_DIRECTIONS, RED_KING_ROW, BLACK_KING_ROW
+
+# Published leaf counts of the starting position of checkers with forced captures, from depth 1
+START_COUNTS = [7, 49, 302, 1469, 7361, 36768, 179740, 845931, 3963680, 18391564]
+
+# Stored positions as (name, side to move, board rows from black's back row, leaf counts from depth 1)
+# Empty squares are written as "."
+# The counts are cross-engine regression values: they were produced by the list and bitboard engines of this
+# repository, which agree on every one of them, and have not been checked against an independent perft
+# A chain that can be jumped in two orders, such as the king circuit, counts as two moves
+STORED_POSITIONS = [
+    ("multi-jump chains", "red", [
+        "........",
+        ".b...b..",
+        "........",
+        ".b.b.b..",
+        "..r.....",
+        ".r.r...r",
+        "r.......",
+        "........",
+    ], [2, 12, 48, 135, 502, 1448, 6454]),
+    ("promotion ends a chain", "red", [
+        "........",
+        ".b.b.b..",
+        "..b.....",
+        ".b...b..",
+        "r.....r.",
+        ".......r",
+        "........",
+        "...B....",
+    ], [2, 13, 28, 183, 669, 4051, 15865]),
+    ("king circuit", "red", [
+        "........",
+        ".......b",
+        "..b.b...",
+        "........",
+        "..b.b...",
+        "...R...r",
+        "B.......",
+        ".....r..",
+    ], [2, 6, 42, 148, 766, 2594, 13656]),
+    ("kings endgame", "black", [
+        "........",
+        "...R....",
+        "........",
+        ".B...b..",
+        "........",
+        ".r...B..",
+        "........",
+        ".R......",
+    ], [10, 65, 414, 2193, 13968, 74929, 457678]),
+]
+
+# Converts the rows of a stored position to a matrix of characters
+def readRows(rows):
+    return [[" " if char == "." else char for char in row] for row in rows]
+
+# Counts the leaf nodes below a GameState of PerformanceSystem
+# Moves are made and undone in place; at the last ply the legal moves are counted without being made
+def perftList(perfSys, gameState, depth):
+    legalMoves = perfSys.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.board)
+    if depth == 1:
+        return len(legalMoves)
+    nodes = 0
+    for move in legalMoves:
+        undo = perfSys.makeMove(gameState, move)
+        nodes += perftList(perfSys, gameState, depth - 1)
+        perfSys.unmakeMove(gameState, undo)
+    return nodes
+
+# Counts the leaf nodes below a position of the bitboard engine, for the side owning men and kings
+def perftBitboard(men, kings, enemyMen, enemyKings, isRed, depth):
+    legalMoves = getMoves(men, kings, enemyMen | enemyKings, RED_DIRECTIONS if isRed else BLACK_DIRECTIONS, True)
+    if depth == 1:
+        return len(legalMoves)
+    kingRow = RED_KING_ROW if isRed else BLACK_KING_ROW
+    nodes = 0
+    for move in legalMoves:
+        newMen, newKings, newEnemyMen, newEnemyKings = applyMove(men, kings, enemyMen, enemyKings, kingRow, move)
+        nodes += perftBitboard(newEnemyMen, newEnemyKings, newMen, newKings, not isRed, depth - 1)
+    return nodes
+
+# Returns the leaf count of a board at a depth with the given engine
+def perft(engine, board, currentTurn, depth):
+    if engine == "list":
+        return perftList(PerformanceSystem(forcedCapture=True), GameState.fromBoard(board, currentTurn), depth)
+    gameState = BitboardGameState.fromBoard(board, currentTurn)
+    if currentTurn == "red":
+        return perftBitboard(gameState.redPieces, gameState.redKings, gameState.blackPieces, gameState.blackKings, True, depth)
+    return perftBitboard(gameState.blackPieces, gameState.blackKings, gameState.redPieces, gameState.redKings, False, depth)
+
+def main():
+    parser = argparse.ArgumentParser(description="Counts the leaf nodes of the checkers game tree and compares them with reference counts.")
+    parser.add_argument("--depth", type=int, default=6, help="deepest depth counted (default 6)")
+    parser.add_argument("--engine", choices=["list", "bitboard", "both"], default="both", help="engine whose move generation is counted (default both)")
+    args = parser.parse_args()
+
+    engines = ["list", "bitboard"] if args.engine == "both" else [args.engine]
+    positions = [("starting board", "red", ExperimentGenerator().getExperiment(), START_COUNTS)]
+    for name, currentTurn, rows, counts in STORED_POSITIONS:
+        positions.append((name, currentTurn, readRows(rows), counts))
+
+    failures = 0
+    for engine in engines:
+        print("Engine:", engine)
+        for name, currentTurn, board, counts in positions:
+            for depth in range(1, args.depth + 1):
+                start = time.perf_counter()
+                nodes = perft(engine, board, currentTurn, depth)
+                seconds = time.perf_counter() - start
+                if depth > len(counts):
+                    status = "no reference"
+                elif nodes == counts[depth - 1]:
+                    status = "ok"
+                else:
+                    status = "FAILED (expected " + str(counts[depth - 1]) + ")"
+                    failures += 1
+                print("  %-24s depth %2d %12d nodes %12.0f nodes/s  %s" % (name, depth, nodes, nodes / seconds if seconds > 0 else 0, status))
+    if failures > 0:
+        print(failures, "count(s) differ from their reference.")
+        sys.exit(1)
+    print("All counts match their references.")
+
+if __name__ == '__main__':
+    main()
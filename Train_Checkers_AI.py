@@ -1,123 +1,345 @@
 ####################################
 # File name: Train_Checkers_AI.py
 # Author: BenjaminBeggs
-# 
-# Description: Master Python file that bridges data outputs between 
+#
+# Description: Master Python file that bridges data outputs between
 # the 4 Machine-Learning modules (PerformanceSystem, ExperimentGenerator,
 # Critic, Generalizer) and manages the training process for the AI.
 #
-# Every 100th training experience will result in the recording of the
-# of the updated target function approximation in a text file.
+# Every CHECKPOINT_INTERVAL training experiences will result in the
+# recording of the updated target function approximation in a text
+# file and a checkpoint in SavedValues/Checkpoints.
+#
+# Training runs without any prompt until the game or time budget given
+# on the command line is used up, or until it is ended by Ctrl-C.
+# Run with --help for the options.
+#
+# The hypotheses have one coefficient per feature of FEATURES. When the
+# saved hypotheses were trained on other features, the coefficients of
+# the shared features are kept and the new features start from the
+# starting coefficients of FeatureRegistry.
 #
 ####################################
 
 # Import pickle library to save target function approximations in text file
-import pickle, symbol, logging, os, sys
+import argparse, pickle, symbol, logging, os, sys, random, time
 sys.path.append(os.getcwd() + '/MachineLearningModules')
 
 # Import machine-learning training modules
 from ExperimentGenerator import ExperimentGenerator
-from PerformanceSystem import PerformanceSystem
+from SelfPlayFarm import SelfPlayFarm, createPerformanceSystem
+from ReplayBuffer import ReplayBuffer
+from CheckpointStore import CheckpointStore
+from GameLogger import GameLogger, LOG_OFF, LOG_GAMES, LOG_MOVES
+from PDNFile import PDNWriter
+from FeatureRegistry import FeatureSet, REGISTRY, DEFAULT_FEATURES, EXTENDED_FEATURES
 from Critic import Critic
 from Generalizer import Generalizer
 
-traceCount = pickle.load(open(os.getcwd() + "/SavedValues/traceCount.p", "rb"))
-TRACEBACK_FILENAME = os.getcwd() + '/TraceBack/run' + str(traceCount) + '.out'
-logging.basicConfig(filename=TRACEBACK_FILENAME, level=logging.DEBUG)
-
-# Reroute system prints to a designated log file to retain past target function values
-old_stdout = sys.stdout
-log_file = open("targetHistory.log","w")
-trace_log = open("gameTrace.log","w")
-
-simCount = 0 # Counts simulations performed to know when to save the target function in a text file
-
-# Read back Red hypothesis value from pickle file
-currentHypothesisRed = pickle.load(open(os.getcwd() + "/SavedValues/targetHypothesisRed.p", "rb" ))
-if (len(currentHypothesisRed) != 6):
-    raise ValueError('There is something unusual about the dimensions of the Pickle file read for the Red hypothesis state. Please inspect it.')
-
-# Read back Black hypothesis value from pickle file
-currentHypothesisBlack = pickle.load(open(os.getcwd() + "/SavedValues/targetHypothesisBlack.p", "rb" ))
-if (len(currentHypothesisBlack) != 6):
-    raise ValueError('There is something unusual about the dimensions of the Pickle file read for the Black hypothesis state. Please inspect it.')
-
-# Read back simulation magnitude value from pickle file
-simMag = pickle.load(open(os.getcwd() + "/SavedValues/simMag.p", "rb"))
-
-# Instantiate machine-learning objects
-experGen = ExperimentGenerator()
-perfSys = PerformanceSystem()
-crit = Critic()
-general = Generalizer()
-
-# Print devnull logo along with current version of trained hypothesis coefficients
-print(symbol.asci)
-print("The most recent version of the Red train target function has weighting coefficients:", currentHypothesisRed)
-print("The most recent version of the Black train target function has weighting coefficients:", currentHypothesisBlack)
-print("This is the weighting coefficient generated by this number of simulations:", simMag*100)
-input("Press Enter to initiate the learning process [learning process may be ended by pressing Ctrl-C]...")
-
-# Continually run the machine-learning process to increase the accuracy of the target function approximation
-try:
-    while True:
-        # Increment the simulation counter
-        traceGenerated = 0
-        simCount += 1
-        
-        # Retrieve a training experiment for the performance system
-        trainingExperiment = experGen.getExperiment();
-
-        # Call on the Performance System to generate a trace history
-        # The trace generation is encapsulated in a try/catch block
-        # in the case that a stale mate sequence or random range error
-        # produces an incomplete trace history
-        while traceGenerated != 1:
-            try:
-                sys.stdout = trace_log
-                currentTrace = perfSys.getTrace(trainingExperiment, currentHypothesisRed, currentHypothesisBlack)
-                traceGenerated = 1
-                sys.stdout = old_stdout
-            except Exception as e:
-                sys.stdout = old_stdout
-                logging.exception('Error detected.')
-                print(e)
-                print("An error was detected when performing trace generation. The traceback for this has been logged in /TraceBack/run" + str(traceCount) + ".log")
-                traceCount += 1
-                pickle.dump(traceCount, open(os.getcwd() + "/SavedValues/traceCount.p", "wb" ))
-                TRACEBACK_FILENAME = os.getcwd() + '/TraceBack/run' + str(traceCount) + '.out'
-                logging.basicConfig(filename=TRACEBACK_FILENAME, level=logging.DEBUG)
-                input("Press enter to reexecute the trace generation, or Ctrl-C to exit the simulation.")
-
-        # Generate training values using the trace history made by the performance system
-        trainingValsRed = crit.generateTrainingValues(currentTrace[0], currentHypothesisRed)
-        trainingValsBlack = crit.generateTrainingValues(currentTrace[1], currentHypothesisBlack)
-        
-        # Update the current hypothesis using the generalizer and training values
-        currentHypothesisRed = general.updateHypothesis(trainingValsRed, currentHypothesisRed)
-        currentHypothesisBlack = general.updateHypothesis(trainingValsBlack, currentHypothesisBlack)
-        
-        # 100 simulations have been performed, so the current hypothesis pickle file is updated
-        # Additionally, the current hypothesis value is printed to the console and a log file for retention
-        # A magnitude counter is incremented every 100 simulations to keep track of how many simulations
-        # have been run since the initial arbitrary weighting values of [1, 1, 1, 1, 1, 1]
-        if simCount == 100:
-            simCount = 0
-            simMag += 1
-            print ("Simulation performed: ", (simMag*100))
-            print ("Has produced Red hypothesis: ", currentHypothesisRed)
-            print ("Has produced Black hypothesis: ", currentHypothesisBlack)
-            # Reroute print to log file
-            sys.stdout = log_file
-            print ("Simulation performed: ", (simMag*100))
-            print ("Has produced Red hypothesis: ", currentHypothesisRed)
-            print ("Has produced Black hypothesis: ", currentHypothesisBlack)            # Reroute print back to console
-            sys.stdout = old_stdout
-            # Dump current hypothesis and simulation magnitude into pickle file for future recal
-            pickle.dump(currentHypothesisRed, open(os.getcwd() + "/SavedValues/targetHypothesisRed.p", "wb" ))
-            pickle.dump(currentHypothesisBlack, open(os.getcwd() + "/SavedValues/targetHypothesisBlack.p", "wb" ))
-            pickle.dump(simMag, open(os.getcwd() + "/SavedValues/simMag.p", "wb" ))
-# Watch for keyboard exceptions to allow user toggled simulation suspension
-except KeyboardInterrupt:
-    pass
-    input("Training simulation ended by user.")
\ No newline at end of file
+# Select the game engine used for trace generation
+# The bitboard engine is much faster and plays by the same rules with the same move evaluations, but lists the
+# moves in another order, so the random moves of a seeded game differ; set to False to use the original list-based engine
+USE_BITBOARD_ENGINE = True
+
+# Depth of the alpha-beta search used to select the non-random moves of training games, 0 keeps the one-ply greedy selection
+# SEARCH_TIME_BUDGET limits the seconds spent searching each move, None searches every move to the full depth
+SEARCH_DEPTH = 0
+SEARCH_TIME_BUDGET = None
+
+# Size of the transposition tables caching position evaluations, as a power of 2 (16 gives 65536 entries), 0 disables them
+# The greedy selection and the search get a table each
+TRANSPOSITION_TABLE_BITS = 0
+
+# Draw rules of training games: a game is drawn when a position occurs REPETITION_LIMIT times,
+# or when both players make NO_CAPTURE_MOVE_LIMIT moves in a row without an elimination. None disables a rule
+REPETITION_LIMIT = 3
+NO_CAPTURE_MOVE_LIMIT = 40
+
+# Make eliminations mandatory: a player that can eliminate a piece must do so, as in the game played against the GUI
+# Off by default, so training games follow the original rules
+FORCED_CAPTURE = False
+
+# Registered features the hypotheses are trained on, can be changed with --features
+# DEFAULT_FEATURES are the six features of GameState.info and EXTENDED_FEATURES every built-in feature of FeatureRegistry
+FEATURES = DEFAULT_FEATURES
+
+# Train the final game state of each player towards the win, loss or draw value of the Critic
+# Games stopped at the turn limit have no outcome and are trained on the hypothesis values alone
+# Off by default, so the final game states are trained on the hypothesis values as originally
+TRAIN_ON_OUTCOMES = False
+
+# Number of processes playing training games in parallel
+# With more than one worker, games are played in batches of GAMES_PER_WORKER games per worker
+WORKER_COUNT = 1
+GAMES_PER_WORKER = 4
+
+# Seed for the parallel self-play games, None picks a new seed on every run
+SELF_PLAY_SEED = None
+
+# Number of training examples per LMS update of the generalizer
+# 1 updates the coefficients after every example, None uses the whole trace as one batch
+GENERALIZER_BATCH_SIZE = 1
+
+# Number of most recent checkpoints kept in SavedValues/Checkpoints
+CHECKPOINTS_KEPT = 5
+
+# Number of games between two checkpoints, can be changed with --checkpoint-interval
+CHECKPOINT_INTERVAL = 100
+
+# Number of failed trace generations in a row after which training stops, instead of retrying forever
+MAX_CONSECUTIVE_FAILURES = 10
+
+# Level of the game log written to gameTrace.jsonl, can be changed with --game-log-level
+# LOG_OFF disables the log, LOG_GAMES records the outcome and length of every game and LOG_MOVES also its moves
+GAME_LOG_LEVEL = LOG_OFF
+
+# PDN file every training game is appended to, can be changed with --pdn-file; None disables the records
+# A relative path is placed in the output directory
+PDN_PATH = None
+
+# Archive every training game in a memory-mapped replay buffer, None disables the archive
+# A relative path is placed in the output directory
+# The archive keeps at most REPLAY_BUFFER_ROWS game states and REPLAY_BUFFER_GAMES games, evicting the oldest games
+REPLAY_BUFFER_PATH = None
+REPLAY_BUFFER_ROWS = 10000000
+REPLAY_BUFFER_GAMES = 100000
+
+# Number of archived game states replayed through the critic and generalizer after every game, 0 disables replay
+REPLAY_BATCH_SIZE = 0
+
+# Reads the options of a training run from the command line
+# The defaults are the constants above
+def parseArguments():
+    parser = argparse.ArgumentParser(description="Trains the target function hypotheses of the checkers AI by self-play.")
+    parser.add_argument("--games", type=int, default=None, help="number of games to play, unlimited by default")
+    parser.add_argument("--time-budget", dest="timeBudget", type=float, default=None, help="wall-clock seconds to train for, unlimited by default")
+    parser.add_argument("--checkpoint-interval", dest="checkpointInterval", type=int, default=CHECKPOINT_INTERVAL, help="games between two checkpoints (default %(default)s)")
+    parser.add_argument("--workers", type=int, default=WORKER_COUNT, help="processes playing games in parallel (default %(default)s)")
+    parser.add_argument("--game-log-level", dest="gameLogLevel", type=int, choices=[LOG_OFF, LOG_GAMES, LOG_MOVES], default=GAME_LOG_LEVEL, help="0 disables the game log, 1 logs every game, 2 also logs the moves (default %(default)s)")
+    parser.add_argument("--pdn-file", dest="pdnFile", default=PDN_PATH, help="PDN file the moves of every game are appended to, disabled by default")
+    parser.add_argument("--features", nargs="+", default=FEATURES, help="features of the hypotheses: 'default', 'extended' or registered feature names (default the FEATURES of the file)")
+    parser.add_argument("--output-dir", dest="outputDir", default=os.getcwd(), help="directory of the checkpoints, logs and tracebacks (default the current directory)")
+    args = parser.parse_args()
+    if args.checkpointInterval < 1:
+        parser.error("--checkpoint-interval must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.features == ["default"]:
+        args.features = DEFAULT_FEATURES
+    elif args.features == ["extended"]:
+        args.features = EXTENDED_FEATURES
+    for name in args.features:
+        if name not in REGISTRY:
+            parser.error("unknown feature " + name + ", the registered features are " + ", ".join(REGISTRY))
+    if len(set(args.features)) != len(args.features):
+        parser.error("--features cannot list a feature twice")
+    return args
+
+# Returns the traceback log file of a given trace generation error count
+def getTracebackFilename(outputDir, traceCount):
+    return outputDir + '/TraceBack/run' + str(traceCount) + '.out'
+
+# Moves the traceback log on to the next file after a failed trace generation and returns the new trace count
+def nextTracebackFile(outputDir, savedValuesDir, traceCount):
+    traceCount += 1
+    with open(savedValuesDir + "/traceCount.p", "wb") as traceCountFile:
+        pickle.dump(traceCount, traceCountFile)
+    logging.basicConfig(filename=getTracebackFilename(outputDir, traceCount), level=logging.DEBUG, force=True)
+    return traceCount
+
+def main():
+    args = parseArguments()
+    savedValuesDir = args.outputDir + "/SavedValues"
+    os.makedirs(savedValuesDir, exist_ok=True)
+    os.makedirs(args.outputDir + "/TraceBack", exist_ok=True)
+    traceCount = 0
+    if os.path.exists(savedValuesDir + "/traceCount.p"):
+        with open(savedValuesDir + "/traceCount.p", "rb") as traceCountFile:
+            traceCount = pickle.load(traceCountFile)
+    logging.basicConfig(filename=getTracebackFilename(args.outputDir, traceCount), level=logging.DEBUG)
+
+    # Designated log file to retain past target function values
+    log_file = open(args.outputDir + "/targetHistory.log","w")
+    gameLogger = None
+    if args.gameLogLevel > LOG_OFF:
+        gameLogger = GameLogger(args.outputDir + "/gameTrace.jsonl", args.gameLogLevel)
+    pdnWriter = None
+    if args.pdnFile is not None:
+        pdnWriter = PDNWriter(os.path.join(args.outputDir, args.pdnFile))
+
+    simCount = 0 # Counts simulations performed since the last checkpoint
+
+    # Read back the newest valid checkpoint
+    # Without a checkpoint the hypotheses and simulation magnitude are read from the starting pickle files,
+    # those of the output directory if it has them and otherwise those of the current directory
+    checkpoints = CheckpointStore(savedValuesDir + "/Checkpoints", CHECKPOINTS_KEPT)
+    checkpoint = checkpoints.loadLatest()
+    if checkpoint is not None:
+        currentHypothesisRed = checkpoint["hypothesisRed"]
+        currentHypothesisBlack = checkpoint["hypothesisBlack"]
+        gameCount = checkpoint["gameCount"]
+        savedFeatures = checkpoint.get("features") or DEFAULT_FEATURES
+        if checkpoint["randomState"] is not None:
+            random.setstate(checkpoint["randomState"])
+    else:
+        picklesDir = savedValuesDir if os.path.exists(savedValuesDir + "/targetHypothesisRed.p") else os.getcwd() + "/SavedValues"
+        currentHypothesisRed = pickle.load(open(picklesDir + "/targetHypothesisRed.p", "rb" ))
+        currentHypothesisBlack = pickle.load(open(picklesDir + "/targetHypothesisBlack.p", "rb" ))
+        gameCount = pickle.load(open(picklesDir + "/simMag.p", "rb"))*100
+        savedFeatures = DEFAULT_FEATURES
+    if (len(currentHypothesisRed) != len(savedFeatures)):
+        raise ValueError('There is something unusual about the dimensions of the saved Red hypothesis state. Please inspect it.')
+    if (len(currentHypothesisBlack) != len(savedFeatures)):
+        raise ValueError('There is something unusual about the dimensions of the saved Black hypothesis state. Please inspect it.')
+
+    # Carry the saved hypotheses over to the active feature set
+    featureSet = FeatureSet(args.features)
+    if list(savedFeatures) != featureSet.names:
+        print("The saved hypotheses were trained on the features", list(savedFeatures), "and are converted to the features", featureSet.names)
+        currentHypothesisRed = featureSet.adaptHypothesis(currentHypothesisRed, savedFeatures, "red")
+        currentHypothesisBlack = featureSet.adaptHypothesis(currentHypothesisBlack, savedFeatures, "black")
+
+    # Instantiate machine-learning objects
+    experGen = ExperimentGenerator()
+    recordMoves = args.gameLogLevel >= LOG_MOVES or pdnWriter is not None
+    crit = Critic()
+    general = Generalizer()
+    replay = None
+    if REPLAY_BUFFER_PATH is not None:
+        replay = ReplayBuffer(os.path.join(args.outputDir, REPLAY_BUFFER_PATH), len(featureSet), REPLAY_BUFFER_ROWS, REPLAY_BUFFER_GAMES)
+    # Games are played by the worker processes of the farm, or in this process by a performance system of its own
+    farm = None
+    perfSys = None
+    if args.workers > 1:
+        farm = SelfPlayFarm(args.workers, USE_BITBOARD_ENGINE, SELF_PLAY_SEED, SEARCH_DEPTH, SEARCH_TIME_BUDGET, TRANSPOSITION_TABLE_BITS, REPETITION_LIMIT, NO_CAPTURE_MOVE_LIMIT, FORCED_CAPTURE, recordMoves, featureSet.names)
+    else:
+        perfSys = createPerformanceSystem(USE_BITBOARD_ENGINE, SEARCH_DEPTH, SEARCH_TIME_BUDGET, TRANSPOSITION_TABLE_BITS, REPETITION_LIMIT, NO_CAPTURE_MOVE_LIMIT, FORCED_CAPTURE, recordMoves, featureSet.names)
+
+    # Print devnull logo along with current version of trained hypothesis coefficients
+    print(symbol.asci)
+    print("The most recent version of the Red train target function has weighting coefficients:", currentHypothesisRed)
+    print("The most recent version of the Black train target function has weighting coefficients:", currentHypothesisBlack)
+    print("This is the weighting coefficient generated by this number of simulations:", gameCount)
+
+    # Saves both hypotheses and the simulation count as one checkpoint for future recall
+    def saveCheckpoint():
+        print ("Simulation performed: ", gameCount)
+        print ("Has produced Red hypothesis: ", currentHypothesisRed)
+        print ("Has produced Black hypothesis: ", currentHypothesisBlack)
+        # Write the same lines to the log file
+        print ("Simulation performed: ", gameCount, file=log_file)
+        print ("Has produced Red hypothesis: ", currentHypothesisRed, file=log_file)
+        print ("Has produced Black hypothesis: ", currentHypothesisBlack, file=log_file)
+        log_file.flush()
+        checkpoints.save(currentHypothesisRed, currentHypothesisBlack, gameCount, random.getstate(), featureSet.names)
+        if replay is not None:
+            replay.flush()
+
+    # Continually run the machine-learning process until the game or time budget is used up
+    gamesPlayed = 0
+    consecutiveFailures = 0
+    deadline = None if args.timeBudget is None else time.time() + args.timeBudget
+    try:
+        while (args.games is None or gamesPlayed < args.games) and (deadline is None or time.time() < deadline):
+            # Retrieve a training experiment for the performance system
+            trainingExperiment = experGen.getExperiment();
+
+            # In parallel mode a whole batch of games is played with the current hypotheses
+            # and their traces are fed to the critic and generalizer one after another
+            if farm is not None:
+                batchSize = args.workers*GAMES_PER_WORKER
+                if args.games is not None:
+                    batchSize = min(batchSize, args.games - gamesPlayed)
+                errors = []
+                traces = farm.generateTraces(trainingExperiment, currentHypothesisRed, currentHypothesisBlack, batchSize, errors)
+
+                # Every game dropped by the farm is logged in its own traceback file, as in serial mode
+                for error in errors:
+                    logging.error('Error detected in a self-play worker.\n' + error)
+                    print("An error was detected when performing trace generation. The traceback for this has been logged in " + getTracebackFilename(args.outputDir, traceCount))
+                    traceCount = nextTracebackFile(args.outputDir, savedValuesDir, traceCount)
+                consecutiveFailures = 0 if traces else consecutiveFailures + batchSize - len(traces)
+                if consecutiveFailures >= MAX_CONSECUTIVE_FAILURES:
+                    raise RuntimeError('Trace generation failed ' + str(consecutiveFailures) + ' times in a row.')
+            else:
+                traces = []
+
+            # Call on the Performance System to generate a trace history
+            # The trace generation is encapsulated in a try/catch block
+            # in the case that a stale mate sequence or random range error
+            # produces an incomplete trace history. The failure is logged
+            # and the trace generation is retried without waiting for the user
+            traceGenerated = 0 if farm is None else 1
+            while traceGenerated != 1:
+                try:
+                    traces.append(perfSys.getTrace(trainingExperiment, currentHypothesisRed, currentHypothesisBlack))
+                    traceGenerated = 1
+                    consecutiveFailures = 0
+                except Exception as e:
+                    logging.exception('Error detected.')
+                    print(e)
+                    print("An error was detected when performing trace generation. The traceback for this has been logged in " + getTracebackFilename(args.outputDir, traceCount))
+                    traceCount = nextTracebackFile(args.outputDir, savedValuesDir, traceCount)
+                    consecutiveFailures += 1
+                    if consecutiveFailures >= MAX_CONSECUTIVE_FAILURES:
+                        raise RuntimeError('Trace generation failed ' + str(consecutiveFailures) + ' times in a row.')
+
+            for currentTrace in traces:
+                # Increment the simulation counters
+                simCount += 1
+                gameCount += 1
+                gamesPlayed += 1
+
+                # The game log and the PDN file both number the game with gameCount
+                if gameLogger is not None:
+                    gameLogger.logGame(gameCount, currentTrace)
+                if pdnWriter is not None:
+                    pdnWriter.writeTrace(currentTrace, gameCount)
+
+                # Generate training values using the trace history made by the performance system
+                terminalValueRed = None
+                terminalValueBlack = None
+                if TRAIN_ON_OUTCOMES:
+                    terminalValueRed = crit.getTerminalValue(currentTrace.outcome, "red")
+                    terminalValueBlack = crit.getTerminalValue(currentTrace.outcome, "black")
+                statesRed, trainingValsRed = crit.generateTrainingValuesBatch(currentTrace[0], currentHypothesisRed, terminalValueRed)
+                statesBlack, trainingValsBlack = crit.generateTrainingValuesBatch(currentTrace[1], currentHypothesisBlack, terminalValueBlack)
+
+                # Update the current hypothesis using the generalizer and training values
+                currentHypothesisRed = general.updateHypothesisBatch(statesRed, trainingValsRed, currentHypothesisRed, GENERALIZER_BATCH_SIZE, featureSet.coefficientLimits)
+                currentHypothesisBlack = general.updateHypothesisBatch(statesBlack, trainingValsBlack, currentHypothesisBlack, GENERALIZER_BATCH_SIZE, featureSet.coefficientLimits)
+
+                # Archive the game and re-train on a sample of archived game states
+                # The training value of an archived state is the hypothesis evaluated at the same player's next state
+                if replay is not None:
+                    replay.append(currentTrace)
+                    if REPLAY_BATCH_SIZE > 0:
+                        states, successors, sides = replay.sample(REPLAY_BATCH_SIZE)
+                        currentHypothesisRed = general.updateHypothesisBatch(states[sides == 0], successors[sides == 0].dot(currentHypothesisRed), currentHypothesisRed, GENERALIZER_BATCH_SIZE, featureSet.coefficientLimits)
+                        currentHypothesisBlack = general.updateHypothesisBatch(states[sides == 1], successors[sides == 1].dot(currentHypothesisBlack), currentHypothesisBlack, GENERALIZER_BATCH_SIZE, featureSet.coefficientLimits)
+
+                # checkpointInterval simulations have been performed, so a checkpoint is saved
+                # Additionally, the current hypothesis value is printed to the console and a log file for retention
+                if simCount == args.checkpointInterval:
+                    simCount = 0
+                    saveCheckpoint()
+    # Watch for keyboard exceptions to allow user toggled simulation suspension
+    except KeyboardInterrupt:
+        print("Training simulation ended by user.")
+    finally:
+        # Games played since the last checkpoint are saved as well
+        if simCount > 0:
+            saveCheckpoint()
+        if farm is not None:
+            farm.close()
+        if replay is not None:
+            replay.close()
+        log_file.close()
+        if gameLogger is not None:
+            gameLogger.close()
+        if pdnWriter is not None:
+            pdnWriter.close()
+
+# The main guard keeps worker processes of the self-play farm from re-running the training loop
+if __name__ == '__main__':
+    main()
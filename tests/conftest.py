@@ -0,0 +1,15 @@
+####################################
+# File name: conftest.py
+# Author: BenjaminBeggs
+#
+# Description: Makes the scripts at the top of the repository and
+# the modules of MachineLearningModules importable by the tests,
+# as the scripts do when run from the repository directory.
+#
+####################################
+
+import os, sys
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPOSITORY_DIR)
+sys.path.append(os.path.join(REPOSITORY_DIR, 'MachineLearningModules'))
@@ -0,0 +1,95 @@
+####################################
+# File name: test_alpha_beta_search.py
+# Author: PhilipBasaric
+#
+# Description: Checks that the move chosen by AlphaBetaSearch has
+# the best value of a plain minimax search of the same depth, with
+# and without a transposition table and forced captures, and that
+# the list engine plays the move chosen by the search.
+#
+####################################
+
+import random
+import pytest
+from ComputeEquation import ComputeEquation
+from ExperimentGenerator import ExperimentGenerator
+from AlphaBetaSearch import AlphaBetaSearch, WIN_VALUE
+from BitboardPerformanceSystem import BitboardPerformanceSystem, BitboardGameState, getMoves, getFeatures, applyMove, RED_DIRECTIONS, BLACK_DIRECTIONS, RED_KING_ROW, BLACK_KING_ROW
+from TranspositionTable import TranspositionTable
+from GameState import GameState
+from PerformanceSystem import PerformanceSystem
+
+HYPOTHESIS = [1.3, -0.7, 2.1, -1.9, 0.45, -0.8]
+DEPTH = 3
+POSITIONS = 16
+
+# Returns the minimax value of a position for the side to move, evaluating leaves for the root side as AlphaBetaSearch does
+def minimax(men, kings, enemyMen, enemyKings, isRed, rootIsRed, depth, ply, forcedCapture):
+    legalMoves = getMoves(men, kings, enemyMen | enemyKings, RED_DIRECTIONS if isRed else BLACK_DIRECTIONS, forcedCapture)
+    if len(legalMoves) == 0:
+        return -WIN_VALUE + ply
+    if depth == 0:
+        features = getFeatures(men, enemyMen, kings, enemyKings) if isRed else getFeatures(enemyMen, men, enemyKings, kings)
+        value = ComputeEquation.computeEqn(features, HYPOTHESIS)
+        return value if isRed == rootIsRed else -value
+    kingRow = RED_KING_ROW if isRed else BLACK_KING_ROW
+    best = None
+    for move in legalMoves:
+        newMen, newKings, newEnemyMen, newEnemyKings = applyMove(men, kings, enemyMen, enemyKings, kingRow, move)
+        value = -minimax(newEnemyMen, newEnemyKings, newMen, newKings, not isRed, rootIsRed, depth - 1, ply + 1, forcedCapture)
+        best = value if best is None else max(best, value)
+    return best
+
+# Returns the minimax value of every root move of a game state
+def getRootValues(gameState, forcedCapture):
+    isRed = gameState.currentTurn == "red"
+    if isRed:
+        men, kings, enemyMen, enemyKings = gameState.redPieces, gameState.redKings, gameState.blackPieces, gameState.blackKings
+    else:
+        men, kings, enemyMen, enemyKings = gameState.blackPieces, gameState.blackKings, gameState.redPieces, gameState.redKings
+    kingRow = RED_KING_ROW if isRed else BLACK_KING_ROW
+    values = {}
+    for move in getMoves(men, kings, enemyMen | enemyKings, RED_DIRECTIONS if isRed else BLACK_DIRECTIONS, forcedCapture):
+        newMen, newKings, newEnemyMen, newEnemyKings = applyMove(men, kings, enemyMen, enemyKings, kingRow, move)
+        values[move] = -minimax(newEnemyMen, newEnemyKings, newMen, newKings, not isRed, isRed, DEPTH - 1, 1, forcedCapture)
+    return values
+
+# Returns game states of a seeded random game
+def getGameStates(forcedCapture):
+    perfSys = BitboardPerformanceSystem(forcedCapture=forcedCapture)
+    generator = random.Random(21)
+    gameStates = []
+    gameState = BitboardGameState.fromBoard(ExperimentGenerator().getExperiment(), "red")
+    while len(gameStates) < POSITIONS:
+        legalMoves = perfSys.getLegalMoves(gameState)
+        if not legalMoves:
+            gameState = BitboardGameState.fromBoard(ExperimentGenerator().getExperiment(), "red")
+            continue
+        gameStates.append(BitboardGameState(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings))
+        for ply in range(0, 3):
+            legalMoves = perfSys.getLegalMoves(gameState)
+            if legalMoves:
+                perfSys.makeMove(gameState, legalMoves[generator.randrange(len(legalMoves))])
+    return gameStates
+
+@pytest.mark.parametrize("forcedCapture", [False, True])
+@pytest.mark.parametrize("tableBits", [0, 14])
+def test_best_move_matches_minimax(forcedCapture, tableBits):
+    search = AlphaBetaSearch(DEPTH, None, TranspositionTable(tableBits) if tableBits else None, forcedCapture)
+    for gameState in getGameStates(forcedCapture):
+        values = getRootValues(gameState, forcedCapture)
+        bestMove = search.getBestMove(gameState, HYPOTHESIS)
+        assert values[bestMove] == pytest.approx(max(values.values()))
+        assert search.depthReached == DEPTH
+
+@pytest.mark.parametrize("forcedCapture", [False, True])
+def test_list_engine_plays_the_search_move(forcedCapture):
+    perfSys = PerformanceSystem(search=AlphaBetaSearch(DEPTH, None, None, forcedCapture), forcedCapture=forcedCapture)
+    for bitboardState in getGameStates(forcedCapture):
+        values = getRootValues(bitboardState, forcedCapture)
+        gameState = GameState.fromBoard(bitboardState.getBoard(), bitboardState.currentTurn)
+        legalMoves = perfSys.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.board)
+        move = perfSys.getSearchMove(gameState, legalMoves, HYPOTHESIS)
+        assert move in legalMoves
+        # The list engine orders its moves differently, so only the value of the move is compared
+        assert values[(move.source, move.target, sum(1 << square for square in move.captured))] == pytest.approx(max(values.values()))
@@ -0,0 +1,67 @@
+####################################
+# File name: test_checkpoint_store.py
+# Author: BenjaminBeggs
+#
+# Description: Checks that CheckpointStore round-trips checkpoints,
+# keeps the newest ones, falls back from torn or corrupt files and
+# only removes temporary files when the store is opened.
+#
+####################################
+
+import os, random
+from CheckpointStore import CheckpointStore, TEMPORARY_PREFIX, TEMPORARY_SUFFIX
+
+def test_round_trip(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    randomState = random.Random(7).getstate()
+    store.save([-1, 1, -1, 1, 1, -1], [1, -1, 1, -1, -1, 1], 300, randomState, ["blackPieces", "redPieces"])
+    record = store.loadLatest()
+    assert record["hypothesisRed"] == [-1, 1, -1, 1, 1, -1]
+    assert record["hypothesisBlack"] == [1, -1, 1, -1, -1, 1]
+    assert record["gameCount"] == 300
+    assert record["randomState"] == randomState
+    assert record["features"] == ["blackPieces", "redPieces"]
+
+def test_empty_store(tmp_path):
+    assert CheckpointStore(str(tmp_path)).loadLatest() is None
+
+def test_keeps_newest_checkpoints(tmp_path):
+    store = CheckpointStore(str(tmp_path), keep=3)
+    for gameCount in range(0, 6):
+        store.save([gameCount], [gameCount], gameCount)
+    checkpoints = store.getCheckpoints()
+    assert [sequence for sequence, path in checkpoints] == [3, 4, 5]
+    assert store.loadLatest()["gameCount"] == 5
+
+def test_falls_back_from_torn_checkpoint(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.save([1], [2], 100)
+    path = store.save([3], [4], 200)
+    with open(path, "rb") as checkpointFile:
+        data = checkpointFile.read()
+    with open(path, "wb") as checkpointFile:
+        checkpointFile.write(data[:len(data) // 2])
+    assert store.loadLatest()["gameCount"] == 100
+
+def test_falls_back_from_corrupt_checkpoint(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.save([1], [2], 100)
+    path = store.save([3], [4], 200)
+    with open(path, "r+b") as checkpointFile:
+        checkpointFile.seek(-1, os.SEEK_END)
+        lastByte = checkpointFile.read(1)
+        checkpointFile.seek(-1, os.SEEK_END)
+        checkpointFile.write(bytes([lastByte[0] ^ 0xFF]))
+    assert store.loadLatest()["gameCount"] == 100
+
+def test_temporary_files(tmp_path):
+    leftover = tmp_path / (TEMPORARY_PREFIX + "interrupted" + TEMPORARY_SUFFIX)
+    leftover.write_bytes(b"partial")
+    store = CheckpointStore(str(tmp_path))
+    assert not leftover.exists()
+
+    # A save must leave the temporary file of another writer in place
+    inProgress = tmp_path / (TEMPORARY_PREFIX + "in-progress" + TEMPORARY_SUFFIX)
+    inProgress.write_bytes(b"partial")
+    store.save([1], [2], 100)
+    assert inProgress.exists()
@@ -0,0 +1,37 @@
+####################################
+# File name: test_critic.py
+# Author: JordanCurnew
+#
+# Description: Checks that Critic.generateTrainingValuesBatch gives
+# the training examples of generateTrainingValues, and appends the
+# training value of the final game state when one is given.
+#
+####################################
+
+import random
+import numpy as np
+from Critic import Critic
+
+HYPOTHESIS = [1.3, -0.7, 2.1, -1.9, 0.45, -0.8]
+
+# Returns seeded feature rows of a trace
+def getTraceHistory(plies):
+    generator = random.Random(9)
+    return [[generator.randint(0, 12) for feature in range(0, 6)] for ply in range(0, plies)]
+
+def test_batch_matches_training_values():
+    traceHistory = getTraceHistory(25)
+    states, targets = Critic.generateTrainingValuesBatch(traceHistory, HYPOTHESIS)
+    trainingValues = Critic.generateTrainingValues(traceHistory, HYPOTHESIS)
+    assert states.tolist() == [state for state, value in trainingValues]
+    assert np.allclose(targets, [value for state, value in trainingValues])
+
+def test_terminal_value():
+    traceHistory = getTraceHistory(10)
+    states, targets = Critic.generateTrainingValuesBatch(traceHistory, HYPOTHESIS, 100)
+    assert states.tolist() == traceHistory
+    assert len(targets) == 10 and targets[-1] == 100
+
+def test_single_state():
+    states, targets = Critic.generateTrainingValuesBatch(getTraceHistory(1), HYPOTHESIS)
+    assert states.shape == (0, 6) and targets.shape == (0,)
@@ -0,0 +1,61 @@
+####################################
+# File name: test_draw_rules.py
+# Author: PhilipBasaric
+#
+# Description: Checks the repetition and no-capture draw rules of
+# PositionHistory, and that games of both engines end with an
+# outcome once a draw rule applies.
+#
+####################################
+
+import random
+import pytest
+from ExperimentGenerator import ExperimentGenerator
+from PositionHistory import PositionHistory
+from SelfPlayFarm import createPerformanceSystem
+
+def test_repetition():
+    history = PositionHistory(repetitionLimit=3, noCaptureMoveLimit=None)
+    assert not history.record(1, 24)
+    assert not history.record(2, 24)
+    assert not history.record(1, 24)
+    assert history.record(1, 24)
+
+def test_elimination_resets_repetitions():
+    history = PositionHistory(repetitionLimit=2, noCaptureMoveLimit=None)
+    assert not history.record(1, 24)
+    assert not history.record(2, 23)
+    # The position can only occur again with the same pieces, so a repetition from before the elimination does not count
+    assert not history.record(1, 23)
+    assert history.record(1, 23)
+
+def test_no_capture_moves():
+    history = PositionHistory(repetitionLimit=None, noCaptureMoveLimit=2)
+    assert not history.record(0, 24)
+    for ply in range(1, 4):
+        assert not history.record(ply, 24)
+    assert history.record(4, 24)
+    # An elimination starts the count again
+    assert not history.record(5, 23)
+
+def test_disabled_rules():
+    history = PositionHistory(repetitionLimit=None, noCaptureMoveLimit=None)
+    assert not any(history.record(1, 24) for ply in range(0, 500))
+
+@pytest.mark.parametrize("useBitboardEngine", [False, True])
+def test_game_ends_in_draw(useBitboardEngine):
+    # No piece can be eliminated in the first two plies of a game, so a limit of one move each ends it as a draw
+    perfSys = createPerformanceSystem(useBitboardEngine, noCaptureMoveLimit=1)
+    for seed in range(0, 10):
+        random.seed(seed)
+        trace = perfSys.getTrace(ExperimentGenerator().getExperiment(), [-1, 1, -1, 1, 1, -1], [1, -1, 1, -1, -1, 1])
+        assert trace.outcome == "draw"
+        assert trace.plies == 3
+
+@pytest.mark.parametrize("useBitboardEngine", [False, True])
+def test_games_have_outcomes(useBitboardEngine):
+    perfSys = createPerformanceSystem(useBitboardEngine, repetitionLimit=3, noCaptureMoveLimit=40)
+    for seed in range(0, 10):
+        random.seed(seed)
+        trace = perfSys.getTrace(ExperimentGenerator().getExperiment(), [-1, 1, -1, 1, 1, -1], [1, -1, 1, -1, -1, 1])
+        assert trace.outcome in ("red", "black", "draw")
@@ -0,0 +1,71 @@
+####################################
+# File name: test_engines.py
+# Author: BenjaminBeggs
+#
+# Description: Checks that the list engine (PerformanceSystem) and
+# the bitboard engine (BitboardPerformanceSystem) agree on the
+# features of every position and on the prediction of every move,
+# with and without a transposition table, along seeded random games.
+#
+####################################
+
+import random
+import pytest
+from ExperimentGenerator import ExperimentGenerator
+from GameState import GameState
+from PerformanceSystem import PerformanceSystem
+from BitboardPerformanceSystem import BitboardPerformanceSystem, BitboardGameState
+from TranspositionTable import TranspositionTable
+
+# A hypothesis with a different coefficient for every feature, so that a feature that differs changes the prediction
+HYPOTHESIS = [1.3, -0.7, 2.1, -1.9, 0.45, -0.8]
+
+GAMES = 12
+MAX_PLIES = 80
+
+# Returns the legal moves of the list engine in the game state
+def getListMoves(perfSys, gameState):
+    return perfSys.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.board)
+
+# Returns the bitboard move matching a Move of the list engine
+def findBitboardMove(bitboardMoves, move):
+    captured = sum(1 << square for square in move.captured)
+    for bitboardMove in bitboardMoves:
+        if bitboardMove == (move.source, move.target, captured):
+            return bitboardMove
+    raise AssertionError('The bitboard engine has no move ' + str(move))
+
+# Returns the game states of seeded random games of the list engine, paired with the same positions of the bitboard engine
+def getPositions():
+    positions = []
+    generator = random.Random(1234)
+    for game in range(0, GAMES):
+        perfSys = PerformanceSystem()
+        gameState = GameState.fromBoard(ExperimentGenerator().getExperiment(), "red")
+        perfSys.updateThreats(gameState)
+        for ply in range(0, MAX_PLIES):
+            legalMoves = getListMoves(perfSys, gameState)
+            if not legalMoves:
+                break
+            positions.append(([list(row) for row in gameState.board], gameState.currentTurn))
+            perfSys.makeMove(gameState, legalMoves[generator.randrange(len(legalMoves))])
+            perfSys.updateThreats(gameState)
+    return positions
+
+POSITIONS = getPositions()
+
+@pytest.mark.parametrize("tableBits", [0, 12])
+def test_predictions_agree(tableBits):
+    listSystem = PerformanceSystem(table=TranspositionTable(tableBits) if tableBits else None)
+    bitboardSystem = BitboardPerformanceSystem(table=TranspositionTable(tableBits) if tableBits else None)
+    for board, currentTurn in POSITIONS:
+        gameState = GameState.fromBoard(board, currentTurn)
+        listSystem.updateThreats(gameState)
+        bitboardState = BitboardGameState.fromBoard(board, currentTurn)
+        assert list(gameState.info) == list(bitboardState.info)
+        bitboardMoves = bitboardSystem.getLegalMoves(bitboardState)
+        legalMoves = getListMoves(listSystem, gameState)
+        assert len(legalMoves) == len(bitboardMoves)
+        for move in legalMoves:
+            bitboardMove = findBitboardMove(bitboardMoves, move)
+            assert listSystem.getPrediction(gameState, move, HYPOTHESIS) == pytest.approx(bitboardSystem.getPrediction(bitboardState, bitboardMove, HYPOTHESIS))
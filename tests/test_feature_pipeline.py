@@ -0,0 +1,61 @@
+####################################
+# File name: test_feature_pipeline.py
+# Author: BenjaminBeggs
+#
+# Description: Checks that FeaturePipeline replays recorded games
+# into the feature rows of their traces, in the order the games
+# were read, in the calling process and in worker processes.
+#
+####################################
+
+import random
+import numpy as np
+import pytest
+from ExperimentGenerator import ExperimentGenerator
+from FeaturePipeline import FeaturePipeline, getInfoFeatures
+from GameLogger import getMoveRecord
+from SelfPlayFarm import createPerformanceSystem
+
+# Returns the recorded (moves, outcome) and the trace rows of seeded games of both engines
+def getGames():
+    games = []
+    rows = []
+    for useBitboardEngine in (False, True):
+        perfSys = createPerformanceSystem(useBitboardEngine, repetitionLimit=3, noCaptureMoveLimit=40, forcedCapture=useBitboardEngine, recordMoves=True)
+        for seed in range(0, 6):
+            random.seed(seed)
+            trace = perfSys.getTrace(ExperimentGenerator().getExperiment(), [-1, 1, -1, 1, 1, -1], [1, -1, 1, -1, -1, 1])
+            games.append(([getMoveRecord(move) for move in trace.moves], trace.outcome))
+            rows.append(trace.getArray().copy())
+    return games, rows
+
+GAMES, ROWS = getGames()
+
+@pytest.mark.parametrize("workerCount", [1, 2])
+def test_rows_match_traces(workerCount):
+    pipeline = FeaturePipeline(getInfoFeatures, workerCount, batchSize=5)
+    try:
+        batches = list(pipeline.featurise(iter(GAMES)))
+    finally:
+        pipeline.close()
+    assert [len(outcomes) for features, offsets, outcomes in batches] == [5, 5, 2]
+    game = 0
+    for features, offsets, outcomes in batches:
+        assert offsets[-1] == len(features)
+        for k in range(0, len(outcomes)):
+            assert np.array_equal(features[offsets[k]:offsets[k + 1]], ROWS[game])
+            assert (outcomes[k] or None) == GAMES[game][1]
+            game += 1
+    assert game == len(GAMES)
+    assert pipeline.errorCount == 0
+
+def test_unreplayable_game_is_skipped():
+    moves, outcome = GAMES[0]
+    # The second move of a game cannot be made by the player who made the first
+    games = [GAMES[1], ([moves[0], moves[0]], outcome), GAMES[2]]
+    pipeline = FeaturePipeline(getInfoFeatures, 1, batchSize=10)
+    features, offsets, outcomes = next(pipeline.featurise(games))
+    pipeline.close()
+    assert pipeline.errorCount == 1
+    assert len(outcomes) == 2
+    assert np.array_equal(features[offsets[1]:offsets[2]], ROWS[2])
@@ -0,0 +1,105 @@
+####################################
+# File name: test_feature_registry.py
+# Author: JordanCurnew
+#
+# Description: Checks the built-in features of FeatureRegistry
+# against square-by-square counts on random positions, and the
+# hypotheses and registered features of a FeatureSet.
+#
+####################################
+
+import random
+import pytest
+from BitboardPerformanceSystem import BitboardGameState, getMoves, getFeatures, squareToCoordinates, RED_DIRECTIONS, BLACK_DIRECTIONS
+from FeatureRegistry import FeatureSet, REGISTRY, DEFAULT_FEATURES, EXTENDED_FEATURES, registerFeature
+from GameState import GameState
+
+# Returns the squares of a mask
+def getSquares(mask):
+    return [square for square in range(0, 32) if mask >> square & 1]
+
+# Returns the number of men of a mask with no enemy piece in the cone of squares between them and their king row
+def countRunaways(men, enemies, isRed):
+    runaways = 0
+    for square in getSquares(men):
+        row, col = squareToCoordinates(square)
+        blocked = False
+        for other in getSquares(enemies):
+            otherRow, otherCol = squareToCoordinates(other)
+            distance = row - otherRow if isRed else otherRow - row
+            if distance > 0 and abs(otherCol - col) <= distance:
+                blocked = True
+        runaways += not blocked
+    return runaways
+
+# Returns random positions as masks (red pieces, black pieces, red kings, black kings)
+def getPositions(count):
+    generator = random.Random(1)
+    positions = []
+    for position in range(0, count):
+        squares = list(range(0, 32))
+        generator.shuffle(squares)
+        masks = {"r": 0, "b": 0, "R": 0, "B": 0}
+        for square in squares[:generator.randint(2, 20)]:
+            kind = generator.choice("rbRB")
+            # Men never stand on their own king row
+            if kind == "r" and square < 4:
+                kind = "R"
+            if kind == "b" and square >= 28:
+                kind = "B"
+            masks[kind] |= 1 << square
+        positions.append((masks["r"], masks["b"], masks["R"], masks["B"]))
+    return positions
+
+def test_built_in_features():
+    featureSet = FeatureSet(EXTENDED_FEATURES)
+    centre = [square for square in range(0, 32) if squareToCoordinates(square)[0] in (3, 4) and 0 < squareToCoordinates(square)[1] < 7]
+    for redPieces, blackPieces, redKings, blackKings in getPositions(500):
+        features = dict(zip(EXTENDED_FEATURES, featureSet.getFeatures(redPieces, blackPieces, redKings, blackKings)))
+        assert [features[name] for name in DEFAULT_FEATURES] == getFeatures(redPieces, blackPieces, redKings, blackKings)
+        assert features["redBackRow"] == len([square for square in getSquares(redPieces) if square >= 28])
+        assert features["blackBackRow"] == len([square for square in getSquares(blackPieces) if square < 4])
+        assert features["redCentre"] == len([square for square in centre if (redPieces | redKings) >> square & 1])
+        assert features["blackCentre"] == len([square for square in centre if (blackPieces | blackKings) >> square & 1])
+        assert features["redMobility"] == len([move for move in getMoves(redPieces, redKings, blackPieces | blackKings, RED_DIRECTIONS) if move[2] == 0])
+        assert features["blackMobility"] == len([move for move in getMoves(blackPieces, blackKings, redPieces | redKings, BLACK_DIRECTIONS) if move[2] == 0])
+        assert features["redRunaways"] == countRunaways(redPieces, blackPieces | blackKings, True)
+        assert features["blackRunaways"] == countRunaways(blackPieces, redPieces | redKings, False)
+
+def test_both_engines_give_the_same_features():
+    featureSet = FeatureSet(["redMobility", "blackKings", "redRunaways"])
+    for redPieces, blackPieces, redKings, blackKings in getPositions(100):
+        bitboardState = BitboardGameState("red", redPieces, blackPieces, redKings, blackKings)
+        gameState = GameState.fromBoard(bitboardState.getBoard(), "red")
+        assert featureSet.getGameStateFeatures(gameState) == featureSet.getGameStateFeatures(bitboardState)
+
+def test_hypotheses():
+    featureSet = FeatureSet(["redKings", "blackMobility", "redThreat"])
+    assert featureSet.getStartingHypothesis("red") == [1, -1, 1]
+    assert featureSet.getStartingHypothesis("black") == [-1, 1, -1]
+    assert featureSet.coefficientLimits == [4, 1, 8]
+    # Shared features keep their coefficients and new ones start from the starting hypothesis
+    assert featureSet.adaptHypothesis([1, 2, 3, 4, 5, 6], DEFAULT_FEATURES, "red") == [4, -1, 5]
+    with pytest.raises(ValueError):
+        featureSet.adaptHypothesis([1, 2], DEFAULT_FEATURES, "red")
+
+def test_invalid_feature_sets():
+    with pytest.raises(ValueError):
+        FeatureSet(["redKings", "noSuchFeature"])
+    with pytest.raises(ValueError):
+        FeatureSet(["redKings", "redKings"])
+
+# Feature registered by test_registered_feature: the number of red kings on the edges of the board
+def countRedEdgeKings(redPieces, blackPieces, redKings, blackKings):
+    return len([square for square in getSquares(redKings) if squareToCoordinates(square)[1] in (0, 7)])
+
+def test_registered_feature(monkeypatch):
+    monkeypatch.setattr("FeatureRegistry.REGISTRY", dict(REGISTRY))
+    registerFeature("redEdgeKings", "red", 2, countRedEdgeKings)
+    with pytest.raises(ValueError):
+        registerFeature("redEdgeKings", "red", 2, countRedEdgeKings)
+    with pytest.raises(ValueError):
+        registerFeature("greenKings", "green", 2, countRedEdgeKings)
+    featureSet = FeatureSet(["redEdgeKings", "redKings"])
+    for redPieces, blackPieces, redKings, blackKings in getPositions(50):
+        assert featureSet.getFeatures(redPieces, blackPieces, redKings, blackKings) == [countRedEdgeKings(redPieces, blackPieces, redKings, blackKings), len(getSquares(redKings))]
@@ -0,0 +1,64 @@
+####################################
+# File name: test_game_logger.py
+# Author: BenjaminBeggs
+#
+# Description: Checks the JSON lines written by GameLogger at both
+# logging levels and that readGameLog returns the logged moves.
+#
+####################################
+
+import json, random
+import pytest
+from ExperimentGenerator import ExperimentGenerator
+from GameLogger import GameLogger, readGameLog, getMoveRecord, LOG_GAMES, LOG_MOVES
+from SelfPlayFarm import createPerformanceSystem
+
+# Returns seeded traces of games played with recorded moves
+def getTraces(useBitboardEngine, count):
+    perfSys = createPerformanceSystem(useBitboardEngine, repetitionLimit=3, noCaptureMoveLimit=40, recordMoves=True)
+    traces = []
+    for seed in range(0, count):
+        random.seed(seed)
+        traces.append(perfSys.getTrace(ExperimentGenerator().getExperiment(), [-1, 1, -1, 1, 1, -1], [1, -1, 1, -1, -1, 1]))
+    return traces
+
+def test_log_games(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    traces = getTraces(True, 4)
+    logger = GameLogger(path, LOG_GAMES)
+    for gameNumber, trace in enumerate(traces, 1):
+        logger.logGame(gameNumber, trace)
+    logger.close()
+    with open(path) as logFile:
+        records = [json.loads(line) for line in logFile]
+    assert [record["game"] for record in records] == [1, 2, 3, 4]
+    for record, trace in zip(records, traces):
+        assert record["outcome"] == trace.outcome
+        assert record["plies"] == trace.plies - 1
+        assert record["final"] == trace.getArray()[-1].tolist()
+        assert "moves" not in record
+    # Games logged without their moves cannot be replayed
+    assert list(readGameLog(path)) == []
+
+@pytest.mark.parametrize("useBitboardEngine", [False, True])
+def test_log_moves(tmp_path, useBitboardEngine):
+    path = str(tmp_path / "games.jsonl")
+    traces = getTraces(useBitboardEngine, 4)
+    # The log is appended to by every logger opened on it
+    for start in (0, 2):
+        logger = GameLogger(path, LOG_MOVES)
+        for index in range(start, start + 2):
+            logger.logGame(index + 1, traces[index])
+        logger.close()
+    with open(path) as logFile:
+        records = [json.loads(line) for line in logFile]
+    assert [record["game"] for record in records] == [1, 2, 3, 4]
+    games = list(readGameLog(path))
+    assert len(games) == 4
+    for (moves, outcome), trace in zip(games, traces):
+        assert moves == [getMoveRecord(move) for move in trace.moves]
+        assert outcome == trace.outcome
+
+def test_bitboard_move_record():
+    assert getMoveRecord((21, 30, (1 << 25) | (1 << 17))) == [21, 30, [17, 25]]
+    assert getMoveRecord((9, 13, 0)) == [9, 13, []]
@@ -0,0 +1,87 @@
+####################################
+# File name: test_generalizer.py
+# Author: BenjaminBeggs
+#
+# Description: Checks the vectorised LMS rule of
+# Generalizer.updateHypothesisBatch against the LMS rule applied
+# one training example at a time.
+#
+####################################
+
+import random
+import pytest
+from ComputeEquation import ComputeEquation
+from Generalizer import Generalizer, COEFFICIENT_LIMITS
+
+HYPOTHESIS = [-1, 1, -1, 1, 1, -1]
+
+# Returns seeded training examples as [features, training value] pairs
+def getTrainingExamples(count):
+    generator = random.Random(42)
+    examples = []
+    for i in range(0, count):
+        features = [generator.randint(0, 12), generator.randint(0, 12), generator.randint(0, 4), generator.randint(0, 4), generator.randint(0, 3), generator.randint(0, 3)]
+        examples.append([features, generator.uniform(-100, 100)])
+    return examples
+
+# Applies the LMS rule one example at a time, as the reference for updateHypothesisBatch
+def updateSequentially(trainingExamples, currentHypothesis, coefficientLimits=None):
+    weights = list(currentHypothesis)
+    for features, value in trainingExamples:
+        error = value - ComputeEquation.computeEqn(features, weights)
+        weights = [weights[j] + 0.001*error*features[j] for j in range(0, len(weights))]
+    return Generalizer.imposeLimits([round(w, 2) for w in weights], list(currentHypothesis), coefficientLimits)
+
+# Splits training examples into the feature matrix and target vector of updateHypothesisBatch
+def split(trainingExamples):
+    return [features for features, value in trainingExamples], [value for features, value in trainingExamples]
+
+def test_single_example_matches_updateHypothesis():
+    for example in getTrainingExamples(20):
+        features, targets = split([example])
+        assert Generalizer.updateHypothesisBatch(features, targets, list(HYPOTHESIS)) == Generalizer.updateHypothesis([example], list(HYPOTHESIS))
+
+def test_batch_size_one_is_sequential():
+    trainingExamples = getTrainingExamples(50)
+    features, targets = split(trainingExamples)
+    assert Generalizer.updateHypothesisBatch(features, targets, list(HYPOTHESIS), batchSize=1) == updateSequentially(trainingExamples, HYPOTHESIS)
+
+def test_full_batch_applies_mean_update():
+    trainingExamples = getTrainingExamples(30)
+    features, targets = split(trainingExamples)
+    update = [0.0] * len(HYPOTHESIS)
+    for example, value in trainingExamples:
+        error = value - ComputeEquation.computeEqn(example, HYPOTHESIS)
+        for j in range(0, len(HYPOTHESIS)):
+            update[j] += 0.001*error*example[j]/len(trainingExamples)
+    expected = Generalizer.imposeLimits([round(HYPOTHESIS[j] + update[j], 2) for j in range(0, len(HYPOTHESIS))], list(HYPOTHESIS))
+    assert Generalizer.updateHypothesisBatch(features, targets, list(HYPOTHESIS), batchSize=None) == expected
+
+def test_coefficient_limits_of_other_feature_sets():
+    trainingExamples = [[features[:4], value] for features, value in getTrainingExamples(50)]
+    features, targets = split(trainingExamples)
+    coefficientLimits = [0.5, 0.5, 1, 1]
+    expected = updateSequentially(trainingExamples, [1, -1, 1, -1], coefficientLimits)
+    assert Generalizer.updateHypothesisBatch(features, targets, [1, -1, 1, -1], coefficientLimits=coefficientLimits) == expected
+    with pytest.raises(ValueError):
+        Generalizer.updateHypothesisBatch(features, targets, [1, -1, 1, -1])
+    with pytest.raises(ValueError):
+        Generalizer.updateHypothesis(trainingExamples, [1, -1, 1, -1], COEFFICIENT_LIMITS)
+
+def test_coefficients_at_their_limits_stay_there():
+    hypothesis = [float(limit) for limit in COEFFICIENT_LIMITS]
+    # Every example pushes every coefficient further up
+    features = [[12, 12, 4, 4, 3, 3]] * 20
+    assert Generalizer.updateHypothesisBatch(features, [10000] * 20, list(hypothesis)) == hypothesis
+
+def test_limits_clamp_both_ways():
+    # Both coefficients change by the largest step of 1, past their limits of 2 and 8
+    assert Generalizer.imposeLimits([3.8, 1, 1, 1, 1, 10], [1.9, 1, 1, 1, 1, -7.5]) == [2, 1, 1, 1, 1, -8]
+
+def test_current_hypothesis_is_unchanged():
+    hypothesis = list(HYPOTHESIS)
+    trainingExamples = getTrainingExamples(10)
+    features, targets = split(trainingExamples)
+    Generalizer.updateHypothesisBatch(features, targets, hypothesis)
+    Generalizer.updateHypothesis(trainingExamples, hypothesis)
+    assert hypothesis == HYPOTHESIS
@@ -0,0 +1,58 @@
+####################################
+# File name: test_make_unmake.py
+# Author: PhilipBasaric
+#
+# Description: Checks that PerformanceSystem.makeMove keeps the
+# piece counters of GameState.info up to date and that unmakeMove
+# restores the game state exactly, for every legal move of the
+# positions of seeded random games.
+#
+####################################
+
+import copy, random
+from ExperimentGenerator import ExperimentGenerator
+from GameState import GameState
+from PerformanceSystem import PerformanceSystem
+from Perft_Checkers import STORED_POSITIONS, readRows
+
+GAMES = 6
+MAX_PLIES = 60
+
+# Returns a copy of everything makeMove changes in a game state
+def getSnapshot(gameState):
+    return (copy.deepcopy(gameState.board), copy.deepcopy([gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings]),
+            list(gameState.info), gameState.hash, gameState.currentTurn, [None if piece is None else list(piece) for piece in gameState.squares])
+
+# Returns the legal moves of the side to move
+def getLegalMoves(perfSys, gameState):
+    return perfSys.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.board)
+
+# Returns the starting boards of the random games: the starting board and the stored perft positions
+def getStarts():
+    starts = [(ExperimentGenerator().getExperiment(), "red")]
+    for name, currentTurn, rows, counts in STORED_POSITIONS:
+        starts.append((readRows(rows), currentTurn))
+    return starts
+
+def test_make_and_unmake_every_move():
+    perfSys = PerformanceSystem()
+    generator = random.Random(17)
+    for board, currentTurn in getStarts():
+        for game in range(0, GAMES):
+            gameState = GameState.fromBoard(board, currentTurn)
+            perfSys.updateThreats(gameState)
+            for ply in range(0, MAX_PLIES):
+                legalMoves = getLegalMoves(perfSys, gameState)
+                if not legalMoves:
+                    break
+                snapshot = getSnapshot(gameState)
+                for move in legalMoves:
+                    undo = perfSys.makeMove(gameState, move)
+                    successor = GameState.fromBoard(gameState.board, gameState.currentTurn)
+                    assert gameState.info[:4] == successor.info[:4]
+                    assert sorted(map(tuple, gameState.redPieces + gameState.blackPieces + gameState.redKings + gameState.blackKings)) == \
+                        sorted(map(tuple, successor.redPieces + successor.blackPieces + successor.redKings + successor.blackKings))
+                    perfSys.unmakeMove(gameState, undo)
+                    assert getSnapshot(gameState) == snapshot
+                perfSys.makeMove(gameState, legalMoves[generator.randrange(len(legalMoves))])
+                perfSys.updateThreats(gameState)
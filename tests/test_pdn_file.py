@@ -0,0 +1,80 @@
+####################################
+# File name: test_pdn_file.py
+# Author: BenjaminBeggs
+#
+# Description: Checks that games written by PDNWriter are read
+# back by readGames with the same moves and outcomes, for both
+# engines, and that readGames skips the comments, variations and
+# move numbers of hand-written PDN.
+#
+####################################
+
+import random
+import pytest
+from ExperimentGenerator import ExperimentGenerator
+from GameLogger import getMoveRecord
+from PDNFile import PDNWriter, readGames, getOutcome, squareToNumber, numberToSquare
+from SelfPlayFarm import createPerformanceSystem
+
+HYPOTHESIS_RED = [-1, 1, -1, 1, 1, -1]
+HYPOTHESIS_BLACK = [1, -1, 1, -1, -1, 1]
+
+# Returns a move record with its eliminated squares sorted, as the bitboard engine does not keep the order of the jumps
+def normalise(record):
+    source, target, captured = record
+    return source, target, sorted(captured)
+
+def test_square_numbers():
+    assert sorted(squareToNumber(square) for square in range(0, 32)) == list(range(1, 33))
+    assert all(numberToSquare(squareToNumber(square)) == square for square in range(0, 32))
+    # Red starts on the squares 1 to 12 of PDN
+    assert sorted(squareToNumber(square) for square in range(20, 32)) == list(range(1, 13))
+
+@pytest.mark.parametrize("useBitboardEngine", [False, True])
+def test_write_then_read(tmp_path, useBitboardEngine):
+    path = str(tmp_path / "games.pdn")
+    perfSys = createPerformanceSystem(useBitboardEngine, repetitionLimit=3, noCaptureMoveLimit=40, forcedCapture=True, recordMoves=True)
+    writer = PDNWriter(path)
+    games = []
+    for game in range(0, 10):
+        random.seed(game)
+        trace = perfSys.getTrace(ExperimentGenerator().getExperiment(), HYPOTHESIS_RED, HYPOTHESIS_BLACK)
+        writer.writeTrace(trace, game + 1)
+        games.append(([getMoveRecord(move) for move in trace.moves], trace.outcome))
+    writer.close()
+
+    pdnGames = list(readGames(path))
+    assert len(pdnGames) == len(games)
+    for game, (pdnGame, (moves, outcome)) in enumerate(zip(pdnGames, games)):
+        assert pdnGame.tags["Round"] == str(game + 1)
+        assert [normalise(record) for record in pdnGame.moves] == [normalise(record) for record in moves]
+        assert getOutcome(pdnGame.result) == outcome
+
+def test_appends_to_existing_file(tmp_path):
+    path = str(tmp_path / "games.pdn")
+    for round in (1, 2):
+        writer = PDNWriter(path)
+        writer.writeGame([], "draw", round)
+        writer.close()
+    assert [pdnGame.tags["Round"] for pdnGame in readGames(path)] == ["1", "2"]
+
+def test_read_hand_written_games(tmp_path):
+    path = tmp_path / "games.pdn"
+    path.write_text('[Event "first"]\n'
+                    '1. 11-15 {a comment\nover two lines} 23-19 (1... 22-18) 2. 9-13 *\n'
+                    '\n'
+                    '[Event "second"]\n'
+                    '1. 9x18x27 1-0\n'
+                    '\n'
+                    '[Event "third"]\n'
+                    '1. 9x27 0-1\n')
+    first, second, third = readGames(str(path))
+    square = numberToSquare
+    assert first.tags == {"Event": "first"}
+    assert first.moves == [[square(11), square(15), []], [square(23), square(19), []], [square(9), square(13), []]]
+    assert getOutcome(first.result) is None
+    assert second.moves == [[square(9), square(27), [square(14), square(23)]]]
+    assert getOutcome(second.result) == "red"
+    # A jump written without its intermediate squares leaves the eliminated squares unknown
+    assert third.moves == [[square(9), square(27), None]]
+    assert getOutcome(third.result) == "black"
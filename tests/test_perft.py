@@ -0,0 +1,32 @@
+####################################
+# File name: test_perft.py
+# Author: BenjaminBeggs
+#
+# Description: Checks the move generation of both engines against
+# the perft counts of Perft_Checkers.py: the published counts of
+# the starting board and the cross-engine regression counts of the
+# stored positions.
+#
+####################################
+
+import pytest
+from ExperimentGenerator import ExperimentGenerator
+from Perft_Checkers import START_COUNTS, STORED_POSITIONS, perft, readRows
+
+ENGINES = ["list", "bitboard"]
+
+# Deepest depth checked, kept low enough for the suite to run in seconds
+DEPTH = 5
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_starting_board(engine):
+    board = ExperimentGenerator().getExperiment()
+    for depth in range(1, DEPTH + 1):
+        assert perft(engine, board, "red", depth) == START_COUNTS[depth - 1]
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("name, currentTurn, rows, counts", STORED_POSITIONS, ids=[position[0] for position in STORED_POSITIONS])
+def test_stored_positions(engine, name, currentTurn, rows, counts):
+    board = readRows(rows)
+    for depth in range(1, DEPTH + 1):
+        assert perft(engine, board, currentTurn, depth) == counts[depth - 1]
@@ -0,0 +1,95 @@
+####################################
+# File name: test_replay_buffer.py
+# Author: BenjaminBeggs
+#
+# Description: Checks that ReplayBuffer keeps the newest games
+# intact as its ring of rows wraps around, that an archive can be
+# reopened, and that samples pair every state with the state of the
+# same player two plies later.
+#
+####################################
+
+import random
+import numpy as np
+import pytest
+from ReplayBuffer import ReplayBuffer
+from Trace import Trace
+
+# Returns a Trace of the given number of plies whose rows are numbered from first
+# The first feature holds the number of the row and the second the number of the game
+def makeTrace(game, plies, first):
+    trace = Trace()
+    for ply in range(0, plies):
+        trace.append([first + ply, game, ply % 2, 0, 0, 0])
+    return trace
+
+# Asserts that the buffer holds the newest of the appended traces, oldest first
+def assertNewestGames(buffer, traces):
+    assert 0 < len(buffer) <= len(traces)
+    retained = traces[len(traces) - len(buffer):]
+    for k, trace in enumerate(retained):
+        assert np.array_equal(buffer.getGame(k), trace.getArray())
+
+def test_ring_wraparound(tmp_path):
+    buffer = ReplayBuffer(str(tmp_path / "replay"), capacityRows=50, maxGames=100)
+    generator = random.Random(5)
+    traces = []
+    rows = 0
+    for game in range(0, 60):
+        trace = makeTrace(game, generator.randint(3, 17), rows)
+        rows += trace.plies
+        traces.append(trace)
+        buffer.append(trace)
+        assertNewestGames(buffer, traces)
+        assert sum(len(buffer.getGame(k)) for k in range(0, len(buffer))) <= 50
+    buffer.close()
+
+def test_max_games(tmp_path):
+    buffer = ReplayBuffer(str(tmp_path / "replay"), capacityRows=1000, maxGames=4)
+    traces = [makeTrace(game, 5, 5*game) for game in range(0, 10)]
+    for trace in traces:
+        buffer.append(trace)
+    assert len(buffer) == 4
+    assertNewestGames(buffer, traces)
+    buffer.close()
+
+def test_trace_larger_than_buffer(tmp_path):
+    buffer = ReplayBuffer(str(tmp_path / "replay"), capacityRows=10, maxGames=4)
+    with pytest.raises(ValueError):
+        buffer.append(makeTrace(0, 11, 0))
+    buffer.close()
+
+def test_reopen(tmp_path):
+    path = str(tmp_path / "replay")
+    buffer = ReplayBuffer(path, capacityRows=40, maxGames=8)
+    traces = [makeTrace(game, 7, 7*game) for game in range(0, 9)]
+    for trace in traces[:6]:
+        buffer.append(trace)
+    buffer.close()
+
+    # The capacity of an existing archive is read from its header
+    buffer = ReplayBuffer(path, capacityRows=5, maxGames=2)
+    assert buffer.capacityRows == 40 and buffer.maxGames == 8
+    assertNewestGames(buffer, traces[:6])
+    for trace in traces[6:]:
+        buffer.append(trace)
+    assertNewestGames(buffer, traces)
+    buffer.close()
+
+    with pytest.raises(ValueError):
+        ReplayBuffer(path, featureCount=14)
+
+def test_sample(tmp_path):
+    buffer = ReplayBuffer(str(tmp_path / "replay"), capacityRows=60, maxGames=10, seed=11)
+    states, nextStates, players = buffer.sample(8)
+    assert len(states) == 0 and len(nextStates) == 0 and len(players) == 0
+    for game in range(0, 12):
+        buffer.append(makeTrace(game, 9, 9*game))
+    states, nextStates, players = buffer.sample(500)
+    assert states.shape == (500, 6) and nextStates.shape == (500, 6)
+    assert np.array_equal(nextStates[:, 0], states[:, 0] + 2)
+    assert np.array_equal(nextStates[:, 1], states[:, 1])
+    assert np.array_equal(players, states[:, 2])
+    retainedGames = set(int(buffer.getGame(k)[0, 1]) for k in range(0, len(buffer)))
+    assert set(states[:, 1].tolist()) <= retainedGames
+    buffer.close()
@@ -0,0 +1,59 @@
+####################################
+# File name: test_trace.py
+# Author: PhilipBasaric
+#
+# Description: Checks that a Trace returns the feature rows it was
+# given, through the red and black views and after its buffer has
+# grown and been trimmed.
+#
+####################################
+
+import random
+import numpy as np
+import pytest
+from Trace import Trace
+
+# Returns seeded feature rows of the given width
+def getRows(count, featureCount=6):
+    generator = random.Random(3)
+    return [[generator.randint(-300, 300) for feature in range(0, featureCount)] for ply in range(0, count)]
+
+def test_round_trip_through_growth():
+    rows = getRows(301)
+    trace = Trace(capacity=4)
+    for row in rows:
+        trace.append(row)
+    assert trace.plies == 301
+    assert trace.getArray().dtype == np.int16
+    assert trace.getArray().tolist() == rows
+    trace.trim()
+    assert len(trace.buffer) == 301*6
+    assert trace.getArray().tolist() == rows
+
+def test_red_and_black_views():
+    rows = getRows(7)
+    trace = Trace()
+    for row in rows:
+        trace.append(row)
+    assert trace.getRed().tolist() == rows[0::2]
+    assert trace.getBlack().tolist() == rows[1::2]
+    assert trace[0].tolist() == rows[0::2]
+    assert trace[1].tolist() == rows[1::2]
+    assert trace.getRedPlies() == 4
+    with pytest.raises(IndexError):
+        trace[2]
+
+def test_other_feature_counts():
+    rows = getRows(9, 14)
+    trace = Trace(featureCount=14, capacity=1)
+    for row in rows:
+        trace.append(row)
+    assert trace.getArray().shape == (9, 14)
+    assert trace.getArray().tolist() == rows
+
+def test_empty_trace():
+    trace = Trace()
+    trace.trim()
+    assert trace.getArray().shape == (0, 6)
+    assert trace.getRedPlies() == 0
+    assert trace.outcome is None and trace.moves is None
@@ -0,0 +1,61 @@
+####################################
+# File name: test_transposition_table.py
+# Author: BenjaminBeggs
+#
+# Description: Checks that the Zobrist hashes kept up to date by
+# the moves of both engines equal the hashes computed from scratch,
+# and the replacement rule of TranspositionTable.
+#
+####################################
+
+import random
+from ExperimentGenerator import ExperimentGenerator
+from GameState import GameState
+from PerformanceSystem import PerformanceSystem
+from BitboardPerformanceSystem import BitboardPerformanceSystem, BitboardGameState
+from TranspositionTable import TranspositionTable, hashBoard, hashMasks, LOWER_BOUND
+
+GAMES = 10
+MAX_PLIES = 100
+
+def test_incremental_hashes():
+    listSystem = PerformanceSystem()
+    bitboardSystem = BitboardPerformanceSystem()
+    generator = random.Random(8)
+    for game in range(0, GAMES):
+        gameState = GameState.fromBoard(ExperimentGenerator().getExperiment(), "red")
+        bitboardState = BitboardGameState.fromBoard(ExperimentGenerator().getExperiment(), "red")
+        for ply in range(0, MAX_PLIES):
+            assert gameState.hash == hashBoard(gameState.board, gameState.currentTurn)
+            assert bitboardState.hash == hashMasks(bitboardState.redPieces, bitboardState.blackPieces, bitboardState.redKings, bitboardState.blackKings, bitboardState.currentTurn)
+            assert gameState.hash == bitboardState.hash
+            legalMoves = listSystem.getLegalMoves(gameState.currentTurn, gameState.redPieces, gameState.blackPieces, gameState.redKings, gameState.blackKings, gameState.board)
+            if not legalMoves:
+                break
+            move = legalMoves[generator.randrange(len(legalMoves))]
+            captured = sum(1 << square for square in move.captured)
+            bitboardMove = [bitboardMove for bitboardMove in bitboardSystem.getLegalMoves(bitboardState) if bitboardMove == (move.source, move.target, captured)][0]
+            listSystem.makeMove(gameState, move)
+            bitboardSystem.makeMove(bitboardState, bitboardMove)
+
+def test_probe_and_store():
+    table = TranspositionTable(4)
+    assert table.probe(0x1234) is None
+    table.store(0x1234, 2.5, 3, LOWER_BOUND, (1, 5, 0))
+    assert table.probe(0x1234) == (2.5, 3, LOWER_BOUND, (1, 5, 0))
+    # Another position of the same slot does not match
+    assert table.probe(0x1234 + 16) is None
+    assert table.hits == 1 and table.misses == 2
+
+def test_replacement():
+    table = TranspositionTable(4)
+    table.store(0x10, 1.0, 4)
+    # A shallower entry of the same search does not replace a deeper one
+    table.store(0x20, 2.0, 2)
+    assert table.probe(0x10)[0] == 1.0 and table.probe(0x20) is None
+    # Entries of an earlier search are always replaced
+    table.newSearch()
+    table.store(0x20, 2.0, 2)
+    assert table.probe(0x20)[0] == 2.0 and table.probe(0x10) is None
+    table.clear()
+    assert table.probe(0x20) is None